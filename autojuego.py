@@ -0,0 +1,208 @@
+"""
+Entrenamiento por autojuego: una sola tabla Q juega con X y con O.
+Los estados se normalizan a la perspectiva del jugador que mueve (si mueve X
+se intercambian X y O), así que toda la tabla queda en el formato del agente
+'O' que usan qlearning_agente e interfaz.
+Cada proceso trabajador juega un lote de partidas en paralelo con NumPy sobre
+una copia de la tabla y devuelve solo las entradas que cambió; el proceso
+principal promedia esos cambios por entrada y reparte la tabla actualizada en
+la siguiente ronda.
+Uso: python autojuego.py [partidas] [procesos]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from entrenamiento import QLearningAgent
+from entrenamiento_vectorizado import (CELL_POW3, LEGAL_ACTIONS, ONGOING, TIE, WINNER_CODES,
+                                       batch_q_update, epsilon_schedule_array, max_next_values,
+                                       random_legal_actions)
+from politica_compilada import is_playable
+from tabla_q import DenseQTable
+from tablero_bits import NUM_STATES
+
+# Recompensas desde el punto de vista de cada jugador (las de TicTacToeGame.step)
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+TIE_REWARD = 0.5
+
+# SWAP_INDEX[estado]: el mismo tablero con X y O intercambiados
+_DIGITS = (np.arange(NUM_STATES)[:, None] // CELL_POW3) % 3
+SWAP_INDEX = ((3 - _DIGITS) % 3 * CELL_POW3).sum(axis=1)
+PLAYABLE = np.array([is_playable(index) for index in range(NUM_STATES)])
+del _DIGITS
+
+
+def self_play_games(q_table, num_games, first_game, total_games, alpha=0.1, gamma=0.9,
+                    epsilon=0.3, epsilon_min=0.01, decay='linear', rng=None):
+    """Juega `num_games` partidas de autojuego a la vez actualizando `q_table`.
+
+    Cada jugador aprende de su transición de turno a turno: la jugada que hizo
+    se actualiza cuando vuelve a tocarle (o con la recompensa final si la
+    partida termina, la acabe quien la acabe).
+    Devuelve los conteos (gana O, gana X, empates); O siempre empieza.
+    """
+    rng = rng or np.random.default_rng()
+    values = q_table.values
+    episode_numbers = np.arange(first_game, first_game + num_games)
+    epsilons = epsilon_schedule_array(episode_numbers, total_games, epsilon, epsilon_min, decay)
+
+    raw = np.zeros(num_games, dtype=np.int64)
+    active = np.arange(num_games)
+    pending_states = np.zeros(num_games, dtype=np.int64)
+    pending_actions = np.full(num_games, -1, dtype=np.int64)
+    counts = np.zeros(3, dtype=np.int64)
+    ply = 0
+
+    while len(active):
+        # Estado desde la perspectiva del que mueve (siempre coloca 'O')
+        mover_is_o = ply % 2 == 0
+        current = raw[active] if mover_is_o else SWAP_INDEX[raw[active]]
+        legal = LEGAL_ACTIONS[current]
+        greedy = np.where(legal, values[current], -np.inf).argmax(axis=1)
+        explore = rng.random(len(active)) < epsilons[active]
+        actions = np.where(explore, random_legal_actions(rng, legal), greedy)
+
+        raw[active] += (2 if mover_is_o else 1) * CELL_POW3[actions]
+        results = WINNER_CODES[raw[active]]
+        done = results != ONGOING
+        tie = results == TIE
+        has_pending = pending_actions[active] >= 0
+
+        # Jugada del que mueve si termina la partida; pendiente del rival siempre
+        rival_next = SWAP_INDEX[current + 2 * CELL_POW3[actions]]
+        rival_targets = np.where(done, np.where(tie, TIE_REWARD, LOSS_REWARD),
+                                 gamma * max_next_values(values, rival_next, done))
+        states = np.concatenate([current[done], pending_states[active][has_pending]])
+        moves = np.concatenate([actions[done], pending_actions[active][has_pending]])
+        targets = np.concatenate([np.where(tie[done], TIE_REWARD, WIN_REWARD),
+                                  rival_targets[has_pending]])
+        if len(states):
+            batch_q_update(q_table, states, moves, targets, alpha)
+
+        counts[0 if mover_is_o else 1] += int((done & ~tie).sum())
+        counts[2] += int(tie.sum())
+
+        # La jugada del que mueve queda pendiente hasta su próximo turno
+        pending_states[active] = current
+        pending_actions[active] = actions
+        active = active[~done]
+        ply += 1
+
+    return counts
+
+
+def _play_round(values, known, num_games, first_game, total_games, options, seed):
+    """Trabajador: juega un lote sobre una copia de la tabla y devuelve los
+    cambios como (índices planos, incrementos, conteos)"""
+    q_table = DenseQTable()
+    q_table.values[:] = values
+    q_table.known[:] = known
+    counts = self_play_games(q_table, num_games, first_game, total_games,
+                             rng=np.random.default_rng(seed), **options)
+    changed = np.flatnonzero((q_table.values != values) | (q_table.known & ~known))
+    return changed, (q_table.values.reshape(-1)[changed] - values.reshape(-1)[changed]), counts
+
+
+def merge_updates(q_table, updates):
+    """Aplica los cambios de varios trabajadores promediando por entrada"""
+    total = np.zeros(q_table.values.size)
+    touched = np.zeros(q_table.values.size)
+    for changed, deltas, _ in updates:
+        total[changed] += deltas
+        touched[changed] += 1
+    changed = np.flatnonzero(touched)
+    q_table.values.reshape(-1)[changed] += (total[changed] / touched[changed]).astype(np.float32)
+    q_table.known.reshape(-1)[changed] = True
+
+
+def state_coverage(q_table):
+    """(estados jugables con valor en la tabla, estados jugables totales)"""
+    known = q_table.known.any(axis=1)
+    return int((known & PLAYABLE).sum()), int(PLAYABLE.sum())
+
+
+def train_self_play(games=200000, workers=None, games_per_round=4096, alpha=0.1, gamma=0.9,
+                    epsilon=1.0, epsilon_min=0.01, decay='linear', seed=None,
+                    save_path='q_table_autojuego.pkl', verbose=True):
+    """Entrena una tabla Q por autojuego.
+    workers: procesos trabajadores (None: todos los núcleos; 0: en este proceso)
+    games_per_round: partidas de cada trabajador antes de combinar los cambios
+    epsilon: empieza en 1.0 (partidas aleatorias) para visitar todos los estados
+    """
+    workers = os.cpu_count() if workers is None else workers
+    agent = QLearningAgent(alpha=alpha, gamma=gamma, epsilon=epsilon, backend='dense')
+    q_table = agent.q_table
+    options = {'alpha': alpha, 'gamma': gamma, 'epsilon': epsilon,
+               'epsilon_min': epsilon_min, 'decay': decay}
+    seeds = np.random.SeedSequence(seed)
+
+    if verbose:
+        print("\n" + "="*60)
+        print(f"ENTRENAMIENTO POR AUTOJUEGO - {games:,} PARTIDAS")
+        print("="*60)
+
+    counts = np.zeros(3, dtype=np.int64)
+    start_time = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    try:
+        played = 0
+        while played < games:
+            # Una ronda: un lote por trabajador sobre la misma tabla
+            tasks = []
+            for _ in range(max(workers, 1)):
+                batch = min(games_per_round, games - played)
+                if batch <= 0:
+                    break
+                tasks.append((batch, played, seeds.spawn(1)[0]))
+                played += batch
+
+            if pool is None:
+                for batch, first_game, task_seed in tasks:
+                    counts += self_play_games(q_table, batch, first_game, games,
+                                              rng=np.random.default_rng(task_seed), **options)
+            else:
+                futures = [pool.submit(_play_round, q_table.values, q_table.known, batch,
+                                       first_game, games, options, task_seed)
+                           for batch, first_game, task_seed in tasks]
+                updates = [future.result() for future in futures]
+                merge_updates(q_table, updates)
+                for _, _, task_counts in updates:
+                    counts += task_counts
+
+            if verbose:
+                covered, playable = state_coverage(q_table)
+                print(f"\rPartidas: {played:,}/{games:,} | Estados cubiertos: "
+                      f"{covered}/{playable} ({covered / playable * 100:.1f}%)", end="")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start_time
+    o_wins, x_wins, ties = (int(count) for count in counts)
+    agent.training_stats = {'episodes': games, 'o_wins': o_wins, 'x_wins': x_wins, 'ties': ties}
+
+    if save_path:
+        agent.save_q_table(save_path)
+
+    if verbose:
+        covered, playable = state_coverage(q_table)
+        print(f"\n\n{'='*60}")
+        print("AUTOJUEGO COMPLETADO")
+        print(f"{'='*60}")
+        print(f"Tiempo: {elapsed:.2f} s ({games / elapsed:,.0f} partidas/s)")
+        print(f"Estados cubiertos: {covered}/{playable} ({covered / playable * 100:.1f}%)")
+        print(f"Gana O: {o_wins/games*100:.1f}% | Gana X: {x_wins/games*100:.1f}% | "
+              f"Empates: {ties/games*100:.1f}%")
+
+    return agent
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    train_self_play(games=games, workers=workers)
@@ -0,0 +1,202 @@
+"""
+Barrido de hiperparámetros (alpha, gamma, epsilon, calendario de epsilon y
+número de episodios) en paralelo sobre todos los núcleos.
+Cada punto entrena un agente, lo evalúa contra los oponentes de prueba y se
+añade a una caché JSONL en cuanto termina; al relanzar un barrido
+interrumpido los puntos ya calculados no se repiten.
+El resultado final se escribe como tabla CSV.
+
+Ejemplos:
+python barrido.py --alpha 0.05 0.1 0.2 --gamma 0.8 0.9 0.99 --episodes 20000
+python barrido.py --random 20 --episodes 5000 20000 --trainer vectorized
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from entrenamiento import TEST_OPPONENTS, test_agent_comprehensively, train_agent_with_progress
+from tablero_bits import BitboardTicTacToeGame
+
+PARAMETERS = ('alpha', 'gamma', 'epsilon', 'epsilon_min', 'decay', 'episodes',
+              'trainer', 'eval_games', 'seed')
+
+DEFAULTS = {
+    'alpha': [0.1],
+    'gamma': [0.9],
+    'epsilon': [0.3],
+    'epsilon_min': [0.01],
+    'decay': ['linear'],
+    'episodes': [20000],
+    'trainer': ['tabular'],
+    'eval_games': [1000],
+    'seed': [0],
+}
+
+# Rangos del muestreo aleatorio: (mínimo, máximo) o lista de opciones
+RANDOM_RANGES = {
+    'alpha': (0.01, 0.5),
+    'gamma': (0.5, 0.99),
+    'epsilon': (0.05, 0.5),
+    'decay': ['linear', 'exponential', 'constant'],
+}
+
+
+def grid_space(**values):
+    """Producto cartesiano de los valores de cada parámetro"""
+    lists = [values.get(name) or DEFAULTS[name] for name in PARAMETERS]
+    return [dict(zip(PARAMETERS, combo)) for combo in itertools.product(*lists)]
+
+
+def random_space(num_points, sample_seed=0, **values):
+    """Puntos aleatorios en RANDOM_RANGES; el resto de parámetros en rejilla"""
+    rng = random.Random(sample_seed)
+    base = grid_space(**values)
+    points = []
+    for _ in range(num_points):
+        point = dict(rng.choice(base))
+        for name, choices in RANDOM_RANGES.items():
+            if values.get(name):
+                continue
+            if isinstance(choices, list):
+                point[name] = rng.choice(choices)
+            else:
+                point[name] = round(rng.uniform(*choices), 4)
+        points.append(point)
+    return points
+
+
+def point_key(point):
+    """Identificador estable de un punto del barrido"""
+    text = json.dumps(point, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def run_point(point):
+    """Entrena y evalúa un punto; devuelve una fila de resultados"""
+    random.seed(point['seed'])
+    start = time.perf_counter()
+    if point['trainer'] == 'vectorized':
+        from entrenamiento_vectorizado import train_agent_vectorized
+        agent = train_agent_vectorized(
+            episodes=point['episodes'], alpha=point['alpha'], gamma=point['gamma'],
+            epsilon=point['epsilon'], epsilon_min=point['epsilon_min'],
+            decay=point['decay'], seed=point['seed'], save_path=None, verbose=False)
+    else:
+        agent = train_agent_with_progress(
+            episodes=point['episodes'], game=BitboardTicTacToeGame(),
+            alpha=point['alpha'], gamma=point['gamma'], epsilon=point['epsilon'],
+            epsilon_min=point['epsilon_min'], decay=point['decay'],
+            save_path=None, verbose=False)
+    train_time = time.perf_counter() - start
+
+    results = test_agent_comprehensively(agent, num_games=point['eval_games'],
+                                         game=BitboardTicTacToeGame(), verbose=False)
+    wall_time = time.perf_counter() - start
+
+    stats = agent.training_stats
+    row = dict(point)
+    row['key'] = point_key(point)
+    row['train_win_rate'] = stats['wins'] / stats['episodes']
+    row['train_tie_rate'] = stats['ties'] / stats['episodes']
+    row['train_loss_rate'] = stats['losses'] / stats['episodes']
+    games = point['eval_games']
+    for name, counts in results.items():
+        row[f'{name}_win_rate'] = counts['wins'] / games
+        row[f'{name}_tie_rate'] = counts['ties'] / games
+        row[f'{name}_loss_rate'] = counts['losses'] / games
+    row['states'] = len(agent.q_table)
+    row['wall_time'] = wall_time
+    row['episodes_per_sec'] = point['episodes'] / train_time if train_time > 0 else 0.0
+    return row
+
+
+def load_cache(cache_file):
+    """Filas ya calculadas: {clave: fila}"""
+    rows = {}
+    if os.path.exists(cache_file):
+        with open(cache_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    row = json.loads(line)
+                    rows[row['key']] = row
+    return rows
+
+
+def write_table(rows, output_file):
+    """Escribe la tabla de resultados en CSV"""
+    columns = list(PARAMETERS) + ['key', 'train_win_rate', 'train_tie_rate', 'train_loss_rate']
+    for name, _ in TEST_OPPONENTS:
+        columns += [f'{name}_win_rate', f'{name}_tie_rate', f'{name}_loss_rate']
+    columns += ['states', 'wall_time', 'episodes_per_sec']
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_sweep(points, workers=None, cache_file='barrido_cache.jsonl',
+              output_file='barrido_resultados.csv'):
+    """Ejecuta los puntos pendientes en paralelo y escribe la tabla final"""
+    cached = load_cache(cache_file)
+    pending = [p for p in points if point_key(p) not in cached]
+
+    print("\n" + "="*60)
+    print(f"BARRIDO DE HIPERPARÁMETROS - {len(points)} PUNTOS "
+          f"({len(points) - len(pending)} en caché)")
+    print("="*60)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool, \
+                open(cache_file, 'a', encoding='utf-8') as cache:
+            futures = [pool.submit(run_point, p) for p in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                cache.write(json.dumps(row) + "\n")
+                cache.flush()
+                cached[row['key']] = row
+                print(f"[{done}/{len(pending)}] alpha={row['alpha']} gamma={row['gamma']} "
+                      f"epsilon={row['epsilon']} ({row['decay']}) episodios={row['episodes']} | "
+                      f"{row['wall_time']:.1f} s, {row['episodes_per_sec']:,.0f} episodios/s")
+
+    rows = [cached[point_key(p)] for p in points]
+    write_table(rows, output_file)
+    print(f"Resultados guardados en {output_file}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de hiperparámetros Q-Learning")
+    parser.add_argument('--alpha', type=float, nargs='+')
+    parser.add_argument('--gamma', type=float, nargs='+')
+    parser.add_argument('--epsilon', type=float, nargs='+')
+    parser.add_argument('--epsilon-min', type=float, nargs='+')
+    parser.add_argument('--decay', nargs='+', choices=['linear', 'exponential', 'constant'])
+    parser.add_argument('--episodes', type=int, nargs='+')
+    parser.add_argument('--trainer', nargs='+', choices=['tabular', 'vectorized'])
+    parser.add_argument('--eval-games', type=int, nargs='+')
+    parser.add_argument('--seed', type=int, nargs='+')
+    parser.add_argument('--random', type=int, default=0,
+                        help="número de puntos de búsqueda aleatoria (0 = rejilla)")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--cache', default='barrido_cache.jsonl')
+    parser.add_argument('--output', default='barrido_resultados.csv')
+    args = parser.parse_args()
+
+    values = {name: getattr(args, name) for name in PARAMETERS}
+    if args.random:
+        points = random_space(args.random, **values)
+    else:
+        points = grid_space(**values)
+    run_sweep(points, workers=args.workers, cache_file=args.cache, output_file=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Benchmarks de rendimiento reproducibles (con semilla):
+- episodios/s de train_agent_with_progress
+- movimientos/s de TicTacToeGame.step (motor de listas y de bits)
+- latencia p50/p99 de qlearning_agente.QLearningAgent.get_best_move y
+  tableros/s de get_best_moves (por lotes)
+- tiempo de load_q_table y pico de memoria (RSS) en un proceso aparte
+- partidas/s de test_agent_comprehensively y tiempo de su evaluación exacta
+- episodios necesarios (Q-learning frente a Q(λ)) para alcanzar las tasas
+  exactas de victoria y de no-derrota del Q-learning de 20.000 episodios, y
+  con 20.000 episodios esas tasas y el acuerdo con el juego perfecto
+- coste por fotograma de la interfaz sin pantalla (interfaz_sin_pantalla) y
+  fotogramas por partida
+
+Escribe un JSON con los resultados y los datos de la máquina para comparar
+ejecuciones, y termina con error si alguna métrica empeora más que el umbral
+respecto a una ejecución de referencia.
+
+Uso: python benchmarks.py --output bench.json [--baseline anterior.json --threshold 0.1]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from entrenamiento import (TEST_OPPONENTS, QLearningAgent, TicTacToeGame, get_opponent_move,
+                           test_agent_comprehensively, train_agent_with_progress)
+from politica_compilada import is_playable
+from qlearning_agente import QLearningAgent as PlayAgent
+from tabla_binaria import write_binary_table
+from tabla_q import load_table
+from tablero_bits import BOARD_VIEWS, BitboardTicTacToeGame, board_index
+
+# Dirección de cada métrica: True si más alto es mejor
+METRICS = {
+    'training.episodes_per_sec': True,
+    'step.list.moves_per_sec': True,
+    'step.bitboard.moves_per_sec': True,
+    'best_move.batch.boards_per_sec': True,
+    'best_move.p50_us': False,
+    'best_move.p99_us': False,
+    'best_move.compiled.p50_us': False,
+    'best_move.compiled.p99_us': False,
+    'load.pkl.seconds': False,
+    'load.pkl.peak_rss_kb': False,
+    'load.qtb.seconds': False,
+    'load.qtb.peak_rss_kb': False,
+    'evaluation.games_per_sec': True,
+    'evaluation.exact.seconds': False,
+    'convergence.qlearning.win_rate': True,
+    'convergence.qlambda.win_rate': True,
+    'convergence.qlearning.non_loss_rate': True,
+    'convergence.qlambda.non_loss_rate': True,
+    'convergence.qlearning.optimal_agreement': True,
+    'convergence.qlambda.optimal_agreement': True,
+    'convergence.qlearning.episodes': False,
+    'convergence.qlambda.episodes': False,
+    'gui.frame.mean_us': False,
+    'gui.frame.p99_us': False,
+    'gui.frames_per_game': False,
+}
+
+# Script del proceso hijo: mide la carga de una tabla y el RSS máximo
+_LOAD_SCRIPT = """
+import resource, sys, time
+from qlearning_agente import QLearningAgent
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+agent = QLearningAgent()
+start = time.perf_counter()
+ok = agent.load_q_table(sys.argv[1])
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(ok, elapsed, peak, peak - before)
+"""
+
+
+def machine_info():
+    """Datos de la máquina y del entorno para comparar ejecuciones"""
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+
+def best_of(repeat, func):
+    """Ejecuta `func` `repeat` veces y devuelve el menor tiempo"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_training(episodes, repeat, seed):
+    def run():
+        random.seed(seed)
+        train_agent_with_progress(episodes=episodes, game=BitboardTicTacToeGame(),
+                                  save_path=None, verbose=False)
+    return {'training.episodes_per_sec': episodes / best_of(repeat, run)}
+
+
+def _random_games(num_games, seed):
+    """Secuencias de movimientos (jugador, fila, columna) de partidas aleatorias"""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(num_games):
+        game = TicTacToeGame()
+        moves = []
+        player = 'O'
+        while True:
+            row, col = rng.choice(game.get_available_moves())
+            _, _, done = game.step(row, col, player)
+            moves.append((row, col, player))
+            if done:
+                break
+            player = 'X' if player == 'O' else 'O'
+        games.append(moves)
+    return games
+
+
+def bench_step(num_games, repeat, seed):
+    games = _random_games(num_games, seed)
+    total_moves = sum(len(moves) for moves in games)
+    results = {}
+    for name, game in (('list', TicTacToeGame()), ('bitboard', BitboardTicTacToeGame())):
+        def run():
+            for moves in games:
+                game.reset()
+                for row, col, player in moves:
+                    game.step(row, col, player)
+        results[f'step.{name}.moves_per_sec'] = total_moves / best_of(repeat, run)
+    return results
+
+
+def _latencies(agent, boards, rounds):
+    """Latencias (µs) de get_best_move llamada por llamada"""
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(rounds):
+        for board in boards:
+            start = clock()
+            agent.get_best_move(board)
+            latencies.append(clock() - start)
+    return np.array(latencies) / 1000.0
+
+
+def bench_best_move(table_file, rounds, seed):
+    # Tableros en los que mueve O (empiece quien empiece)
+    boards = [[list(row) for row in BOARD_VIEWS[index]]
+              for index in range(len(BOARD_VIEWS)) if is_playable(index)]
+    random.Random(seed).shuffle(boards)
+    agent = PlayAgent()
+    if not agent.load_q_table(table_file):
+        raise SystemExit(agent.load_error)
+
+    random.seed(seed)
+    table = _latencies(agent, boards, rounds)
+    indices = np.array([board_index(board) for board in boards])
+    batch_seconds = best_of(rounds, lambda: agent.get_best_moves(
+        indices, rng=np.random.default_rng(seed)))
+    agent.compile_policy(seed=seed)
+    compiled = _latencies(agent, boards, rounds)
+    return {
+        'best_move.batch.boards_per_sec': len(boards) / batch_seconds,
+        'best_move.p50_us': float(np.percentile(table, 50)),
+        'best_move.p99_us': float(np.percentile(table, 99)),
+        'best_move.compiled.p50_us': float(np.percentile(compiled, 50)),
+        'best_move.compiled.p99_us': float(np.percentile(compiled, 99)),
+    }
+
+
+def _measure_load(table_file, repeat):
+    """Tiempo mínimo y RSS máximo de cargar `table_file` en un proceso nuevo"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    times = []
+    peaks = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _LOAD_SCRIPT, table_file],
+                                capture_output=True, text=True, check=True, env=env)
+        ok, elapsed, peak, _ = output.stdout.split()
+        if ok != 'True':
+            raise SystemExit(f"No se pudo cargar {table_file}")
+        times.append(float(elapsed))
+        peaks.append(int(peak))
+    return min(times), max(peaks)
+
+
+def bench_load(table_file, repeat):
+    results = {}
+    seconds, peak = _measure_load(os.path.abspath(table_file), repeat)
+    results['load.pkl.seconds'] = seconds
+    results['load.pkl.peak_rss_kb'] = peak
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_file = os.path.join(tmp, 'tabla.qtb')
+        write_binary_table(load_table(table_file), binary_file)
+        seconds, peak = _measure_load(binary_file, repeat)
+    results['load.qtb.seconds'] = seconds
+    results['load.qtb.peak_rss_kb'] = peak
+    return results
+
+
+def bench_evaluation(table_file, num_games, repeat, seed):
+    agent = QLearningAgent()
+    agent.q_table = load_table(table_file, backend='dict')
+
+    def run():
+        random.seed(seed)
+        test_agent_comprehensively(agent, num_games=num_games,
+                                   game=BitboardTicTacToeGame(), verbose=False)
+    total_games = num_games * len(TEST_OPPONENTS)
+    return {
+        'evaluation.games_per_sec': total_games / best_of(repeat, run),
+        'evaluation.exact.seconds': best_of(repeat, lambda: test_agent_comprehensively(
+            agent, exact=True, verbose=False)),
+    }
+
+
+def _exact_rates(agent):
+    """Tasas exactas (sin muestreo) de victoria y de no-derrota contra
+    TEST_OPPONENTS, en media sobre los oponentes"""
+    from evaluacion_exacta import evaluate_exact
+    results = evaluate_exact(agent, TEST_OPPONENTS).values()
+    wins = sum(counts['wins'] for counts in results) / len(results)
+    non_losses = sum(counts['wins'] + counts['ties'] for counts in results) / len(results)
+    return wins, non_losses
+
+
+def bench_convergence(max_episodes, seed):
+    """Tasas de cada algoritmo con `max_episodes` episodios y episodios
+    (probando 1, 2, 4... hasta `max_episodes`) que necesita para alcanzar las
+    del Q-learning de `max_episodes` episodios: victorias y no-derrotas al
+    menos como las suyas. Las partidas que termina el oponente solo dan
+    crédito a las jugadas del agente con Q(λ): aquí se ve la diferencia."""
+    from minimax import optimal_move_agreement
+
+    def train(learner, episodes):
+        random.seed(seed)
+        return train_agent_with_progress(episodes=episodes, game=BitboardTicTacToeGame(),
+                                         learner=learner, save_path=None, verbose=False)
+
+    grid = [1]
+    while grid[-1] * 2 < max_episodes:
+        grid.append(grid[-1] * 2)
+    grid.append(max_episodes)
+
+    results = {}
+    for learner in ('qlearning', 'qlambda'):
+        agent = train(learner, max_episodes)
+        wins, non_losses = _exact_rates(agent)
+        results[f'convergence.{learner}.win_rate'] = wins
+        results[f'convergence.{learner}.non_loss_rate'] = non_losses
+        results[f'convergence.{learner}.optimal_agreement'] = \
+            optimal_move_agreement(agent.q_table)['rate']
+
+    target_wins = results['convergence.qlearning.win_rate']
+    target_non_losses = results['convergence.qlearning.non_loss_rate']
+
+    def reached(learner, episodes):
+        wins, non_losses = _exact_rates(train(learner, episodes))
+        # Margen para el redondeo de la evaluación exacta
+        return wins >= target_wins - 1e-9 and non_losses >= target_non_losses - 1e-9
+
+    for learner in ('qlearning', 'qlambda'):
+        results[f'convergence.{learner}.episodes'] = next(
+            (episodes for episodes in grid if reached(learner, episodes)), None)
+    return results
+
+
+def bench_gui(table_file, num_games, seed):
+    # Import diferido: fija el driver de vídeo 'dummy' antes de iniciar pygame
+    from interfaz_sin_pantalla import run_headless
+    report = run_headless(table_file, num_games, seed)
+    return {
+        'gui.frame.mean_us': report['draw']['frame']['mean_us'],
+        'gui.frame.p99_us': report['draw']['frame']['p99_us'],
+        'gui.frames_per_game': report['frames_per_game'],
+    }
+
+
+def run_benchmarks(table_file='q_table_20000.pkl', seed=0, repeat=3, scale=1.0):
+    """Ejecuta todos los benchmarks y devuelve el informe"""
+    results = {}
+    steps = [
+        ("Entrenamiento", lambda: bench_training(int(5000 * scale), repeat, seed)),
+        ("TicTacToeGame.step", lambda: bench_step(int(5000 * scale), repeat, seed)),
+        ("get_best_move", lambda: bench_best_move(table_file, max(1, int(5 * scale)), seed)),
+        ("load_q_table", lambda: bench_load(table_file, repeat)),
+        ("Evaluación", lambda: bench_evaluation(table_file, int(1000 * scale), repeat, seed)),
+        ("Convergencia", lambda: bench_convergence(int(20000 * scale), seed)),
+        ("Interfaz", lambda: bench_gui(table_file, max(1, int(200 * scale)), seed)),
+    ]
+    for name, bench in steps:
+        print(f"  {name}...", end="", flush=True)
+        start = time.perf_counter()
+        results.update(bench())
+        print(f" {time.perf_counter() - start:.1f} s")
+
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'config': {'table': table_file, 'seed': seed, 'repeat': repeat, 'scale': scale},
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Lista de regresiones (métrica, referencia, actual, cambio relativo).
+    Una métrica con valor en la referencia y None ahora (umbral no alcanzado)
+    es una regresión con actual y cambio None; solo se ignoran las que no
+    tienen valor en la referencia."""
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        old = baseline['results'].get(metric)
+        new = report['results'].get(metric)
+        if old is None:
+            continue
+        if new is None:
+            # Una métrica que deja de alcanzarse (p. ej. episodios hasta el umbral)
+            regressions.append((metric, old, new, None))
+            continue
+        if old == 0:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        if worse > threshold:
+            regressions.append((metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del proyecto Q-Learning")
+    parser.add_argument('--table', default='q_table_20000.pkl')
+    parser.add_argument('--output', default='bench_resultados.json')
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="empeoramiento relativo máximo permitido (0.10 = 10%%)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="factor del tamaño de cada benchmark")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("BENCHMARKS")
+    print("="*60)
+    report = run_benchmarks(args.table, args.seed, args.repeat, args.scale)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for metric, value in report['results'].items():
+        if value is None:
+            print(f"  {metric:32s} {'no alcanzado':>14s}")
+        else:
+            print(f"  {metric:32s} {value:14,.2f}")
+    print(f"Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for metric, old, new, change in regressions:
+            if new is None:
+                print(f"REGRESIÓN {metric}: {old:,.2f} -> no alcanzado")
+            else:
+                print(f"REGRESIÓN {metric}: {old:,.2f} -> {new:,.2f} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones por encima del {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Checkpoints del entrenamiento con reanudación exacta.
+Cada `every` episodios se guarda el estado del entrenamiento: tabla Q,
+episodio, epsilon, estado del generador aleatorio, conteos de victorias/
+derrotas/empates, estados vistos (raw_states) y, si se usa, el contenido y el
+generador de la memoria de experiencia. Solo una de cada `full_every` veces se
+escribe una instantánea completa; entre medias se añade al archivo de deltas
+únicamente lo nuevo desde el checkpoint anterior: entradas de la tabla que
+cambiaron, estados vistos por primera vez y transiciones de la memoria de
+experiencia añadidas. Con un convergencia.ConvergenceMonitor se guarda también
+su seguimiento (ventanas estables, historial nuevo y tabla de referencia) para
+que la parada temprana no dependa de haber reanudado.
+Reanudar = cargar la instantánea y aplicar los deltas en orden.
+Un entrenamiento nuevo (no reanudado) en un directorio con checkpoints previos
+empieza siempre por una instantánea completa y descarta los deltas antiguos.
+"""
+
+import os
+import pickle
+import random
+
+FORMAT_VERSION = 3
+
+
+class TrainingCheckpointer:
+    """Instantáneas completas + deltas solo-añadir en `directory`"""
+
+    def __init__(self, directory='checkpoints', every=1000, full_every=10):
+        self.directory = directory
+        self.every = every
+        self.full_every = full_every
+        self.snapshot_file = os.path.join(directory, 'snapshot.pkl')
+        self.delta_file = os.path.join(directory, 'deltas.pkl')
+        self._saves = 0
+        self._needs_snapshot = True
+        # Lo ya guardado en el último checkpoint (los deltas llevan solo lo nuevo)
+        self._saved_raw_states = set()
+        self._saved_transitions = 0
+        self._saved_history = 0
+
+    def exists(self):
+        return os.path.exists(self.snapshot_file)
+
+    def attach(self, agent, fresh=True, convergence=None):
+        """Activa el seguimiento de entradas modificadas en la tabla del agente.
+        fresh: entrenamiento nuevo; el primer guardado será una instantánea
+        completa y los deltas de un entrenamiento anterior se descartan.
+        """
+        agent.q_table.changed = set()
+        self._mark_saved(agent, convergence)
+        if fresh:
+            self._saves = 0
+            self._needs_snapshot = True
+            if os.path.exists(self.delta_file):
+                os.remove(self.delta_file)
+
+    def _mark_saved(self, agent, convergence=None):
+        self._saved_raw_states = set(agent.raw_states)
+        self._saved_transitions = agent.replay.added if agent.replay is not None else 0
+        self._saved_history = len(convergence.history) if convergence is not None else 0
+
+    def _state(self, agent, episode, episodes, counts, full, convergence=None):
+        """Registro común; con full=False solo lo nuevo desde el último checkpoint"""
+        if full:
+            raw_states = agent.raw_states
+        else:
+            raw_states = agent.raw_states - self._saved_raw_states
+        replay = None
+        if agent.replay is not None:
+            replay = agent.replay.get_state(since=0 if full else self._saved_transitions)
+        monitor = None
+        if convergence is not None:
+            monitor = convergence.get_state(episode, 0 if full else self._saved_history)
+        return {
+            'version': FORMAT_VERSION,
+            'episode': episode,
+            'episodes': episodes,
+            'epsilon': agent.epsilon,
+            'rng_state': random.getstate(),
+            'counts': tuple(counts),
+            'raw_states': sorted(raw_states),
+            'replay': replay,
+            'convergence': monitor,
+        }
+
+    def save(self, agent, episode, episodes, counts, convergence=None):
+        """Checkpoint tras `episode` episodios completados.
+        convergence: ConvergenceMonitor opcional cuyo seguimiento se guarda
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._saves += 1
+        if self._needs_snapshot or self._saves % self.full_every == 0 or not self.exists():
+            self._save_snapshot(agent, episode, episodes, counts, convergence)
+        else:
+            self._save_delta(agent, episode, episodes, counts, convergence)
+        agent.q_table.changed = set()
+        self._mark_saved(agent, convergence)
+
+    def _save_snapshot(self, agent, episode, episodes, counts, convergence=None):
+        record = self._state(agent, episode, episodes, counts, True, convergence)
+        record['backend'] = agent.q_table.backend_name
+        record['symmetric'] = agent.symmetric
+        record['q_table'] = agent.q_table.to_dict()
+
+        # Escritura atómica: un fallo a mitad no deja una instantánea corrupta
+        temp_file = self.snapshot_file + '.tmp'
+        with open(temp_file, 'wb') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.snapshot_file)
+        if os.path.exists(self.delta_file):
+            os.remove(self.delta_file)
+        self._needs_snapshot = False
+
+    def _save_delta(self, agent, episode, episodes, counts, convergence=None):
+        record = self._state(agent, episode, episodes, counts, False, convergence)
+        table = agent.q_table
+        record['changes'] = [(state, action, table.q_value(state, action))
+                             for state, action in table.changed]
+        with open(self.delta_file, 'ab') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_deltas(self):
+        """Registros de delta completos (un registro cortado al final se ignora)"""
+        records = []
+        if not os.path.exists(self.delta_file):
+            return records
+        with open(self.delta_file, 'rb') as f:
+            while True:
+                try:
+                    records.append(pickle.load(f))
+                except (EOFError, pickle.UnpicklingError):
+                    break
+        return records
+
+    def restore(self, agent, episodes, convergence=None):
+        """Restaura tabla Q y estado del último checkpoint en `agent` (y el
+        seguimiento de `convergence`, si se pasa).
+        Devuelve el estado restaurado (episodio, conteos, ...) o None si no hay.
+        """
+        if not self.exists():
+            return None
+        with open(self.snapshot_file, 'rb') as f:
+            snapshot = pickle.load(f)
+        if snapshot.get('version') != FORMAT_VERSION:
+            raise ValueError(f"{self.snapshot_file}: versión de checkpoint no soportada")
+        if snapshot['episodes'] != episodes:
+            raise ValueError(f"El checkpoint es de un entrenamiento de {snapshot['episodes']} "
+                             f"episodios, no de {episodes}")
+        if snapshot['backend'] != agent.q_table.backend_name or snapshot['symmetric'] != agent.symmetric:
+            raise ValueError("El checkpoint usa otro backend o modo de simetría")
+        if (snapshot['replay'] is None) != (agent.replay is None):
+            raise ValueError("El checkpoint usa otra configuración de memoria de experiencia")
+        if (snapshot['convergence'] is None) != (convergence is None):
+            raise ValueError("El checkpoint usa otra configuración de parada por convergencia")
+
+        agent.q_table = type(agent.q_table).from_dict(snapshot['q_table'])
+        agent.raw_states = set(snapshot['raw_states'])
+        if agent.replay is not None:
+            agent.replay.set_state(snapshot['replay'])
+        state = snapshot
+        monitors = [snapshot['convergence']]
+        for delta in self._read_deltas():
+            if delta['episode'] <= state['episode']:
+                continue
+            for table_state, action, value in delta['changes']:
+                agent.q_table.set_q_value(table_state, action, value)
+            agent.raw_states.update(delta['raw_states'])
+            if agent.replay is not None:
+                agent.replay.set_state(delta['replay'])
+            monitors.append(delta['convergence'])
+            state = delta
+        if convergence is not None:
+            # Sin tabla de referencia guardada, la referencia es la tabla restaurada
+            for monitor in monitors[:-1]:
+                convergence.set_state(monitor)
+            convergence.set_state(monitors[-1], agent.q_table)
+
+        agent.epsilon = state['epsilon']
+        random.setstate(state['rng_state'])
+        self.attach(agent, fresh=False, convergence=convergence)
+        self._needs_snapshot = False
+        return state
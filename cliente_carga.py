@@ -0,0 +1,136 @@
+"""
+Generador de carga asyncio para servidor.py.
+Abre varias conexiones concurrentes y en cada una mantiene hasta `pipeline`
+peticiones en vuelo sobre tableros jugables aleatorios (con semilla). Mide la
+latencia de cada petición desde el cliente, el rendimiento total y, al final,
+pide al servidor sus contadores.
+Uso: python cliente_carga.py [--port 8765 | --unix /tmp/tres.sock]
+                             [--connections 32 --requests 2000 --pipeline 16 --batch 0]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from politica_compilada import is_playable
+from servidor import MAX_LINE_BYTES
+from tablero_bits import BOARD_VIEWS, NUM_STATES
+
+
+def playable_keys(seed):
+    """Claves de 9 caracteres de los estados jugables, barajadas"""
+    keys = [''.join(BOARD_VIEWS[index]) for index in range(NUM_STATES) if is_playable(index)]
+    random.Random(seed).shuffle(keys)
+    return keys
+
+
+async def open_connection(args):
+    # Respuestas best_moves de lotes grandes superan el límite de línea por
+    # defecto de asyncio
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix, limit=MAX_LINE_BYTES)
+    return await asyncio.open_connection(args.host, args.port, limit=MAX_LINE_BYTES)
+
+
+async def run_connection(args, keys, offset, latencies):
+    """Envía `args.requests` peticiones con hasta `args.pipeline` en vuelo"""
+    reader, writer = await open_connection(args)
+    sent_at = {}
+    window = asyncio.Semaphore(args.pipeline)
+
+    async def send():
+        for number in range(args.requests):
+            await window.acquire()
+            position = offset + number * max(args.batch, 1)
+            if args.batch:
+                boards = [keys[(position + k) % len(keys)] for k in range(args.batch)]
+                request = {'id': number, 'op': 'best_moves', 'boards': boards}
+            else:
+                request = {'id': number, 'op': 'best_move', 'board': keys[position % len(keys)]}
+            sent_at[number] = time.perf_counter_ns()
+            writer.write((json.dumps(request) + "\n").encode('utf-8'))
+            await writer.drain()
+
+    async def receive():
+        for _ in range(args.requests):
+            response = json.loads(await reader.readline())
+            if 'error' in response:
+                raise RuntimeError(response['error'])
+            latencies.append(time.perf_counter_ns() - sent_at.pop(response['id']))
+            window.release()
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+
+
+async def server_stats(args):
+    reader, writer = await open_connection(args)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return stats
+
+
+async def run_load(args):
+    """Ejecuta la carga y devuelve el informe"""
+    keys = playable_keys(args.seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(args, keys, connection * args.requests, latencies)
+                           for connection in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies_us = np.array(latencies) / 1000.0
+    requests = len(latencies)
+    boards = requests * max(args.batch, 1)
+    return {
+        'requests': requests,
+        'boards': boards,
+        'seconds': elapsed,
+        'requests_per_sec': requests / elapsed,
+        'boards_per_sec': boards / elapsed,
+        'p50_us': float(np.percentile(latencies_us, 50)),
+        'p99_us': float(np.percentile(latencies_us, 99)),
+        'max_us': float(latencies_us.max()),
+        'server': await server_stats(args),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para servidor.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="ruta de socket Unix (en lugar de TCP)")
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000, help="peticiones por conexión")
+    parser.add_argument('--pipeline', type=int, default=16, help="peticiones en vuelo por conexión")
+    parser.add_argument('--batch', type=int, default=0,
+                        help="tableros por petición best_moves (0: best_move de uno en uno)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="guardar el informe en JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    print(f"Peticiones: {report['requests']:,} ({report['boards']:,} tableros) "
+          f"en {report['seconds']:.2f} s")
+    print(f"Rendimiento: {report['requests_per_sec']:,.0f} peticiones/s | "
+          f"{report['boards_per_sec']:,.0f} tableros/s")
+    print(f"Latencia cliente: p50 {report['p50_us']:.0f} µs | p99 {report['p99_us']:.0f} µs | "
+          f"máx {report['max_us']:.0f} µs")
+    for op, stats in report['server']['latency'].items():
+        print(f"Servidor {op}: {stats['count']:,} peticiones, media {stats['mean_us']:.1f} µs, "
+              f"máx {stats['max_us']:.0f} µs")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Seguimiento de la convergencia del entrenamiento y parada temprana.
+Al final de cada ventana de episodios ConvergenceMonitor compara la tabla Q
+con la de la ventana anterior y registra:
+- max y media de |ΔQ| sobre las entradas (estado, acción)
+- tasa de cambio de política: estados cuya mejor acción cambió
+- tasa de descubrimiento: estados nuevos por episodio
+El entrenamiento se detiene cuando todas las métricas quedan por debajo de sus
+umbrales durante `patience` ventanas seguidas.
+get_state/set_state guardan el seguimiento en los checkpoints para que un
+entrenamiento reanudado pare en el mismo episodio que uno sin interrumpir.
+"""
+
+from tabla_q import ACTION_KEYS
+from tablero_bits import NUM_CELLS
+
+
+def _snapshot(q_table):
+    """Copia {estado: {acción: valor}} independiente de la tabla"""
+    return {state: dict(actions) for state, actions in q_table.items()}
+
+
+def _greedy_action(state, actions):
+    """Mejor acción legal (las ausentes valen 0, empates: primera casilla)"""
+    best_cell = None
+    best_value = -float('inf')
+    for k in range(NUM_CELLS):
+        if state[k] != ' ':
+            continue
+        value = actions.get(ACTION_KEYS[k], 0)
+        if value > best_value:
+            best_value = value
+            best_cell = k
+    return best_cell
+
+
+class ConvergenceMonitor:
+    """Métricas de convergencia por ventana y criterio de parada"""
+
+    def __init__(self, window=1000, max_delta=0.1, mean_delta=0.002, policy_change=0.0,
+                 new_states=0.0, patience=3):
+        self.window = window
+        self.thresholds = {
+            'max_delta': max_delta,
+            'mean_delta': mean_delta,
+            'policy_change_rate': policy_change,
+            'new_state_rate': new_states,
+        }
+        self.patience = patience
+        self.history = []
+        self.stable_windows = 0
+        self.stop_reason = None
+        self.stop_episode = None
+        self._previous = None
+        # Episodio en el que se tomó la tabla de referencia
+        self._previous_episode = None
+
+    def start(self, q_table, episode=0):
+        """Toma la tabla tras `episode` episodios como referencia de la ventana siguiente"""
+        self._previous = _snapshot(q_table)
+        self._previous_episode = episode
+
+    def measure(self, q_table, episode_end):
+        """Métricas de la ventana que termina en `episode_end`"""
+        current = _snapshot(q_table)
+        previous = self._previous or {}
+        deltas = []
+        policy_changes = 0
+        for state, actions in current.items():
+            old_actions = previous.get(state)
+            if old_actions is None:
+                deltas.extend(abs(value) for value in actions.values())
+                continue
+            deltas.extend(abs(value - old_actions.get(action, 0))
+                          for action, value in actions.items())
+            if _greedy_action(state, actions) != _greedy_action(state, old_actions):
+                policy_changes += 1
+
+        new_states = len(current) - len(previous.keys() & current.keys())
+        record = {
+            'episode_end': episode_end,
+            'states': len(current),
+            'max_delta': max(deltas, default=0.0),
+            'mean_delta': sum(deltas) / len(deltas) if deltas else 0.0,
+            'policy_change_rate': policy_changes / len(previous) if previous else 0.0,
+            'new_state_rate': new_states / self.window,
+        }
+        self._previous = current
+        self._previous_episode = episode_end
+        self.history.append(record)
+        return record
+
+    def end_episode(self, q_table, episode):
+        """Cierra el episodio `episode` (base 0); True si hay que parar"""
+        if (episode + 1) % self.window:
+            return False
+        record = self.measure(q_table, episode + 1)
+        if all(record[name] <= limit for name, limit in self.thresholds.items()):
+            self.stable_windows += 1
+        else:
+            self.stable_windows = 0
+        if self.stable_windows >= self.patience:
+            limits = ", ".join(f"{name} <= {limit:g}" for name, limit in self.thresholds.items())
+            self.stop_reason = f"convergencia: {limits} durante {self.patience} ventanas de {self.window} episodios"
+            self.stop_episode = episode + 1
+            return True
+        return False
+
+    def get_state(self, episode, history_start=0):
+        """Seguimiento para un checkpoint tras `episode` episodios: el historial
+        desde `history_start` y la tabla de referencia, que no se copia
+        (None) si es la tabla del propio checkpoint (ventanas alineadas con
+        los checkpoints)"""
+        reference = None if self._previous_episode == episode else self._previous
+        return {
+            'window': self.window,
+            'history_start': history_start,
+            'history': self.history[history_start:],
+            'stable_windows': self.stable_windows,
+            'stop_reason': self.stop_reason,
+            'stop_episode': self.stop_episode,
+            'previous_episode': self._previous_episode,
+            'previous': reference,
+        }
+
+    def set_state(self, state, q_table=None):
+        """Aplica un registro de get_state (instantánea o delta, en orden).
+        q_table: tabla restaurada del checkpoint, referencia si el registro
+        no la lleva; sin ella la referencia queda pendiente hasta otro registro
+        """
+        if state['window'] != self.window:
+            raise ValueError(f"El checkpoint usa ventanas de {state['window']} episodios, "
+                             f"no de {self.window}")
+        if state['history_start'] > len(self.history):
+            raise ValueError("Falta historial de convergencia anterior al registro")
+        del self.history[state['history_start']:]
+        self.history.extend(state['history'])
+        self.stable_windows = state['stable_windows']
+        self.stop_reason = state['stop_reason']
+        self.stop_episode = state['stop_episode']
+        self._previous_episode = state['previous_episode']
+        if state['previous'] is not None:
+            self._previous = state['previous']
+        elif q_table is not None:
+            self._previous = _snapshot(q_table)
+
+    def metadata(self):
+        """Datos de la parada para los metadatos de la tabla guardada"""
+        return {
+            'stop_reason': self.stop_reason or "episodios completados",
+            'stop_episode': self.stop_episode,
+            'convergence_window': self.window,
+            'convergence_thresholds': self.thresholds,
+            'convergence_patience': self.patience,
+            'convergence_last': self.history[-1] if self.history else None,
+        }
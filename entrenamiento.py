@@ -1,35 +1,43 @@
 """
 Entrena un agente de IA para jugar tres en raya usando Q-Learning.
-Proceso: 20,000 episodios de entrenamiento con exploración/explotación.
-Genera 'q_table_20000.pkl' con el conocimiento aprendido.
+Proceso: hasta 20,000 episodios de entrenamiento con exploración/explotación;
+se detiene antes si la tabla Q converge (convergencia.ConvergenceMonitor).
+Genera 'q_table_20000.pkl' con el conocimiento aprendido (y en
+'q_table_20000.pkl.meta.json' los episodios completados y el motivo de parada).
 """
-import pickle
 import random
 import os
+import time
+from checkpoints import TrainingCheckpointer
+from convergencia import ConvergenceMonitor
+from grafo_estados import available_moves, board_winner
+from tabla_q import LOAD_ERRORS, make_q_table, load_table, save_table
+from simetria import (canonicalize, count_canonical_states, from_canonical_action,
+                      to_canonical_action)
+from tablero_bits import BitboardTicTacToeGame, board_index
 
 class QLearningAgent:
-    def __init__(self, alpha=0.1, gamma=0.9, epsilon=0.3):
-        self.q_table = {}
+    def __init__(self, alpha=0.1, gamma=0.9, epsilon=0.3, backend='dict', symmetric=False):
+        self.q_table = make_q_table(backend)
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        # Con simetrías la tabla guarda solo estados canónicos
+        self.symmetric = symmetric
+        self.raw_states = set()
+        # Memoria de experiencia opcional (experiencia.ReplayBuffer)
+        self.replay = None
         
     def get_state_key(self, board):
         """Convierte el tablero a una clave para la tabla Q"""
-        return ''.join([''.join(row) for row in board])
+        return self.q_table.state_key(board)
     
     def get_available_actions(self, board):
         """Obtiene todas las acciones posibles (casillas vacías)"""
-        actions = []
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == ' ':
-                    actions.append((i, j))
-        return actions
+        return available_moves(board)
     
     def choose_action(self, board, training=True):
         """Selecciona una acción usando estrategia epsilon-greedy"""
-        state = self.get_state_key(board)
         available_actions = self.get_available_actions(board)
         
         if not available_actions:
@@ -41,21 +49,16 @@ class QLearningAgent:
                 return random.choice(available_actions)
         # Durante juego: solo explotar (mejor acción)
         
-        # Inicializar valores si no existen en la tabla
-        if state not in self.q_table:
-            self.q_table[state] = {}
-        
-        best_action = None
-        best_value = -float('inf')
-        
-        for action in available_actions:
-            action_key = f"{action[0]},{action[1]}"
-            if action_key not in self.q_table[state]:
-                self.q_table[state][action_key] = 0
-            
-            if self.q_table[state][action_key] > best_value:
-                best_value = self.q_table[state][action_key]
-                best_action = action
+        # Las acciones sin valor en la tabla cuentan como 0 (sin insertarlas)
+        if self.symmetric:
+            canonical_board, transform = canonicalize(board)
+            canonical_actions = [to_canonical_action(a, transform) for a in available_actions]
+            best_action = self.q_table.best_action(self.get_state_key(canonical_board),
+                                                   canonical_actions)
+            if best_action is not None:
+                best_action = from_canonical_action(best_action, transform)
+        else:
+            best_action = self.q_table.best_action(self.get_state_key(board), available_actions)
         
         # Si no hay acción mejor, elegir aleatoria
         if best_action is None:
@@ -65,50 +68,128 @@ class QLearningAgent:
     
     def update_q_value(self, board, action, reward, next_board, done):
         """Actualiza el valor Q usando la ecuación de Bellman"""
+        if self.symmetric:
+            self.raw_states.add(board_index(board))
+            board, transform = canonicalize(board)
+            action = to_canonical_action(action, transform)
+            next_board = canonicalize(next_board)[0]
         state = self.get_state_key(board)
-        next_state = self.get_state_key(next_board)
-        action_key = f"{action[0]},{action[1]}"
-        
-        # Inicializar si no existen
-        if state not in self.q_table:
-            self.q_table[state] = {}
-        if action_key not in self.q_table[state]:
-            self.q_table[state][action_key] = 0
         
         # Obtener el mejor valor Q del siguiente estado
         if done:
             max_next_q = 0
         else:
-            max_next_q = -float('inf')
-            if next_state in self.q_table:
-                for a_key in self.q_table[next_state]:
-                    if self.q_table[next_state][a_key] > max_next_q:
-                        max_next_q = self.q_table[next_state][a_key]
-            else:
-                max_next_q = 0
+            max_next_q = self.q_table.max_q_value(self.get_state_key(next_board))
         
         # Ecuación de Bellman
-        current_q = self.q_table[state][action_key]
+        current_q = self.q_table.q_value(state, action)
         new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
-        self.q_table[state][action_key] = new_q
+        self.q_table.set_q_value(state, action, new_q)
+        
+        if self.replay is not None:
+            self.replay.add(board_index(board), 3 * action[0] + action[1], reward,
+                            board_index(next_board), done)
+    
+    def start_episode(self):
+        """Inicio de partida (el aprendizaje de un paso no guarda estado)"""
+    
+    def opponent_moved(self, board, reward, done):
+        """Movimiento del oponente; la actualización de un paso lo ignora"""
     
-    def save_q_table(self, filename='q_table_20000.pkl'):
-        """Guarda la tabla Q en un archivo"""
-        with open(filename, 'wb') as f:
-            pickle.dump(self.q_table, f)
+    def save_q_table(self, filename='q_table_20000.pkl', metadata=None):
+        """Guarda la tabla Q en un archivo (.pkl, .npz o .qtb)"""
+        save_table(self.q_table, filename, metadata)
         print(f"Tabla Q guardada en {filename} ({len(self.q_table)} estados)")
     
     def load_q_table(self, filename='q_table_20000.pkl'):
-        """Carga la tabla Q desde un archivo"""
+        """Carga la tabla Q desde un archivo (.pkl, .npz o .qtb)"""
         try:
-            with open(filename, 'rb') as f:
-                self.q_table = pickle.load(f)
+            self.q_table = load_table(filename, backend=self.q_table.backend_name)
             print(f"Tabla Q cargada: {len(self.q_table)} estados")
             return True
-        except:
-            print(f"No se pudo cargar {filename}")
+        except LOAD_ERRORS as error:
+            print(f"No se pudo cargar {filename}: {error}")
             return False
 
+class QLambdaAgent(QLearningAgent):
+    """Q(λ) de Watkins con trazas de elegibilidad.
+    La transición del agente va de su turno al siguiente (tras responder el
+    oponente), así que la recompensa de una partida que gana o empata el
+    oponente también se asigna a las jugadas que llevaron a ella. Las trazas
+    se cortan cuando el agente explora con una acción no greedy.
+    Con memoria de experiencia (replay) se guarda cada transición completa
+    (turno del agente -> su siguiente turno o final), con la recompensa ya
+    conocida tras la respuesta del oponente.
+    """
+    def __init__(self, alpha=0.1, gamma=0.9, epsilon=0.3, lam=0.8, backend='dict',
+                 symmetric=False):
+        super().__init__(alpha=alpha, gamma=gamma, epsilon=epsilon, backend=backend,
+                         symmetric=symmetric)
+        self.lam = lam
+        self.traces = {}
+        self.pending = None
+        self.pending_index = None
+    
+    def start_episode(self):
+        self.traces = {}
+        self.pending = None
+    
+    def update_q_value(self, board, action, reward, next_board, done):
+        """Registra la jugada del agente; el error TD se aplica cuando se
+        conoce el siguiente estado del agente o el final de la partida"""
+        if self.symmetric:
+            self.raw_states.add(board_index(board))
+            board, transform = canonicalize(board)
+            action = to_canonical_action(action, transform)
+        state = self.get_state_key(board)
+        
+        # Watkins: tras una acción exploratoria el retorno deja de ser greedy
+        if self.q_table.q_value(state, action) >= self.q_table.max_q_value(state):
+            decay = self.gamma * self.lam
+            self.traces = {entry: trace * decay for entry, trace in self.traces.items()}
+        else:
+            self.traces = {}
+        self.traces[(state, action)] = 1.0
+        self.pending = (state, action)
+        self.pending_index = board_index(board)
+        
+        if done:
+            self._remember(reward, next_board, True)
+            self._apply_td(reward)
+    
+    def opponent_moved(self, board, reward, done):
+        """Cierra la transición pendiente con el estado tras el oponente"""
+        if self.pending is None:
+            return
+        if self.symmetric:
+            board = canonicalize(board)[0]
+        self._remember(reward, board, done)
+        if done:
+            self._apply_td(reward)
+            return
+        self._apply_td(self.gamma * self.q_table.max_q_value(self.get_state_key(board)))
+    
+    def _remember(self, reward, next_board, done):
+        """Guarda la transición pendiente en la memoria de experiencia"""
+        if self.replay is None:
+            return
+        row, col = self.pending[1]
+        next_index = 0 if done else board_index(next_board)
+        self.replay.add(self.pending_index, 3 * row + col, reward, next_index, done)
+    
+    def _apply_td(self, target):
+        """Reparte el error TD de la transición pendiente según las trazas"""
+        delta = target - self.q_table.q_value(*self.pending)
+        for (state, action), trace in self.traces.items():
+            current_q = self.q_table.q_value(state, action)
+            self.q_table.set_q_value(state, action, current_q + self.alpha * delta * trace)
+        self.pending = None
+
+LEARNERS = {
+    'qlearning': QLearningAgent,
+    'qlambda': QLambdaAgent,
+}
+
 class TicTacToeGame:
     def __init__(self):
         self.reset()
@@ -129,37 +210,12 @@ class TicTacToeGame:
         return False
     
     def check_winner(self):
-        """Verifica si hay ganador"""
-        # Filas
-        for i in range(3):
-            if self.board[i][0] == self.board[i][1] == self.board[i][2] != ' ':
-                return self.board[i][0]
-        
-        # Columnas
-        for i in range(3):
-            if self.board[0][i] == self.board[1][i] == self.board[2][i] != ' ':
-                return self.board[0][i]
-        
-        # Diagonales
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
-            return self.board[0][0]
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
-            return self.board[0][2]
-        
-        # Empate
-        if all(self.board[i][j] != ' ' for i in range(3) for j in range(3)):
-            return 'Tie'
-        
-        return None
+        """Verifica si hay ganador (consulta el grafo de estados)"""
+        return board_winner(self.board)
     
     def get_available_moves(self):
         """Obtiene movimientos disponibles"""
-        moves = []
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == ' ':
-                    moves.append((i, j))
-        return moves
+        return available_moves(self.board)
     
     def step(self, row, col, player):
         """Ejecuta un paso del juego"""
@@ -206,42 +262,141 @@ def get_opponent_move(board):
     
     return random.choice(available) if available else None
 
-def train_agent_with_progress(episodes=20000):
-    """Entrena el agente Q-Learning con barra de progreso"""
-    agent = QLearningAgent(alpha=0.1, gamma=0.9, epsilon=0.3)
-    game = TicTacToeGame()
+def print_progress(completed, episodes, wins, losses, ties):
+    """Dibuja la barra de progreso del entrenamiento"""
+    progress = completed / episodes * 100
+    bar_length = 50
+    filled = int(bar_length * progress / 100)
+    bar = '█' * filled + '░' * (bar_length - filled)
     
-    print("\n" + "="*60)
-    print("ENTRENAMIENTO Q-LEARNING - 20,000 EPISODIOS")
-    print("="*60)
+    win_rate = wins / completed * 100 if completed > 0 else 0
+    loss_rate = losses / completed * 100 if completed > 0 else 0
+    tie_rate = ties / completed * 100 if completed > 0 else 0
+    
+    print(f"\rProgreso: |{bar}| {progress:.1f}% ({completed}/{episodes}) | "
+          f"Victorias: {win_rate:.1f}% | Derrotas: {loss_rate:.1f}% | Empates: {tie_rate:.1f}%", end="")
+
+def epsilon_schedule(episode, episodes, start=0.3, minimum=0.01, decay='linear'):
+    """Epsilon del episodio según el calendario de decaimiento.
+    'linear': start -> 0 a lo largo del entrenamiento (acotado por minimum)
+    'exponential': start -> minimum geométricamente
+    'constant': siempre start
+    """
+    if decay == 'linear':
+        return max(minimum, start * (1 - episode / episodes))
+    if decay == 'exponential':
+        return max(minimum, start * (minimum / start) ** (episode / episodes))
+    if decay == 'constant':
+        return start
+    raise ValueError(f"Decaimiento desconocido: {decay}")
+
+def train_agent_with_progress(episodes=20000, game=None, backend='dict', symmetric=False,
+                              alpha=0.1, gamma=0.9, epsilon=0.3, epsilon_min=0.01,
+                              decay='linear', save_path='q_table_20000.pkl', verbose=True,
+                              profiler=None, checkpointer=None, resume=False,
+                              replay=None, replay_batch=64, learner='qlearning', lam=0.8,
+                              convergence=None):
+    """Entrena el agente Q-Learning con barra de progreso.
+    game: motor de juego (TicTacToeGame por defecto o BitboardTicTacToeGame)
+    backend: almacenamiento de la tabla Q ('dict' o 'dense')
+    symmetric: guardar solo estados canónicos (reducción por simetrías)
+    alpha, gamma, epsilon, epsilon_min, decay: hiperparámetros (ver epsilon_schedule)
+    save_path: archivo de la tabla Q entrenada (None para no guardar)
+    profiler: perfilado.TrainingProfiler opcional (tiempos por fase y contadores)
+    checkpointer: checkpoints.TrainingCheckpointer opcional (guardado periódico)
+    resume: continuar desde el último checkpoint de `checkpointer` si existe
+    replay: experiencia.ReplayBuffer opcional; tras cada episodio se repasa un
+    lote de `replay_batch` transiciones pasadas
+    learner: 'qlearning' (un paso) o 'qlambda' (Q(λ) de Watkins con traza `lam`)
+    convergence: convergencia.ConvergenceMonitor opcional; para el entrenamiento
+    antes de `episodes` si la tabla converge y guarda el motivo en los metadatos
+    """
+    if learner not in LEARNERS:
+        raise ValueError(f"Algoritmo desconocido: {learner}")
+    options = {'lam': lam} if learner == 'qlambda' else {}
+    agent = LEARNERS[learner](alpha=alpha, gamma=gamma, epsilon=epsilon, backend=backend,
+                              symmetric=symmetric, **options)
+    agent.replay = replay
+    if game is None:
+        game = TicTacToeGame()
+    
+    if verbose:
+        print("\n" + "="*60)
+        if convergence is not None:
+            print(f"ENTRENAMIENTO Q-LEARNING - HASTA {episodes:,} EPISODIOS "
+                  f"(o hasta converger)")
+        else:
+            print(f"ENTRENAMIENTO Q-LEARNING - {episodes:,} EPISODIOS")
+        print("="*60)
     
     wins = 0
     losses = 0
     ties = 0
+    start_episode = 0
+    resumed = False
+    
+    if checkpointer is not None:
+        state = checkpointer.restore(agent, episodes, convergence) if resume else None
+        if state is not None:
+            start_episode = state['episode']
+            wins, losses, ties = state['counts']
+            resumed = True
+            if verbose:
+                print(f"Reanudando desde el episodio {start_episode:,}")
+        else:
+            checkpointer.attach(agent, convergence=convergence)
+    
+    # Sin perfilador cada fase solo cuesta comprobar `timed`
+    timed = profiler is not None
+    clock = time.perf_counter_ns
+    if timed:
+        profiler.begin()
+    last_episode = episodes
+    if convergence is not None:
+        if not resumed:
+            convergence.start(agent.q_table)
+        elif convergence.stop_reason:
+            # El checkpoint se guardó ya en el episodio de parada
+            last_episode = start_episode
+    
+    completed = start_episode
     
-    for episode in range(episodes):
+    for episode in range(start_episode, last_episode):
         board = game.reset()
         done = False
         total_reward = 0
+        agent.start_episode()
         
-        # Reducir epsilon gradualmente (0.3 -> 0.01)
-        agent.epsilon = max(0.01, 0.3 * (1 - episode / episodes))
+        # Reducir epsilon gradualmente (0.3 -> 0.01 por defecto)
+        agent.epsilon = epsilon_schedule(episode, episodes, epsilon, epsilon_min, decay)
         
         while not done:
             # Turno del agente (O)
+            if timed:
+                start = clock()
             action = agent.choose_action(board, training=True)
+            if timed:
+                profiler.add('action_selection', clock() - start)
             if action is None:
                 break
             
             # Guardar estado actual
+            if timed:
+                start = clock()
             old_board = [row[:] for row in board]
             
             # Realizar movimiento
             board, reward, done = game.step(action[0], action[1], 'O')
             total_reward += reward
+            if timed:
+                profiler.add('env_step', clock() - start)
+                start = clock()
             
             # Actualizar Q-value
             agent.update_q_value(old_board, action, reward, board, done)
+            if timed:
+                profiler.add('q_update', clock() - start)
+                profiler.count('agent_moves')
             
             if done:
                 winner = game.check_winner()
@@ -254,108 +409,196 @@ def train_agent_with_progress(episodes=20000):
                 break
             
             # Turno del oponente (X) - más inteligente
+            if timed:
+                start = clock()
             opponent_action = get_opponent_move(board)
             if opponent_action:
                 board, reward, done = game.step(opponent_action[0], opponent_action[1], 'X')
+                agent.opponent_moved(board, reward, done)
+                
+                # Partidas terminadas por el oponente
+                if done:
+                    winner = game.check_winner()
+                    if winner == 'X':
+                        losses += 1
+                    elif winner == 'Tie':
+                        ties += 1
+            if timed:
+                profiler.add('opponent_move', clock() - start)
+                profiler.count('opponent_moves')
+        
+        # Repasar transiciones pasadas
+        if replay is not None:
+            if timed:
+                start = clock()
+            replay.replay(agent.q_table, replay_batch, agent.alpha, agent.gamma)
+            if timed:
+                profiler.add('replay', clock() - start)
         
         # Mostrar barra de progreso cada 100 episodios
-        if (episode + 1) % 100 == 0:
-            progress = (episode + 1) / episodes * 100
-            bar_length = 50
-            filled = int(bar_length * progress / 100)
-            bar = '█' * filled + '░' * (bar_length - filled)
-            
-            win_rate = wins / (episode + 1) * 100 if (episode + 1) > 0 else 0
-            loss_rate = losses / (episode + 1) * 100 if (episode + 1) > 0 else 0
-            tie_rate = ties / (episode + 1) * 100 if (episode + 1) > 0 else 0
-            
-            print(f"\rProgreso: |{bar}| {progress:.1f}% ({episode + 1}/{episodes}) | "
-                  f"Victorias: {win_rate:.1f}% | Derrotas: {loss_rate:.1f}% | Empates: {tie_rate:.1f}%", end="")
+        if verbose and (episode + 1) % 100 == 0:
+            if timed:
+                start = clock()
+            print_progress(episode + 1, episodes, wins, losses, ties)
+            if timed:
+                profiler.add('progress', clock() - start)
+        
+        # La ventana de convergencia se cierra antes del checkpoint para guardarla
+        converged = convergence is not None and convergence.end_episode(agent.q_table, episode)
+        
+        if checkpointer is not None and (episode + 1) % checkpointer.every == 0:
+            checkpointer.save(agent, episode + 1, episodes, (wins, losses, ties), convergence)
+        
+        if timed:
+            profiler.end_episode(episode)
+        
+        completed = episode + 1
+        if converged:
+            break
+    
+    if timed:
+        profiler.close(completed)
+    
+    agent.training_stats = {'episodes': completed, 'wins': wins, 'losses': losses, 'ties': ties}
     
     # Guardar la tabla Q entrenada
-    agent.save_q_table('q_table_20000.pkl')
+    if save_path:
+        metadata = None
+        if convergence is not None:
+            metadata = dict(agent.training_stats, **convergence.metadata())
+        agent.save_q_table(save_path, metadata)
     
-    print(f"\n\n{'='*60}")
-    print("ENTRENAMIENTO COMPLETADO")
-    print(f"{'='*60}")
-    print(f"Total episodios: {episodes}")
-    print(f"Tamaño tabla Q: {len(agent.q_table)} estados")
-    print(f"Estados finales aprendidos: {len(agent.q_table)}")
-    print(f"Victorias finales: {wins} ({wins/episodes*100:.1f}%)")
-    print(f"Derrotas finales: {losses} ({losses/episodes*100:.1f}%)")
-    print(f"Empates finales: {ties} ({ties/episodes*100:.1f}%)")
+    if verbose:
+        print(f"\n\n{'='*60}")
+        print("ENTRENAMIENTO COMPLETADO")
+        print(f"{'='*60}")
+        print(f"Total episodios: {completed}")
+        if convergence is not None and convergence.stop_reason:
+            print(f"Parada temprana en el episodio {convergence.stop_episode}: {convergence.stop_reason}")
+        print(f"Tamaño tabla Q: {len(agent.q_table)} estados")
+        print(f"Estados finales aprendidos: {len(agent.q_table)}")
+        if agent.symmetric:
+            raw_count = len(agent.raw_states)
+        else:
+            raw_count = len(agent.q_table)
+        print(f"Estados sin reducir: {raw_count} | Estados canónicos: {count_canonical_states(agent.q_table)}")
+        print(f"Victorias finales: {wins} ({wins/completed*100:.1f}%)")
+        print(f"Derrotas finales: {losses} ({losses/completed*100:.1f}%)")
+        print(f"Empates finales: {ties} ({ties/completed*100:.1f}%)")
     
     return agent
 
-def test_agent_comprehensively(agent, num_games=1000):
-    """Prueba del agente entrenado"""
-    print(f"\n{'='*60}")
-    print("PRUEBA DEL AGENTE")
-    print(f"{'='*60}")
-    
-    game = TicTacToeGame()
+def random_opponent(board):
+    """Oponente aleatorio: cualquier casilla vacía"""
+    return (random.choice([(i, j) for i in range(3) for j in range(3) if board[i][j] == ' '])
+            if any(board[i][j] == ' ' for i in range(3) for j in range(3)) else None)
+
+def center_first_opponent(board):
+    """Oponente que toma el centro si está libre y si no juega al azar"""
+    return ((1, 1) if board[1][1] == ' ' else
+            random.choice([(i, j) for i in range(3) for j in range(3) if board[i][j] == ' '])
+            if any(board[i][j] == ' ' for i in range(3) for j in range(3)) else None)
+
+# Diferentes tipos de oponentes (funciones de módulo para poder usarlas en otros procesos)
+TEST_OPPONENTS = [
+    ("Aleatorio", random_opponent),
+    ("Inteligente", get_opponent_move),
+    ("Centro-Primero", center_first_opponent),
+]
+
+def play_test_game(agent, game, opponent_func):
+    """Juega una partida de prueba (agente 'O' sin exploración) y devuelve el ganador"""
+    board = game.reset()
+    done = False
     
-    # Diferentes tipos de oponentes
-    opponents = [
-        ("Aleatorio", lambda board: random.choice([(i, j) for i in range(3) for j in range(3) if board[i][j] == ' ']) 
-         if any(board[i][j] == ' ' for i in range(3) for j in range(3)) else None),
-        
-        ("Inteligente", get_opponent_move),
+    # El agente siempre juega como 'O'
+    while not done:
+        # Turno del agente (O)
+        action = agent.choose_action(board, training=False)
+        if action is None:
+            break
         
-        ("Centro-Primero", lambda board: 
-         (1, 1) if board[1][1] == ' ' else 
-         random.choice([(i, j) for i in range(3) for j in range(3) if board[i][j] == ' ']) 
-         if any(board[i][j] == ' ' for i in range(3) for j in range(3)) else None),
-    ]
-    
-    for opponent_name, opponent_func in opponents:
-        print(f"\nProbando contra: {opponent_name}")
+        board, _, done = game.step(action[0], action[1], 'O')
+        if done:
+            break
         
-        wins = 0
-        losses = 0
-        ties = 0
+        # Turno del oponente (X)
+        opponent_action = opponent_func(board)
+        if opponent_action:
+            board, _, done = game.step(opponent_action[0], opponent_action[1], 'X')
+    
+    return game.check_winner()
+
+def test_agent_comprehensively(agent, num_games=1000, game=None, workers=None, seed=0,
+                               verbose=True, opponents=None, exact=False):
+    """Prueba del agente entrenado.
+    workers: si se indica, reparte las partidas en procesos (evaluacion_paralela)
+    con semillas por bloque.
+    seed: semilla de la evaluación; con o sin procesos el resultado es
+    reproducible para cada `seed` (en serie se siembra `random` y después se
+    restaura su estado, sin alterar el del llamador).
+    opponents: lista de (nombre, función); por defecto TEST_OPPONENTS
+    (p. ej. TEST_OPPONENTS + [minimax.PERFECT_OPPONENT]).
+    exact: recorre el árbol de juego completo (evaluacion_exacta) en lugar de
+    simular partidas; los resultados son probabilidades exactas.
+    Devuelve {oponente: {'wins', 'losses', 'ties'}} (conteos, o probabilidades
+    con exact=True).
+    """
+    if opponents is None:
+        opponents = TEST_OPPONENTS
+    
+    if verbose:
+        print(f"\n{'='*60}")
+        print("PRUEBA DEL AGENTE")
+        print(f"{'='*60}")
+    
+    if exact:
+        from evaluacion_exacta import evaluate_exact
+        results = evaluate_exact(agent, opponents)
+    elif workers:
+        from evaluacion_paralela import evaluate_parallel
+        results = evaluate_parallel(agent, num_games=num_games, workers=workers, seed=seed,
+                                    opponents=opponents)
+    else:
+        if game is None:
+            game = TicTacToeGame()
         
-        for _ in range(num_games):
-            board = game.reset()
-            done = False
-            
-            # El agente siempre juega como 'O'
-            while not done:
-                # Turno del agente (O)
-                action = agent.choose_action(board, training=False)
-                if action is None:
-                    break
-                
-                board, _, done = game.step(action[0], action[1], 'O')
+        # Los oponentes usan el módulo random: se siembra para la evaluación
+        saved_state = random.getstate()
+        random.seed(seed)
+        results = {}
+        try:
+            for opponent_name, opponent_func in opponents:
+                wins = 0
+                losses = 0
+                ties = 0
                 
-                if done:
-                    winner = game.check_winner()
+                for _ in range(num_games):
+                    winner = play_test_game(agent, game, opponent_func)
                     if winner == 'O':
                         wins += 1
                     elif winner == 'X':
                         losses += 1
                     elif winner == 'Tie':
                         ties += 1
-                    break
-                
-                # Turno del oponente (X)
-                opponent_action = opponent_func(board)
-                if opponent_action:
-                    board, _, done = game.step(opponent_action[0], opponent_action[1], 'X')
                 
-                if done:
-                    winner = game.check_winner()
-                    if winner == 'O':
-                        wins += 1
-                    elif winner == 'X':
-                        losses += 1
-                    elif winner == 'Tie':
-                        ties += 1
-                    break
-        
-        print(f"  Victorias: {wins} ({wins/num_games*100:.1f}%)")
-        print(f"  Derrotas: {losses} ({losses/num_games*100:.1f}%)")
-        print(f"  Empates: {ties} ({ties/num_games*100:.1f}%)")
+                results[opponent_name] = {'wins': wins, 'losses': losses, 'ties': ties}
+        finally:
+            random.setstate(saved_state)
+    
+    if verbose:
+        for opponent_name, counts in results.items():
+            print(f"\nProbando contra: {opponent_name}")
+            if exact:
+                print(f"  Victorias: {counts['wins']*100:.2f}% (exacto)")
+                print(f"  Derrotas: {counts['losses']*100:.2f}% (exacto)")
+                print(f"  Empates: {counts['ties']*100:.2f}% (exacto)")
+                continue
+            print(f"  Victorias: {counts['wins']} ({counts['wins']/num_games*100:.1f}%)")
+            print(f"  Derrotas: {counts['losses']} ({counts['losses']/num_games*100:.1f}%)")
+            print(f"  Empates: {counts['ties']} ({counts['ties']/num_games*100:.1f}%)")
+    
+    return results
 
 def main():
     """Función principal del entrenamiento"""
@@ -372,21 +615,32 @@ def main():
             print("Cargando modelo existente...")
             agent = QLearningAgent()
             if agent.load_q_table('q_table_20000.pkl'):
-                test_agent_comprehensively(agent)
+                test_agent_comprehensively(agent, game=BitboardTicTacToeGame())
                 return
         else:
             print("Iniciando entrenamiento desde cero...")
     
+    # Checkpoints periódicos para poder reanudar un entrenamiento interrumpido
+    checkpointer = TrainingCheckpointer()
+    resume = False
+    if checkpointer.exists():
+        response = input("¿Continuar desde el último checkpoint? (s/n): ").lower()
+        resume = response == 's'
+    
     # Entrenar el agente
-    trained_agent = train_agent_with_progress(episodes=20000)
+    # Se detiene antes de 20,000 episodios si la tabla deja de cambiar
+    trained_agent = train_agent_with_progress(episodes=20000, game=BitboardTicTacToeGame(),
+                                              checkpointer=checkpointer, resume=resume,
+                                              convergence=ConvergenceMonitor())
     
     # Probar el agente
-    test_agent_comprehensively(trained_agent, num_games=1000)
+    test_agent_comprehensively(trained_agent, num_games=1000, game=BitboardTicTacToeGame())
     
     print(f"\n{'='*60}")
     print("INSTRUCCIONES PARA JUGAR:")
     print(f"{'='*60}")
-    print("1. El agente ha sido entrenado con 20,000 episodios")
+    episodes = trained_agent.training_stats['episodes']
+    print(f"1. El agente ha sido entrenado con {episodes:,} episodios")
     print("2. Para jugar contra él, ejecuta 'interfaz.py'")
     print("3. El archivo 'q_table_20000.pkl' contiene el conocimiento")
     print("4. El agente juega como 'O', tú juegas como 'X'")
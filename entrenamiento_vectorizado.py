@@ -0,0 +1,184 @@
+"""
+Entrenamiento Q-Learning vectorizado con NumPy.
+Miles de partidas avanzan a la vez como arrays de estados base 3 sobre la
+tabla densa (DenseQTable): selección epsilon-greedy, movimiento del oponente,
+detección de victoria y actualización Q se hacen por lotes.
+Usa la misma regla de Bellman, el mismo calendario de epsilon (0.3 -> 0.01) y
+el mismo conteo de victorias/derrotas/empates que train_agent_with_progress.
+Uso: python entrenamiento_vectorizado.py [episodios] [partidas_simultaneas]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from entrenamiento import QLearningAgent, epsilon_schedule, print_progress
+from tabla_q import legal_actions
+from tablero_bits import NUM_CELLS, NUM_STATES, POW3, LINE_MASKS
+
+# Códigos de resultado por estado: 0 en juego, 1 gana X, 2 gana O, 3 empate
+ONGOING, X_WINS, O_WINS, TIE = 0, 1, 2, 3
+
+# LEGAL_ACTIONS[estado, casilla]: casilla vacía
+LEGAL_ACTIONS = legal_actions()
+CELL_POW3 = np.array(POW3, dtype=np.int64)
+CORNERS = np.array([0, 2, 6, 8])
+CENTER = 4
+
+
+def _build_winner_codes():
+    """Resultado de cada uno de los 3**9 estados"""
+    digits = (np.arange(NUM_STATES)[:, None] // CELL_POW3) % 3
+    codes = np.full(NUM_STATES, ONGOING, dtype=np.int8)
+    codes[(digits != 0).all(axis=1)] = TIE
+    for line in LINE_MASKS:
+        cells = [k for k in range(NUM_CELLS) if line >> k & 1]
+        for player in (X_WINS, O_WINS):
+            codes[(digits[:, cells] == player).all(axis=1)] = player
+    return codes
+
+
+WINNER_CODES = _build_winner_codes()
+
+
+def random_legal_actions(rng, legal):
+    """Una acción legal uniforme por fila de la máscara `legal`"""
+    noise = rng.random(legal.shape)
+    noise[~legal] = -1.0
+    return noise.argmax(axis=1)
+
+
+def opponent_actions(rng, legal):
+    """Versión vectorizada de get_opponent_move: centro, esquinas, aleatorio"""
+    actions = random_legal_actions(rng, legal)
+    corner_free = legal[:, CORNERS]
+    has_corner = corner_free.any(axis=1)
+    actions[has_corner] = CORNERS[corner_free[has_corner].argmax(axis=1)]
+    actions[legal[:, CENTER]] = CENTER
+    return actions
+
+
+def max_next_values(values, states, done):
+    """max_a Q(s', a) sobre acciones legales; 0 en estados terminales"""
+    legal = LEGAL_ACTIONS[states]
+    masked = np.where(legal, values[states], -np.inf).max(axis=1)
+    masked[done | ~legal.any(axis=1)] = 0.0
+    return masked
+
+
+def batch_q_update(q_table, states, actions, targets, alpha):
+    """Actualización de Bellman por lotes.
+
+    Si un mismo (estado, acción) aparece n veces en el lote, se aplica el
+    equivalente exacto de n actualizaciones secuenciales hacia el objetivo
+    medio: Q += (1 - (1 - alpha)**n) * (objetivo_medio - Q).
+    """
+    flat = states * NUM_CELLS + actions
+    unique, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+    mean_targets = np.bincount(inverse, weights=targets) / counts
+    values = q_table.values.reshape(-1)
+    current = values[unique]
+    step = 1.0 - (1.0 - alpha) ** counts
+    values[unique] = current + step * (mean_targets - current)
+    q_table.known.reshape(-1)[unique] = True
+
+
+def epsilon_schedule_array(episode_numbers, episodes, start=0.3, minimum=0.01, decay='linear'):
+    """Versión vectorizada de entrenamiento.epsilon_schedule"""
+    if decay == 'linear':
+        return np.maximum(minimum, start * (1 - episode_numbers / episodes))
+    if decay == 'exponential':
+        return np.maximum(minimum, start * (minimum / start) ** (episode_numbers / episodes))
+    return np.array([epsilon_schedule(e, episodes, start, minimum, decay)
+                     for e in episode_numbers])
+
+
+def train_agent_vectorized(episodes=20000, num_envs=4096, alpha=0.1, gamma=0.9,
+                           epsilon=0.3, epsilon_min=0.01, decay='linear', seed=None,
+                           save_path='q_table_20000.pkl', verbose=True):
+    """Entrena el agente jugando `num_envs` partidas a la vez"""
+    agent = QLearningAgent(alpha=alpha, gamma=gamma, epsilon=epsilon, backend='dense')
+    q_table = agent.q_table
+    rng = np.random.default_rng(seed)
+
+    if verbose:
+        print("\n" + "="*60)
+        print(f"ENTRENAMIENTO Q-LEARNING VECTORIZADO - {episodes:,} EPISODIOS")
+        print("="*60)
+
+    wins = 0
+    losses = 0
+    ties = 0
+    start_time = time.perf_counter()
+
+    for first_episode in range(0, episodes, num_envs):
+        batch = min(num_envs, episodes - first_episode)
+
+        # Reducir epsilon gradualmente (0.3 -> 0.01 por defecto), por episodio
+        episode_numbers = np.arange(first_episode, first_episode + batch)
+        epsilons = epsilon_schedule_array(episode_numbers, episodes, epsilon, epsilon_min, decay)
+
+        states = np.zeros(batch, dtype=np.int64)
+        active = np.arange(batch)
+
+        while len(active):
+            # Turno del agente (O): epsilon-greedy
+            current = states[active]
+            legal = LEGAL_ACTIONS[current]
+            greedy = np.where(legal, q_table.values[current], -np.inf).argmax(axis=1)
+            explore = rng.random(len(active)) < epsilons[active]
+            actions = np.where(explore, random_legal_actions(rng, legal), greedy)
+
+            next_states = current + 2 * CELL_POW3[actions]
+            results = WINNER_CODES[next_states]
+            done = results != ONGOING
+            rewards = np.where(results == O_WINS, 1.0, np.where(results == TIE, 0.5, 0.0))
+
+            # Actualizar Q-values
+            targets = rewards + gamma * max_next_values(q_table.values, next_states, done)
+            batch_q_update(q_table, current, actions, targets, alpha)
+
+            wins += int((results == O_WINS).sum())
+            ties += int((results == TIE).sum())
+
+            # Turno del oponente (X) en las partidas que siguen
+            active = active[~done]
+            next_states = next_states[~done]
+            opponent = opponent_actions(rng, LEGAL_ACTIONS[next_states])
+            next_states = next_states + CELL_POW3[opponent]
+            results = WINNER_CODES[next_states]
+            losses += int((results == X_WINS).sum())
+            ties += int((results == TIE).sum())
+
+            states[active] = next_states
+            active = active[results == ONGOING]
+
+        if verbose:
+            print_progress(first_episode + batch, episodes, wins, losses, ties)
+
+    elapsed = time.perf_counter() - start_time
+    agent.epsilon = epsilon_schedule(episodes - 1, episodes, epsilon, epsilon_min, decay)
+    agent.training_stats = {'episodes': episodes, 'wins': wins, 'losses': losses, 'ties': ties}
+
+    if save_path:
+        agent.save_q_table(save_path)
+
+    if verbose:
+        print(f"\n\n{'='*60}")
+        print("ENTRENAMIENTO COMPLETADO")
+        print(f"{'='*60}")
+        print(f"Total episodios: {episodes}")
+        print(f"Tiempo: {elapsed:.2f} s ({episodes / elapsed:,.0f} episodios/s)")
+        print(f"Tamaño tabla Q: {len(q_table)} estados")
+        print(f"Victorias finales: {wins} ({wins/episodes*100:.1f}%)")
+        print(f"Derrotas finales: {losses} ({losses/episodes*100:.1f}%)")
+        print(f"Empates finales: {ties} ({ties/episodes*100:.1f}%)")
+
+    return agent
+
+
+if __name__ == "__main__":
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_envs = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    train_agent_vectorized(episodes=episodes, num_envs=num_envs)
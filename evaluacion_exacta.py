@@ -0,0 +1,65 @@
+"""
+Evaluación exacta del agente recorriendo el árbol de juego completo.
+La política greedy del agente (choose_action sin exploración) es determinista,
+así que basta con seguirla y ramificar solo en las respuestas del oponente,
+ponderadas por su distribución de movimientos (uniforme entre las jugadas
+legales para los oponentes aleatorios). Las posiciones se memorizan, de modo
+que cada una se evalúa una sola vez (por su id en grafo_estados, avanzando por
+los ids de sucesor).
+Devuelve probabilidades exactas de victoria, derrota y empate: sin ruido y sin
+partidas simuladas.
+"""
+
+from grafo_estados import get_graph
+from iteracion_valor import opponent_distribution
+from tablero_bits import BOARD_VIEWS
+
+# (victoria, derrota, empate) de cada resultado final
+OUTCOMES = {'O': (1.0, 0.0, 0.0), 'X': (0.0, 1.0, 0.0), 'Tie': (0.0, 0.0, 1.0)}
+
+
+def _evaluate(agent, opponent_func, graph, state_id, memo):
+    """Probabilidades (victoria, derrota, empate) con el agente moviendo en `state_id`"""
+    if state_id in memo:
+        return memo[state_id]
+
+    board = [list(row) for row in BOARD_VIEWS[graph.state_index(state_id)]]
+    action = agent.choose_action(board, training=False)
+    if action is None:
+        # Sin jugadas: la partida quedó como esté (play_test_game hace lo mismo)
+        memo[state_id] = OUTCOMES.get(graph.result(state_id), (0.0, 0.0, 0.0))
+        return memo[state_id]
+
+    after = graph.successor(state_id, 'O', 3 * action[0] + action[1])
+    result = graph.result(after)
+    if result is not None:
+        memo[state_id] = OUTCOMES[result]
+        return memo[state_id]
+
+    wins = losses = ties = 0.0
+    distribution = opponent_distribution(opponent_func, graph.state_index(after))
+    for cell, probability in distribution.items():
+        reply = graph.successor(after, 'X', cell)
+        result = graph.result(reply)
+        if result is None:
+            win, loss, tie = _evaluate(agent, opponent_func, graph, reply, memo)
+        else:
+            win, loss, tie = OUTCOMES[result]
+        wins += probability * win
+        losses += probability * loss
+        ties += probability * tie
+
+    memo[state_id] = (wins, losses, ties)
+    return memo[state_id]
+
+
+def evaluate_exact(agent, opponents):
+    """Probabilidades exactas del agente ('O', empieza) contra cada oponente.
+    Devuelve {oponente: {'wins', 'losses', 'ties'}} con probabilidades.
+    """
+    graph = get_graph()
+    results = {}
+    for name, opponent_func in opponents:
+        win, loss, tie = _evaluate(agent, opponent_func, graph, 0, {})
+        results[name] = {'wins': win, 'losses': loss, 'ties': tie}
+    return results
@@ -0,0 +1,81 @@
+"""
+Evaluación paralela del agente con ProcessPoolExecutor.
+Las partidas de cada oponente se reparten en bloques con semilla propia; la
+tabla Q se envía una sola vez a cada proceso (inicializador del pool) y los
+conteos de victorias/derrotas/empates se suman al final.
+Los resultados dependen solo de la semilla, no del número de procesos.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from entrenamiento import QLearningAgent, TEST_OPPONENTS, play_test_game
+from tablero_bits import BitboardTicTacToeGame
+
+SHARD_SIZE = 10000
+
+# Agente y oponentes del proceso trabajador (se crean una vez en _init_worker)
+_worker_agent = None
+_worker_opponents = None
+
+
+def _init_worker(q_table, symmetric, opponents):
+    """Recibe la tabla Q y los oponentes una sola vez por proceso"""
+    global _worker_agent, _worker_opponents
+    _worker_agent = QLearningAgent(symmetric=symmetric)
+    _worker_agent.q_table = q_table
+    _worker_opponents = opponents
+
+
+def _play_shard(opponent_index, num_games, seed):
+    """Juega un bloque de partidas contra un oponente con su propia semilla"""
+    random.seed(seed)
+    game = BitboardTicTacToeGame()
+    opponent_func = _worker_opponents[opponent_index][1]
+    wins = 0
+    losses = 0
+    ties = 0
+    for _ in range(num_games):
+        winner = play_test_game(_worker_agent, game, opponent_func)
+        if winner == 'O':
+            wins += 1
+        elif winner == 'X':
+            losses += 1
+        elif winner == 'Tie':
+            ties += 1
+    return opponent_index, wins, losses, ties
+
+
+def make_shards(num_games, seed, shard_size=SHARD_SIZE, num_opponents=len(TEST_OPPONENTS)):
+    """Lista de (oponente, partidas, semilla) derivada solo de `seed`"""
+    seeds = random.Random(seed)
+    shards = []
+    for opponent_index in range(num_opponents):
+        for start in range(0, num_games, shard_size):
+            shards.append((opponent_index, min(shard_size, num_games - start),
+                           seeds.getrandbits(64)))
+    return shards
+
+
+def evaluate_parallel(agent, num_games=1000, workers=None, seed=0, shard_size=SHARD_SIZE,
+                      opponents=None):
+    """Evalúa `agent` contra `opponents` (TEST_OPPONENTS por defecto) usando
+    `workers` procesos. Los oponentes deben ser funciones de módulo.
+    Devuelve {oponente: {'wins', 'losses', 'ties'}}.
+    """
+    if opponents is None:
+        opponents = TEST_OPPONENTS
+    workers = workers or os.cpu_count()
+    results = {name: {'wins': 0, 'losses': 0, 'ties': 0} for name, _ in opponents}
+    shards = make_shards(num_games, seed, shard_size, len(opponents))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(agent.q_table, agent.symmetric, opponents)) as pool:
+        for opponent_index, wins, losses, ties in pool.map(_play_shard, *zip(*shards)):
+            counts = results[opponents[opponent_index][0]]
+            counts['wins'] += wins
+            counts['losses'] += losses
+            counts['ties'] += ties
+
+    return results
@@ -0,0 +1,114 @@
+"""
+Memoria de experiencia (replay buffer) para el entrenamiento Q-Learning.
+Las transiciones (estado, acción, recompensa, estado siguiente, terminal) se
+guardan en arrays NumPy preasignados de capacidad fija (buffer circular), con
+los estados como índices base 3 y la acción como casilla 0-8.
+replay() toma un lote aleatorio y aplica la ecuación de Bellman de golpe: sobre
+la tabla densa es una actualización vectorizada; con la tabla dict se recorre
+el lote.
+"""
+
+import numpy as np
+
+from entrenamiento_vectorizado import batch_q_update, max_next_values
+from tabla_q import DenseQTable
+from tablero_bits import index_key
+
+
+class ReplayBuffer:
+    """Buffer circular de transiciones en arrays preasignados"""
+
+    def __init__(self, capacity=50000, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+        # Transiciones añadidas desde el principio (position == added % capacity)
+        self.added = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        """Guarda una transición (sobrescribe la más antigua si está lleno)"""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.done[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.added += 1
+
+    def get_state(self, since=0):
+        """Transiciones añadidas desde que había `since` y generador del
+        buffer (para checkpoints: since=0 en la instantánea completa, el
+        `added` del checkpoint anterior en los deltas)"""
+        # Solo siguen en el buffer las últimas `capacity` transiciones
+        start = max(since, self.added - self.capacity)
+        slots = np.arange(start, self.added) % self.capacity
+        return {
+            'capacity': self.capacity,
+            'start': start,
+            'added': self.added,
+            'states': self.states[slots],
+            'actions': self.actions[slots],
+            'rewards': self.rewards[slots],
+            'next_states': self.next_states[slots],
+            'done': self.done[slots],
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state):
+        """Aplica lo guardado con get_state: una instantánea (start 0 o el
+        buffer ya lleno) o los añadidos posteriores al estado actual"""
+        if state['capacity'] != self.capacity:
+            raise ValueError(f"Memoria de experiencia de capacidad {state['capacity']}, "
+                             f"no {self.capacity}")
+        start = state['start']
+        if start > self.added and start > state['added'] - self.capacity:
+            raise ValueError(f"Faltan transiciones de la memoria de experiencia "
+                             f"({self.added} guardadas, el registro empieza en {start})")
+        slots = np.arange(start, state['added']) % self.capacity
+        for name in ('states', 'actions', 'rewards', 'next_states', 'done'):
+            getattr(self, name)[slots] = state[name]
+        self.added = state['added']
+        self.position = self.added % self.capacity
+        self.size = min(self.added, self.capacity)
+        self.rng.bit_generator.state = state['rng']
+
+    def sample(self, batch_size):
+        """Lote aleatorio (con reemplazo): arrays estado, acción, recompensa, siguiente, terminal"""
+        rows = self.rng.integers(0, self.size, size=batch_size)
+        return (self.states[rows].astype(np.int64), self.actions[rows].astype(np.int64),
+                self.rewards[rows], self.next_states[rows].astype(np.int64), self.done[rows])
+
+    def replay(self, q_table, batch_size, alpha, gamma):
+        """Actualiza `q_table` con un lote de transiciones pasadas"""
+        if not self.size:
+            return
+        states, actions, rewards, next_states, done = self.sample(batch_size)
+
+        if isinstance(q_table, DenseQTable):
+            targets = rewards + gamma * max_next_values(q_table.values, next_states, done)
+            batch_q_update(q_table, states, actions, targets.astype(np.float64), alpha)
+            if q_table.changed is not None:
+                q_table.changed.update((int(s), (int(a) // 3, int(a) % 3))
+                                       for s, a in zip(states, actions))
+            return
+
+        # Tabla dict: mismo lote, actualización secuencial por transición
+        for state, cell, reward, next_state, terminal in zip(
+                states.tolist(), actions.tolist(), rewards.tolist(),
+                next_states.tolist(), done.tolist()):
+            key = index_key(state)
+            action = (cell // 3, cell % 3)
+            max_next_q = 0 if terminal else q_table.max_q_value(index_key(next_state))
+            current_q = q_table.q_value(key, action)
+            q_table.set_q_value(key, action, current_q + alpha * (reward + gamma * max_next_q - current_q))
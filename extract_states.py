@@ -6,6 +6,8 @@ Genera 'tabla_10_estados_qlearning.txt'.
 
 import pickle
 
+from grafo_estados import available_moves, board_winner
+
 def extract_key_states (pkl_file='q_table_20000.pkl'):
     """
     Extrae 10 estados variados que demuestren el aprendizaje, incluyendo el estado inicial
@@ -198,11 +200,7 @@ def extract_key_states (pkl_file='q_table_20000.pkl'):
                     actions_count = len(actions)
                     
                     # Contar casillas vacías para acciones posibles
-                    empty_cells = 0
-                    for i in range(3):
-                        for j in range(3):
-                            if state[i*3 + j] == ' ':
-                                empty_cells += 1
+                    empty_cells = len(available_moves(state))
                     
                     actions_text = f"{empty_cells} casillas vacías"
                     if actions_count > 0:
@@ -588,17 +586,8 @@ def get_all_lines(board_3x3):
 
 def check_winner(board_3x3):
     """Verifica si hay ganador en un tablero 3x3"""
-    for i in range(3):
-        if board_3x3[i][0] != ' ' and board_3x3[i][0] == board_3x3[i][1] == board_3x3[i][2]:
-            return board_3x3[i][0]
-    for j in range(3):
-        if board_3x3[0][j] != ' ' and board_3x3[0][j] == board_3x3[1][j] == board_3x3[2][j]:
-            return board_3x3[0][j]
-    if board_3x3[0][0] != ' ' and board_3x3[0][0] == board_3x3[1][1] == board_3x3[2][2]:
-        return board_3x3[0][0]
-    if board_3x3[0][2] != ' ' and board_3x3[0][2] == board_3x3[1][1] == board_3x3[2][0]:
-        return board_3x3[0][2]
-    return None
+    winner = board_winner(board_3x3)
+    return winner if winner in ('X', 'O') else None
 
 # Ejecutar
 if __name__ == "__main__":
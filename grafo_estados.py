@@ -0,0 +1,196 @@
+"""
+Índice precalculado de todas las posiciones alcanzables del tres en raya
+(empiece X u O), con arrays compactos guardados en disco:
+- index[id]: estado en base 3 (formato de tablero_bits)
+- legal[id]: máscara de 9 bits con las casillas libres (0 si es terminal)
+- succ_x[id, casilla], succ_o[id, casilla]: id del estado tras mover X u O
+  en la casilla (-1 si esa jugada no es posible desde id)
+- terminal[id], winner[id]: fin de partida y resultado (WINNERS)
+Se genera una sola vez (caché junto a este módulo) y lo comparten
+entrenamiento y extract_states para consultar jugadas legales y ganador sin
+recalcular; iteracion_valor y evaluacion_exacta recorren el juego por los ids
+de sucesor en lugar de recalcular tableros. qlearning_agente usa directamente
+las máscaras de tablero_bits para no cargar NumPy ni la caché al arrancar la
+interfaz.
+Uso: python grafo_estados.py
+"""
+
+import os
+import zipfile
+
+import numpy as np
+
+from tablero_bits import (CELL_BITS, FREE_MOVES, NUM_CELLS, NUM_STATES, POW3,
+                          board_index, index_masks, key_index, masks_winner)
+
+# Junto al módulo, no en el directorio de trabajo de quien lo importe
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'grafo_estados.npz')
+
+# Códigos de winner[id] (los mismos que entrenamiento_vectorizado.WINNER_CODES)
+WINNERS = (None, 'X', 'O', 'Tie')
+WINNER_CODES = {winner: code for code, winner in enumerate(WINNERS)}
+
+
+class StateGraph:
+    """Grafo de estados alcanzables indexado por id compacto"""
+
+    def __init__(self, index, legal, succ_x, succ_o, terminal, winner):
+        self.index = index
+        self.legal = legal
+        self.succ_x = succ_x
+        self.succ_o = succ_o
+        self.terminal = terminal
+        self.winner = winner
+        # id de cada estado base 3 (-1 si no es alcanzable)
+        self.id_of = np.full(NUM_STATES, -1, dtype=np.int32)
+        self.id_of[index] = np.arange(len(index), dtype=np.int32)
+        # Vistas Python para consultas sueltas sin pasar por NumPy
+        self._id_of = self.id_of.tolist()
+        digits = (index.astype(np.int64)[:, None] // np.array(POW3)) % 3
+        occupied = ((digits != 0) << np.arange(NUM_CELLS)).sum(axis=1)
+        self._moves = [FREE_MOVES[mask] for mask in occupied.tolist()]
+        self._winners = [WINNERS[code] for code in winner.tolist()]
+        self._legal_cells = [[cell for cell in range(NUM_CELLS) if mask >> cell & 1]
+                             for mask in legal.tolist()]
+        self._successors = {'X': succ_x.tolist(), 'O': succ_o.tolist()}
+        self._indices = index.tolist()
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def build(cls):
+        """Recorre el juego desde el tablero vacío con ambos jugadores empezando"""
+        ids = {0: 0}
+        order = [0]
+        edges = []
+        for index in order:
+            x_mask, o_mask = index_masks(index)
+            if masks_winner(x_mask, o_mask) is not None:
+                continue
+            x_count = bin(x_mask).count('1')
+            o_count = bin(o_mask).count('1')
+            # Con igual número de fichas puede mover cualquiera (según quién empezó)
+            movers = []
+            if x_count <= o_count:
+                movers.append(('X', 1))
+            if o_count <= x_count:
+                movers.append(('O', 2))
+            occupied = x_mask | o_mask
+            for cell in range(NUM_CELLS):
+                if occupied & CELL_BITS[cell]:
+                    continue
+                for player, code in movers:
+                    child = index + code * POW3[cell]
+                    if child not in ids:
+                        ids[child] = len(order)
+                        order.append(child)
+                    edges.append((ids[index], player, cell, ids[child]))
+
+        count = len(order)
+        index = np.array(order, dtype=np.int32)
+        legal = np.zeros(count, dtype=np.uint16)
+        succ_x = np.full((count, NUM_CELLS), -1, dtype=np.int16)
+        succ_o = np.full((count, NUM_CELLS), -1, dtype=np.int16)
+        terminal = np.zeros(count, dtype=bool)
+        winner = np.zeros(count, dtype=np.int8)
+        for state_id, state in enumerate(order):
+            x_mask, o_mask = index_masks(state)
+            result = masks_winner(x_mask, o_mask)
+            winner[state_id] = WINNER_CODES[result]
+            terminal[state_id] = result is not None
+            if result is None:
+                legal[state_id] = 0x1FF & ~(x_mask | o_mask)
+        for state_id, player, cell, child_id in edges:
+            (succ_x if player == 'X' else succ_o)[state_id, cell] = child_id
+        return cls(index, legal, succ_x, succ_o, terminal, winner)
+
+    def save(self, filename=DEFAULT_CACHE):
+        np.savez_compressed(filename, index=self.index, legal=self.legal, succ_x=self.succ_x,
+                            succ_o=self.succ_o, terminal=self.terminal, winner=self.winner)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_CACHE):
+        with np.load(filename) as data:
+            graph = cls(data['index'], data['legal'], data['succ_x'], data['succ_o'],
+                        data['terminal'], data['winner'])
+        if graph.succ_x.shape != (len(graph), NUM_CELLS) or graph.index[0] != 0:
+            raise ValueError(f"{filename}: grafo con forma inesperada")
+        return graph
+
+    # --- Consultas por tablero (lista de listas) o clave de texto ---
+
+    def state_id(self, board):
+        """id del tablero o de la clave de 9 caracteres (-1 si no es alcanzable)"""
+        return self._id_of[_board_index(board)]
+
+    def moves(self, state_id):
+        """Casillas vacías (fila, columna) del estado, como get_available_moves
+        (en un estado terminal pueden quedar casillas; `legal` vale 0)"""
+        return self._moves[state_id]
+
+    def result(self, state_id):
+        """Ganador del estado: 'X', 'O', 'Tie' o None"""
+        return self._winners[state_id]
+
+    # --- Recorrido por ids (sin reconstruir tableros) ---
+
+    def legal_cells(self, state_id):
+        """Casillas 0-8 jugables del estado (ninguna si es terminal)"""
+        return self._legal_cells[state_id]
+
+    def state_index(self, state_id):
+        """Estado en base 3 (formato de tablero_bits) del id"""
+        return self._indices[state_id]
+
+    def successor(self, state_id, player, cell):
+        """id del estado tras mover `player` en `cell` (-1 si no es posible)"""
+        return self._successors[player][state_id][cell]
+
+
+_graph = None
+
+
+def get_graph(cache_file=DEFAULT_CACHE):
+    """Grafo compartido: se carga de la caché en disco o se genera una vez"""
+    global _graph
+    if _graph is None:
+        try:
+            _graph = StateGraph.load(cache_file)
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            _graph = StateGraph.build()
+            try:
+                _graph.save(cache_file)
+            except OSError:
+                pass
+    return _graph
+
+
+def _board_index(board):
+    return key_index(board) if isinstance(board, str) else board_index(board)
+
+
+def available_moves(board):
+    """Casillas vacías del tablero o clave (lista de (fila, columna))"""
+    index = _board_index(board)
+    state_id = get_graph()._id_of[index]
+    if state_id < 0:
+        x_mask, o_mask = index_masks(index)
+        return list(FREE_MOVES[x_mask | o_mask])
+    return list(get_graph().moves(state_id))
+
+
+def board_winner(board):
+    """Ganador del tablero o clave ('X', 'O', 'Tie' o None), también fuera del grafo"""
+    index = _board_index(board)
+    state_id = get_graph()._id_of[index]
+    if state_id < 0:
+        return masks_winner(*index_masks(index))
+    return get_graph().result(state_id)
+
+
+if __name__ == "__main__":
+    graph = StateGraph.build()
+    graph.save(DEFAULT_CACHE)
+    print(f"Estados alcanzables: {len(graph)} | terminales: {int(graph.terminal.sum())} "
+          f"-> {DEFAULT_CACHE}")
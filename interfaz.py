@@ -2,14 +2,25 @@
 Interfaz Pygame para jugar contra la IA entrenada con Q-Learning.
 Tablero interactivo, turnos, estadísticas y visualización de resultados.
 Requiere el archivo q_table_20000.pkl generado por el entrenamiento.
+Uso: python interfaz.py [--tabla q_table_20000.pkl] [--grabar clics.json]
+(--grabar guarda los clics de la sesión para reproducirlos con
+interfaz_sin_pantalla.py)
+
+La ventana se abre antes de cargar nada más: las fuentes se crean al abrirla
+y el agente (módulo y tabla Q) se carga en un hilo mientras se muestra
+"Cargando la IA...". Al terminar se imprime el desglose del arranque, con
+"listo" contado desde el import de este módulo (pygame incluido).
 """
 
+import argparse
+import json
 import sys
+import threading
 import time
-import pygame
-from qlearning_agente import GameState
 
-pygame.init()
+_import_start = time.perf_counter()
+import pygame
+IMPORT_SECONDS = time.perf_counter() - _import_start
 
 # --- CONSTANTES Y COLORES ---
 WHITE = (255, 255, 255)
@@ -31,29 +42,100 @@ BOARD_HEIGHT = BOARD_SIZE * CELL_SIZE
 BOARD_OFFSET_X = (WINDOW_WIDTH - BOARD_WIDTH) // 2
 BOARD_OFFSET_Y = (WINDOW_HEIGHT - BOARD_HEIGHT) // 2 - 30
 
-# Fuentes
-font_title = pygame.font.SysFont('Arial Black', 44, bold=True)
-font_medium = pygame.font.SysFont('Arial', 26)
-font_small = pygame.font.SysFont('Arial', 20)
-font_tiny = pygame.font.SysFont('Arial', 16)
+# Panel de estadísticas
+STATS_RECT = pygame.Rect(WINDOW_WIDTH - 240, 120, 230, 260)
+
+# Máximo de fotogramas por segundo mientras llegan eventos
+FPS = 60
+
+# Eventos tras los que la ventana debe repintarse entera
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+# Turno de la IA: pausa de "pensando" (temporizador, no bloquea el bucle) y
+# evento con el movimiento calculado en el hilo de trabajo
+AI_DELAY_MS = 500
+AI_DELAY_EVENT = pygame.USEREVENT + 1
+AI_MOVE_EVENT = pygame.USEREVENT + 2
+
+# Agente cargado en segundo plano (o error de carga)
+AGENT_READY_EVENT = pygame.USEREVENT + 3
+
+# Segundos que se muestra el error de carga antes de cerrar
+LOAD_ERROR_MS = 3000
+
+# Fuentes (nombre, tamaño, negrita); se crean al abrir la ventana
+FONT_SPECS = {
+    'title': ('Arial Black', 44, True),
+    'medium': ('Arial', 26, False),
+    'small': ('Arial', 20, False),
+    'tiny': ('Arial', 16, False),
+}
+_fonts = None
+
+
+def get_fonts():
+    """Fuentes de la interfaz, creadas la primera vez que se piden (y de
+    nuevo si pygame.quit cerró el módulo de fuentes)"""
+    global _fonts
+    if _fonts is None or not pygame.font.get_init():
+        pygame.font.init()
+        _fonts = {name: pygame.font.SysFont(face, size, bold=bold)
+                  for name, (face, size, bold) in FONT_SPECS.items()}
+    return _fonts
+
+
+def load_agent(table_file=None):
+    """Importa el agente y carga su tabla Q (se ejecuta en el hilo de carga).
+    Devuelve (GameState o None, mensaje de error, tiempos en segundos)."""
+    start = time.perf_counter()
+    from qlearning_agente import GameState
+    state = GameState()
+    imported = time.perf_counter()
+    ok = state.agent.load_q_table(table_file)
+    loaded = time.perf_counter()
+    times = {'agent_import': imported - start, 'table_load': loaded - imported}
+    if not ok:
+        return None, state.agent.load_error, times
+    return state, None, times
 
 
 class GameGUI:
-    """Clase principal para la interfaz gráfica del juego Tres en Raya."""
+    """Clase principal para la interfaz gráfica del juego Tres en Raya.
+
+    El fondo, el tablero vacío, el marco del panel y los dos estados del botón
+    se dibujan una sola vez en superficies; en cada fotograma solo se vuelven
+    a pintar los elementos cuyo estado cambió y solo se actualizan sus
+    rectángulos en pantalla.
+    """
+
+    def __init__(self, table_file=None, record_file=None):
+        """Inicializa la interfaz gráfica del juego.
+        record_file: si se indica, al salir se guardan ahí los clics (JSON).
+        La tabla Q se carga en segundo plano: hasta que llega
+        AGENT_READY_EVENT, self.state es None y los clics se ignoran.
+        """
+        self._start = time.perf_counter()
+        self.startup_times = {'import': IMPORT_SECONDS}
 
-    def __init__(self):
-        """Inicializa la interfaz gráfica del juego."""
+        # Ventana visible cuanto antes (solo el subsistema de vídeo)
+        pygame.display.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Tres en Raya - Q-Learning")
+        self.screen.fill(BACKGROUND)
+        pygame.display.flip()
         self.clock = pygame.time.Clock()
-        self.state = GameState()
+        self.startup_times['init'] = time.perf_counter() - self._start
 
-        # Cargar agente entrenado
-        if not self.state.agent.load_q_table():
-            print("ERROR: Ejecuta primero 'entrenamiento_q_learning_20000.py'")
-            time.sleep(3)
-            pygame.quit()
-            sys.exit()
+        # Cargar agente entrenado en un hilo mientras se preparan las fuentes
+        self.state = None
+        self.load_error = None
+        loader = threading.Thread(target=self._load_agent,
+                                  args=(table_file,), daemon=True)
+        loader.start()
+
+        start = time.perf_counter()
+        self.fonts = get_fonts()
+        self.startup_times['fonts'] = time.perf_counter() - start
 
         # Botón centrado debajo del tablero
         button_width = 180
@@ -63,141 +145,253 @@ class GameGUI:
         self.new_game_button = pygame.Rect(button_x, button_y,
                                            button_width, button_height)
 
-    def draw_background(self):
-        """Dibuja el fondo de la ventana."""
-        self.screen.fill(BACKGROUND)
+        start = time.perf_counter()
+        self._text_cache = {}
+        self._build_surfaces()
+        self.startup_times['surfaces'] = time.perf_counter() - start
+        # Estado ya dibujado de cada elemento (None: hay que pintarlo)
+        self._drawn = {}
+        self._drawn_cells = [None] * (BOARD_SIZE * BOARD_SIZE)
+        self._status_rect = None
+        self._full_redraw = True
+
+        # Turno de la IA en curso: identificador (descarta resultados de
+        # partidas ya reiniciadas), pausa cumplida, resultado del hilo
+        # recibido y movimiento (None si el agente no dio ninguno)
+        self.ai_delay_ms = AI_DELAY_MS
+        self._ai_turn = 0
+        self._ai_delay_done = False
+        self._ai_arrived = False
+        self._ai_move = None
+
+        # Clics de la sesión (posiciones de pantalla) si se graban
+        self.record_file = record_file
+        self.recorded_clicks = [] if record_file else None
+
+    def _load_agent(self, table_file):
+        """Hilo de carga: avisa al bucle de eventos cuando el agente está listo.
+        Cualquier fallo se envía como error: el hilo siempre publica el evento
+        y la ventana nunca se queda en "Cargando la IA..."."""
+        try:
+            state, error, times = load_agent(table_file)
+        except Exception as exception:
+            state, error, times = None, f"No se pudo cargar la IA: {exception!r}", {}
+        pygame.event.post(pygame.event.Event(AGENT_READY_EVENT, state=state,
+                                             error=error, times=times))
+
+    def agent_ready(self, event):
+        """Instala el agente cargado o muestra el error de carga."""
+        self.startup_times.update(event.times)
+        # Desde el import del módulo: import de pygame + tiempo desde la creación
+        self.startup_times['ready'] = IMPORT_SECONDS + time.perf_counter() - self._start
+        if event.state is None:
+            self.load_error = event.error or "No se pudo cargar la IA"
+            print(f"ERROR: {event.error}")
+            print("ERROR: Ejecuta primero 'entrenamiento_q_learning_20000.py'")
+            pygame.time.set_timer(pygame.QUIT, LOAD_ERROR_MS, loops=1)
+            return
+        self.state = event.state
+        print(self.startup_report())
+
+    def startup_report(self):
+        """Desglose del arranque en milisegundos"""
+        ms = {name: seconds * 1000 for name, seconds in self.startup_times.items()}
+        return (f"Arranque: import {ms['import']:.0f} ms | init {ms['init']:.0f} ms | "
+                f"fuentes {ms['fonts']:.0f} ms | superficies {ms['surfaces']:.0f} ms | "
+                f"agente {ms['agent_import']:.0f} ms + tabla {ms['table_load']:.0f} ms "
+                f"(en segundo plano) | listo en {ms['ready']:.0f} ms (import incluido)")
+
+    def _text(self, font, text, color):
+        """Texto renderizado, reutilizado mientras no cambie"""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = self._text_cache[key] = font.render(text, True, color)
+        return surface
+
+    def _build_surfaces(self):
+        """Prerrenderiza las partes estáticas de la ventana"""
+        background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        background.fill(BACKGROUND)
 
-    def draw_board(self):
-        """Dibuja el tablero de juego con todas las celdas y marcas."""
         # Fondo del tablero
         board_rect = pygame.Rect(
             BOARD_OFFSET_X - 5, BOARD_OFFSET_Y - 5,
             BOARD_WIDTH + 10, BOARD_HEIGHT + 10
         )
-        pygame.draw.rect(self.screen, WHITE, board_rect)
-        pygame.draw.rect(self.screen, BLACK, board_rect, 2)
+        pygame.draw.rect(background, WHITE, board_rect)
+        pygame.draw.rect(background, BLACK, board_rect, 2)
 
         # Líneas del tablero
         line_width = 4
         for i in range(1, BOARD_SIZE):
             x_pos = BOARD_OFFSET_X + i * CELL_SIZE
             pygame.draw.line(
-                self.screen, BLACK,
+                background, BLACK,
                 (x_pos, BOARD_OFFSET_Y),
                 (x_pos, BOARD_OFFSET_Y + BOARD_HEIGHT),
                 line_width
             )
             y_pos = BOARD_OFFSET_Y + i * CELL_SIZE
             pygame.draw.line(
-                self.screen, BLACK,
+                background, BLACK,
                 (BOARD_OFFSET_X, y_pos),
                 (BOARD_OFFSET_X + BOARD_WIDTH, y_pos),
                 line_width
             )
 
-        # Dibujar X y O
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                cell_x = (BOARD_OFFSET_X + col * CELL_SIZE +
-                          (CELL_SIZE // 2))
-                cell_y = (BOARD_OFFSET_Y + row * CELL_SIZE +
-                          (CELL_SIZE // 2))
-
-                if self.state.board[row][col] == 'X':
-                    pygame.draw.line(
-                        self.screen, PLAYER_X_COLOR,
-                        (cell_x - 40, cell_y - 40),
-                        (cell_x + 40, cell_y + 40), 8
-                    )
-                    pygame.draw.line(
-                        self.screen, PLAYER_X_COLOR,
-                        (cell_x + 40, cell_y - 40),
-                        (cell_x - 40, cell_y + 40), 8
-                    )
-                elif self.state.board[row][col] == 'O':
-                    pygame.draw.circle(
-                        self.screen, PLAYER_O_COLOR,
-                        (cell_x, cell_y), 40, 8
-                    )
-
         # Título
         title_text = "TRES EN RAYA - Q-LEARNING"
-        title = font_title.render(title_text, True, ACCENT_YELLOW)
-        self.screen.blit(title,
-                         (WINDOW_WIDTH // 2 - title.get_width() // 2, 30))
+        title = self.fonts['title'].render(title_text, True, ACCENT_YELLOW)
+        background.blit(title,
+                        (WINDOW_WIDTH // 2 - title.get_width() // 2, 30))
 
         # Subtítulo
         subtitle_text = "Humano (X) vs IA (O)"
-        subtitle = font_medium.render(subtitle_text, True, WHITE)
-        self.screen.blit(subtitle,
-                         (WINDOW_WIDTH // 2 - subtitle.get_width() // 2, 85))
+        subtitle = self.fonts['medium'].render(subtitle_text, True, WHITE)
+        background.blit(subtitle,
+                        (WINDOW_WIDTH // 2 - subtitle.get_width() // 2, 85))
+        self._background = background
+
+        # Marco del panel de estadísticas (fondo, borde, título y separador)
+        panel = pygame.Surface(STATS_RECT.size).convert()
+        panel.fill((40, 50, 90))
+        pygame.draw.rect(panel, PRIMARY_BLUE, panel.get_rect(), 1)
+        stats_title = self.fonts['medium'].render("ESTADÍSTICAS", True, ACCENT_YELLOW)
+        panel.blit(stats_title,
+                   ((STATS_RECT.width - stats_title.get_width()) // 2, 10))
+        pygame.draw.line(panel, ACCENT_YELLOW,
+                         (20, 40), (STATS_RECT.width - 20, 40), 1)
+        self._stats_panel = panel
+
+        # Marcas X y O sobre fondo transparente, del tamaño de una celda
+        center = CELL_SIZE // 2
+        mark_x = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        pygame.draw.line(mark_x, PLAYER_X_COLOR, (center - 40, center - 40),
+                         (center + 40, center + 40), 8)
+        pygame.draw.line(mark_x, PLAYER_X_COLOR, (center + 40, center - 40),
+                         (center - 40, center + 40), 8)
+        mark_o = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(mark_o, PLAYER_O_COLOR, (center, center), 40, 8)
+        self._marks = {'X': mark_x.convert_alpha(), 'O': mark_o.convert_alpha()}
+
+        # Botón Nuevo Juego en sus dos estados (normal y ratón encima),
+        # sobre un recorte del fondo para que las esquinas queden bien
+        self._button_surfaces = {}
+        for hover, button_color in ((False, (30, 140, 70)),
+                                    (True, (30, 160, 80))):
+            surface = background.subsurface(self.new_game_button).copy()
+            local_rect = surface.get_rect()
+            pygame.draw.rect(surface, button_color, local_rect, border_radius=6)
+            text = self.fonts['small'].render("NUEVO JUEGO", True, WHITE)
+            surface.blit(
+                text,
+                (local_rect.centerx - text.get_width() // 2,
+                 local_rect.centery - text.get_height() // 2)
+            )
+            self._button_surfaces[hover] = surface
 
-    def draw_game_status(self):
-        """Dibuja el estado actual del juego (turno o resultado)."""
-        status_y = BOARD_OFFSET_Y + BOARD_HEIGHT + 20
+    def _cell_rect(self, row, col):
+        return pygame.Rect(BOARD_OFFSET_X + col * CELL_SIZE,
+                           BOARD_OFFSET_Y + row * CELL_SIZE,
+                           CELL_SIZE, CELL_SIZE)
 
+    def draw_background(self):
+        """Dibuja el fondo completo (con tablero vacío y títulos) y obliga a
+        repintar todos los elementos."""
+        self.screen.blit(self._background, (0, 0))
+        self._drawn.clear()
+        self._drawn_cells = [' '] * (BOARD_SIZE * BOARD_SIZE)
+        self._status_rect = None
+        self._full_redraw = True
+
+    def draw_board(self):
+        """Dibuja las marcas que cambiaron desde el último fotograma.
+        Devuelve los rectángulos modificados."""
+        if self.state is None:
+            # Aún cargando: el fondo ya tiene el tablero vacío
+            return []
+        dirty = []
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                mark = self.state.board[row][col]
+                cell = row * BOARD_SIZE + col
+                if self._drawn_cells[cell] == mark:
+                    continue
+                rect = self._cell_rect(row, col)
+                self.screen.blit(self._background, rect, rect)
+                if mark in self._marks:
+                    self.screen.blit(self._marks[mark], rect)
+                self._drawn_cells[cell] = mark
+                dirty.append(rect)
+        return dirty
+
+    def _status(self):
+        if self.state is None:
+            if self.load_error:
+                return "ERROR al cargar la IA", PLAYER_X_COLOR
+            return "Cargando la IA...", ACCENT_YELLOW
         if self.state.game_over:
             if self.state.winner == 'X':
-                status_text = "¡GANASTE!"
-                color = PLAYER_X_COLOR
-            elif self.state.winner == 'O':
-                status_text = "GANA LA IA"
-                color = PLAYER_O_COLOR
-            else:
-                status_text = "EMPATE"
-                color = ACCENT_YELLOW
-        else:
-            if self.state.current_player == 'X':
-                status_text = "Tu turno (X) - Haz clic"
-                color = PLAYER_X_COLOR
-            else:
-                status_text = "Turno de la IA (O)"
-                color = PLAYER_O_COLOR
+                return "¡GANASTE!", PLAYER_X_COLOR
+            if self.state.winner == 'O':
+                return "GANA LA IA", PLAYER_O_COLOR
+            return "EMPATE", ACCENT_YELLOW
+        if self.state.current_player == 'X':
+            return "Tu turno (X) - Haz clic", PLAYER_X_COLOR
+        return "Turno de la IA (O)", PLAYER_O_COLOR
 
-        status = font_medium.render(status_text, True, color)
-        self.screen.blit(
-            status,
-            (WINDOW_WIDTH // 2 - status.get_width() // 2, status_y)
-        )
+    def draw_game_status(self):
+        """Dibuja el estado actual del juego (turno o resultado) si cambió.
+        Devuelve los rectángulos modificados."""
+        status_text, color = self._status()
+        moves_made = self.state.moves_made if self.state else 0
+        moves_line = f"Movimiento: {moves_made}/9"
+        key = (status_text, moves_line)
+        if self._drawn.get('status') == key:
+            return []
 
-        # Mostrar movimientos
-        moves_text = font_small.render(
-            f"Movimiento: {self.state.moves_made}/9", True, WHITE
-        )
-        self.screen.blit(
-            moves_text,
-            (WINDOW_WIDTH // 2 - moves_text.get_width() // 2, status_y + 30)
-        )
+        status_y = BOARD_OFFSET_Y + BOARD_HEIGHT + 20
+        status = self._text(self.fonts['medium'], status_text, color)
+        moves_text = self._text(self.fonts['small'], moves_line, WHITE)
+        status_pos = status.get_rect(
+            topleft=(WINDOW_WIDTH // 2 - status.get_width() // 2, status_y))
+        moves_pos = moves_text.get_rect(
+            topleft=(WINDOW_WIDTH // 2 - moves_text.get_width() // 2,
+                     status_y + 30))
+
+        # Se borra el texto anterior restaurando el fondo
+        area = status_pos.union(moves_pos)
+        if self._status_rect is not None:
+            area.union_ip(self._status_rect)
+        self.screen.blit(self._background, area, area)
+        self.screen.blit(status, status_pos)
+        self.screen.blit(moves_text, moves_pos)
+
+        self._status_rect = status_pos.union(moves_pos)
+        self._drawn['status'] = key
+        return [area]
 
     def draw_stats(self):
-        """Dibuja el panel de estadísticas del juego."""
-        stats_x = WINDOW_WIDTH - 240
-        stats_y = 120
-        stats_width = 230
-        stats_height = 260
-
-        # Fondo simple
-        stats_rect = pygame.Rect(stats_x, stats_y, stats_width, stats_height)
-        pygame.draw.rect(self.screen, (40, 50, 90), stats_rect)
-        pygame.draw.rect(self.screen, PRIMARY_BLUE, stats_rect, 1)
-
-        # Título
-        stats_title = font_medium.render("ESTADÍSTICAS", True, ACCENT_YELLOW)
-        self.screen.blit(
-            stats_title,
-            (stats_x + (stats_width - stats_title.get_width()) // 2,
-             stats_y + 10)
-        )
-
-        # Línea separadora
-        pygame.draw.line(
-            self.screen, ACCENT_YELLOW,
-            (stats_x + 20, stats_y + 40),
-            (stats_x + stats_width - 20, stats_y + 40), 1
-        )
+        """Dibuja el panel de estadísticas del juego si cambió.
+        Devuelve los rectángulos modificados."""
+        if self.state is None:
+            # Aún cargando: solo el marco del panel
+            key = 'loading'
+        else:
+            stats = self.state.agent.stats
+            key = (stats['total_games'], stats['wins'], stats['losses'],
+                   stats['ties'], stats['states_learned'])
+        if self._drawn.get('stats') == key:
+            return []
+
+        stats_x, stats_y = STATS_RECT.topleft
+        self.screen.blit(self._stats_panel, STATS_RECT)
+        if self.state is None:
+            self._drawn['stats'] = key
+            return [STATS_RECT]
 
         # Estadísticas
-        stats = self.state.agent.stats
         total = stats['total_games']
 
         if total > 0:
@@ -230,7 +424,7 @@ class GameGUI:
             else:
                 color = WHITE
 
-            text = font_small.render(line, True, color)
+            text = self._text(self.fonts['small'], line, color)
             self.screen.blit(text, (stats_x + 15, line_y))
             line_y += 32
 
@@ -252,25 +446,38 @@ class GameGUI:
                 (bar_x, bar_y, effective_width, bar_height), border_radius=3
             )
 
-    def draw_buttons(self):
-        """Dibuja los botones interactivos de la interfaz."""
-        mouse_pos = pygame.mouse.get_pos()
-
-        # Botón Nuevo Juego CENTRADO
-        if self.new_game_button.collidepoint(mouse_pos):
-            button_color = (30, 160, 80)
-        else:
-            button_color = (30, 140, 70)
-
-        pygame.draw.rect(self.screen, button_color,
-                         self.new_game_button, border_radius=6)
+        self._drawn['stats'] = key
+        return [STATS_RECT]
 
-        text = font_small.render("NUEVO JUEGO", True, WHITE)
-        self.screen.blit(
-            text,
-            (self.new_game_button.centerx - text.get_width() // 2,
-             self.new_game_button.centery - text.get_height() // 2)
-        )
+    def draw_buttons(self):
+        """Dibuja los botones interactivos si cambió su estado.
+        Devuelve los rectángulos modificados."""
+        hover = self.new_game_button.collidepoint(pygame.mouse.get_pos())
+        if self._drawn.get('buttons') == hover:
+            return []
+        self.screen.blit(self._button_surfaces[hover], self.new_game_button)
+        self._drawn['buttons'] = hover
+        return [self.new_game_button]
+
+    def render(self):
+        """Pinta lo que haya cambiado y actualiza solo esos rectángulos.
+        Devuelve la lista de rectángulos actualizados."""
+        if self._full_redraw:
+            self.draw_background()
+        dirty = self.draw_board() + self.draw_game_status() + self.draw_stats()
+        # El botón va encima del texto de estado: si este se repintó, el
+        # botón también
+        if any(rect.colliderect(self.new_game_button) for rect in dirty):
+            self._drawn.pop('buttons', None)
+        dirty += self.draw_buttons()
+
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+            return [self.screen.get_rect()]
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
 
     def get_cell_from_pos(self, pos):
         """
@@ -285,74 +492,164 @@ class GameGUI:
                 return row, col
         return None
 
-    def run(self):
-        """Bucle principal del juego que maneja eventos y actualizaciones."""
-        running = True
-
-        while running:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Botón nuevo juego
-                    if self.new_game_button.collidepoint(mouse_pos):
-                        self.state.reset()
-
-                    # Movimiento del humano
-                    if (not self.state.game_over and
-                            not self.state.ia_thinking and
-                            self.state.current_player == 'X'):
-                        cell = self.get_cell_from_pos(mouse_pos)
-                        if cell and self.state.make_move(*cell, 'X'):
-                            self.state.winner = self.state.check_winner()
-                            if self.state.winner:
-                                self.state.game_over = True
-                                self.state.agent.update_stats(
-                                    self.state.winner
-                                )
-                            else:
-                                self.state.current_player = 'O'
-                                self.state.ia_thinking = True
-
-            # Dibujar todo
-            self.draw_background()
-            self.draw_board()
-            self.draw_game_status()
-            self.draw_stats()
-            self.draw_buttons()
-
-            # Turno de la IA
+    def handle_event(self, event):
+        """Procesa un evento. Devuelve False si hay que cerrar el juego."""
+        if event.type == pygame.QUIT:
+            return False
+
+        if event.type in REDRAW_EVENTS:
+            # La ventana se volvió a mostrar: repintado completo
+            self._full_redraw = True
+
+        elif event.type == AGENT_READY_EVENT:
+            self.agent_ready(event)
+
+        elif event.type == AI_DELAY_EVENT:
+            if event.turn == self._ai_turn and self.state.ia_thinking:
+                self._ai_delay_done = True
+                self.finish_ai_turn()
+
+        elif event.type == AI_MOVE_EVENT:
+            if event.turn == self._ai_turn and self.state.ia_thinking:
+                if event.error:
+                    print(f"ERROR: la IA falló al elegir movimiento: {event.error}")
+                self._ai_arrived = True
+                self._ai_move = event.move
+                self.finish_ai_turn()
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if self.state is None:
+                # Agente aún sin cargar: el clic se ignora (y no se graba)
+                return True
+            if self.recorded_clicks is not None:
+                self.recorded_clicks.append(list(event.pos))
+
+            # Botón nuevo juego
+            if self.new_game_button.collidepoint(event.pos):
+                self.cancel_ai_turn()
+                self.state.reset()
+
+            # Movimiento del humano
             if (not self.state.game_over and
-                    self.state.current_player == 'O' and
-                    self.state.ia_thinking):
-                pygame.display.flip()
-                pygame.time.delay(500)
-
-                best_move = self.state.agent.get_best_move(
-                    self.state.board
-                )
-
-                if best_move:
-                    self.state.make_move(best_move[0], best_move[1], 'O')
+                    not self.state.ia_thinking and
+                    self.state.current_player == 'X'):
+                cell = self.get_cell_from_pos(event.pos)
+                if cell and self.state.make_move(*cell, 'X'):
                     self.state.winner = self.state.check_winner()
                     if self.state.winner:
                         self.state.game_over = True
-                        self.state.agent.update_stats(self.state.winner)
+                        self.state.agent.update_stats(
+                            self.state.winner
+                        )
                     else:
-                        self.state.current_player = 'X'
+                        self.state.current_player = 'O'
+                        self.state.ia_thinking = True
+                        self.start_ai_turn()
+        return True
+
+    def start_ai_turn(self):
+        """Empieza el turno de la IA sin bloquear el bucle de eventos: arranca
+        el temporizador de la pausa y calcula el movimiento en un hilo."""
+        self._ai_turn += 1
+        self._ai_delay_done = False
+        self._ai_arrived = False
+        self._ai_move = None
+        if self.ai_delay_ms > 0:
+            pygame.time.set_timer(
+                pygame.event.Event(AI_DELAY_EVENT, turn=self._ai_turn),
+                self.ai_delay_ms, loops=1
+            )
+        else:
+            self._ai_delay_done = True
+        board = [row[:] for row in self.state.board]
+        worker = threading.Thread(target=self._compute_ai_move,
+                                  args=(self._ai_turn, board), daemon=True)
+        worker.start()
+
+    def _compute_ai_move(self, turn, board):
+        """Hilo de trabajo: calcula el movimiento y lo envía como evento.
+        El evento se publica siempre; si el agente falla lleva el error."""
+        move = error = None
+        try:
+            move = self.state.agent.get_best_move(board)
+        except Exception as exception:
+            error = repr(exception)
+        pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, turn=turn,
+                                             move=move, error=error))
+
+    def cancel_ai_turn(self):
+        """Descarta el turno de la IA en curso (nuevo juego)."""
+        pygame.time.set_timer(AI_DELAY_EVENT, 0)
+        self._ai_turn += 1
+
+    def finish_ai_turn(self):
+        """Aplica el movimiento de la IA cuando ya pasó la pausa y el hilo
+        terminó (en cualquier orden)."""
+        if not self._ai_delay_done or not self._ai_arrived:
+            return
+        best_move = self._ai_move
+        self._ai_arrived = False
+        self._ai_move = None
+
+        # Sin movimiento válido del agente se usa la regla de respaldo, para
+        # que el turno termine siempre
+        if not (best_move and
+                self.state.make_move(best_move[0], best_move[1], 'O')):
+            best_move = self.state.agent.get_fallback_move(self.state.board)
+            if best_move:
+                self.state.make_move(best_move[0], best_move[1], 'O')
+
+        self.state.winner = self.state.check_winner() if best_move else None
+        if self.state.winner:
+            self.state.game_over = True
+            self.state.agent.update_stats(self.state.winner)
+        else:
+            self.state.current_player = 'X'
 
-                self.state.ia_thinking = False
+        self.state.ia_thinking = False
 
-            pygame.display.flip()
-            self.clock.tick(60)
+    def step(self, events):
+        """Un fotograma: procesa los eventos y repinta lo que cambió.
+        Devuelve False si hay que cerrar el juego."""
+        running = True
+        for event in events:
+            if not self.handle_event(event):
+                running = False
+        self.render()
+        return running
+
+    def run(self):
+        """Bucle principal del juego que maneja eventos y actualizaciones.
+        Sin nada pendiente espera bloqueado al siguiente evento, así que la
+        ventana no consume CPU mientras nadie juega."""
+        running = True
+        self.render()
+
+        while running:
+            # El turno de la IA también llega como eventos (pausa y
+            # movimiento), así que el bucle nunca se bloquea fuera de aquí
+            events = [pygame.event.wait()] + pygame.event.get()
+            running = self.step(events)
+            # Limita el repintado si llegan muchos eventos seguidos (ratón)
+            self.clock.tick(FPS)
+
+        if self.record_file:
+            with open(self.record_file, 'w', encoding='utf-8') as f:
+                json.dump(self.recorded_clicks, f)
+            print(f"Clics guardados en {self.record_file}")
 
         pygame.quit()
         sys.exit()
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Tres en Raya contra la IA")
+    parser.add_argument('--tabla', default=None, help="tabla Q (.pkl, .npz o .qtb)")
+    parser.add_argument('--grabar', help="guardar los clics de la sesión en JSON")
+    args = parser.parse_args()
+    game = GameGUI(args.tabla, args.grabar)
+    game.run()
+
+
 if __name__ == "__main__":
-    game = GameGUI()
-    game.run()
\ No newline at end of file
+    main()
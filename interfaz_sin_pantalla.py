@@ -0,0 +1,182 @@
+"""
+Modo sin pantalla de la interfaz (driver de vídeo 'dummy' de SDL) para medir
+el coste de dibujo de GameGUI sin GPU ni nadie haciendo clic.
+Reproduce clics de pantalla a través del bucle de eventos normal (los clics
+pasan por get_cell_from_pos en handle_event y el turno de la IA llega como
+eventos de temporizador y del hilo de trabajo):
+- guionizados: el humano elige al azar (con semilla) una celda libre
+- grabados: la lista de posiciones guardada con `interfaz.py --grabar`
+Informa del tiempo por fotograma de draw_board, draw_game_status, draw_stats
+y draw_buttons, del fotograma completo y de los fotogramas por partida (más
+el desglose del arranque de la interfaz).
+Uso: python interfaz_sin_pantalla.py [--partidas 200 --semilla 0]
+                                     [--clics clics.json] [--output gui.json]
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+import pygame
+
+from interfaz import BOARD_OFFSET_X, BOARD_OFFSET_Y, CELL_SIZE, GameGUI
+
+# Espera máxima de cada pygame.event.wait (ms): el proceso sigue atendiendo
+# señales aunque no llegue ningún evento
+WAIT_MS = 100
+
+DRAW_METHODS = ('draw_board', 'draw_game_status', 'draw_stats', 'draw_buttons')
+
+
+class FrameTimer:
+    """Cronometra cada llamada a los métodos de dibujo y a render de una GameGUI"""
+
+    def __init__(self, gui):
+        self.times = {name: [] for name in DRAW_METHODS + ('frame',)}
+        for name in DRAW_METHODS:
+            setattr(gui, name, self._timed(name, getattr(gui, name)))
+        gui.render = self._timed('frame', gui.render)
+
+    def _timed(self, name, method):
+        times = self.times[name]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            result = method(*args, **kwargs)
+            times.append(time.perf_counter_ns() - start)
+            return result
+        return timed
+
+    @property
+    def frames(self):
+        return len(self.times['frame'])
+
+    def summary(self):
+        """Media, p50, p99 y máximo (µs) por método de dibujo y por fotograma"""
+        result = {}
+        for name, times in self.times.items():
+            if not times:
+                continue
+            times_us = np.array(times) / 1000.0
+            result[name] = {
+                'calls': len(times),
+                'mean_us': float(times_us.mean()),
+                'p50_us': float(np.percentile(times_us, 50)),
+                'p99_us': float(np.percentile(times_us, 99)),
+                'max_us': float(times_us.max()),
+            }
+        return result
+
+
+def cell_position(row, col):
+    """Posición de pantalla del centro de una celda"""
+    return (BOARD_OFFSET_X + col * CELL_SIZE + CELL_SIZE // 2,
+            BOARD_OFFSET_Y + row * CELL_SIZE + CELL_SIZE // 2)
+
+
+def click(gui, pos):
+    """Envía un clic por la cola de eventos y procesa fotogramas hasta que la
+    IA haya respondido"""
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    gui.step(pygame.event.get())
+    while gui.state.ia_thinking:
+        gui.step([pygame.event.wait(WAIT_MS)] + pygame.event.get())
+
+
+def wait_ready(gui):
+    """Procesa fotogramas hasta que el hilo de carga entrega el agente (o el
+    error de carga, que termina el programa)"""
+    while gui.state is None:
+        if gui.load_error:
+            raise SystemExit(gui.load_error)
+        gui.step([pygame.event.wait(WAIT_MS)] + pygame.event.get())
+
+
+def scripted_clicks(gui, rng):
+    """Clics de una partida guionizada: una celda libre al azar en cada turno"""
+    while not gui.state.game_over:
+        free = [(row, col) for row in range(3) for col in range(3)
+                if gui.state.board[row][col] == ' ']
+        yield cell_position(*rng.choice(free))
+
+
+def replay(gui, timer, num_games=200, seed=0, clicks=None):
+    """Reproduce partidas en `gui` (cronometrada por `timer`) y devuelve los
+    fotogramas de cada una. Con `clicks` (lista de posiciones) reproduce esa
+    sesión grabada; si no, juega `num_games` partidas guionizadas."""
+    gui.ai_delay_ms = 0
+    frames_per_game = []
+    gui.render()
+    wait_ready(gui)
+    start = timer.frames
+
+    if clicks is not None:
+        for pos in clicks:
+            was_over = gui.state.game_over
+            click(gui, tuple(pos))
+            if gui.state.game_over and not was_over:
+                frames_per_game.append(timer.frames - start)
+                start = timer.frames
+        return frames_per_game
+
+    rng = random.Random(seed)
+    for _ in range(num_games):
+        for pos in scripted_clicks(gui, rng):
+            click(gui, pos)
+        frames_per_game.append(timer.frames - start)
+        click(gui, gui.new_game_button.center)
+        start = timer.frames
+    return frames_per_game
+
+
+def run_headless(table_file=None, num_games=200, seed=0, clicks=None):
+    """Crea la interfaz sin pantalla, reproduce las partidas y devuelve el informe"""
+    gui = GameGUI(table_file)
+    timer = FrameTimer(gui)
+    random.seed(seed)
+    frames_per_game = replay(gui, timer, num_games, seed, clicks)
+    report = {
+        'games': len(frames_per_game),
+        'frames': timer.frames,
+        'frames_per_game': float(np.mean(frames_per_game)) if frames_per_game else 0.0,
+        'draw': timer.summary(),
+        'startup_ms': {name: seconds * 1000 for name, seconds in gui.startup_times.items()},
+    }
+    pygame.quit()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la interfaz sin pantalla")
+    parser.add_argument('--tabla', default=None, help="tabla Q (.pkl, .npz o .qtb)")
+    parser.add_argument('--partidas', type=int, default=200)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--clics', help="JSON de clics grabado con interfaz.py --grabar")
+    parser.add_argument('--output', help="guardar el informe en JSON")
+    args = parser.parse_args()
+
+    clicks = None
+    if args.clics:
+        with open(args.clics, encoding='utf-8') as f:
+            clicks = json.load(f)
+    report = run_headless(args.tabla, args.partidas, args.semilla, clicks)
+
+    print(f"Partidas: {report['games']} | fotogramas: {report['frames']} "
+          f"({report['frames_per_game']:.1f} por partida)")
+    for name, stats in report['draw'].items():
+        print(f"  {name:18s} media {stats['mean_us']:8.1f} µs | p50 {stats['p50_us']:8.1f} µs | "
+              f"p99 {stats['p99_us']:8.1f} µs | máx {stats['max_us']:8.1f} µs")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
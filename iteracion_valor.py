@@ -0,0 +1,220 @@
+"""
+Entrenamiento exacto por iteración de valor.
+Contra un oponente fijo el tres en raya es un MDP pequeño: se enumeran todas
+las posiciones alcanzables en las que mueve O, se construye el modelo de
+transiciones (jugada de O, respuesta del oponente con sus probabilidades) y se
+resuelve Q con iteración de valor síncrona vectorizada en NumPy. El modelo se
+recorre por los ids de sucesor del grafo de estados (grafo_estados).
+La transición es la de turno a turno de entrenamiento.QLambdaAgent: las
+partidas que gana o empata el oponente también puntúan (-1 / 0.5).
+El resultado se guarda en los formatos de tabla Q (.pkl, .npz o .qtb).
+Uso: python iteracion_valor.py [salida.pkl|.npz|.qtb]
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from entrenamiento import (QLearningAgent, center_first_opponent, get_opponent_move,
+                           random_opponent)
+from grafo_estados import get_graph
+from minimax import PLAYERS, get_solution, perfect_opponent
+from tablero_bits import BOARD_VIEWS, FREE_MOVES, index_masks
+
+# Recompensas de TicTacToeGame.step desde el punto de vista de O
+REWARDS = {'O': 1.0, 'X': -1.0, 'Tie': 0.5}
+CORNERS = (0, 2, 6, 8)
+CENTER = 4
+
+
+def _free_cells(index):
+    x_mask, o_mask = index_masks(index)
+    return [3 * row + col for row, col in FREE_MOVES[x_mask | o_mask]]
+
+
+def _heuristic_distribution(index):
+    """get_opponent_move: centro, primera esquina libre o aleatoria uniforme"""
+    free = _free_cells(index)
+    if CENTER in free:
+        return {CENTER: 1.0}
+    for corner in CORNERS:
+        if corner in free:
+            return {corner: 1.0}
+    return {cell: 1.0 / len(free) for cell in free}
+
+
+def _uniform_distribution(index):
+    free = _free_cells(index)
+    return {cell: 1.0 / len(free) for cell in free}
+
+
+def _center_first_distribution(index):
+    free = _free_cells(index)
+    if CENTER in free:
+        return {CENTER: 1.0}
+    return {cell: 1.0 / len(free) for cell in free}
+
+
+def _perfect_distribution(index):
+    """minimax.perfect_opponent: uniforme entre las jugadas óptimas de X"""
+    optimal = int(get_solution().optimal[index, PLAYERS['X']])
+    cells = [cell for cell in _free_cells(index) if optimal >> cell & 1]
+    return {cell: 1.0 / len(cells) for cell in cells}
+
+
+# Distribuciones exactas de los oponentes de entrenamiento y prueba
+EXACT_DISTRIBUTIONS = {
+    get_opponent_move: _heuristic_distribution,
+    random_opponent: _uniform_distribution,
+    center_first_opponent: _center_first_distribution,
+    perfect_opponent: _perfect_distribution,
+}
+
+
+def opponent_distribution(opponent_func, index, samples=256):
+    """{casilla: probabilidad} del movimiento de `opponent_func` (juega X).
+    Para oponentes sin distribución conocida se estima muestreando.
+    """
+    if opponent_func in EXACT_DISTRIBUTIONS:
+        return EXACT_DISTRIBUTIONS[opponent_func](index)
+    saved_state = random.getstate()
+    random.seed(index)
+    try:
+        counts = Counter()
+        for _ in range(samples):
+            move = opponent_func([list(row) for row in BOARD_VIEWS[index]])
+            counts[3 * move[0] + move[1]] += 1
+            # Un oponente determinista no necesita más muestras
+            if len(counts) == 1 and counts[3 * move[0] + move[1]] >= 8:
+                break
+    finally:
+        random.setstate(saved_state)
+    total = sum(counts.values())
+    return {cell: count / total for cell, count in counts.items()}
+
+
+class TransitionModel:
+    """Modelo del MDP con O moviendo.
+
+    states: índices base 3 de los estados (O mueve)
+    pairs_state, pairs_action: cada par (estado, acción) legal
+    immediate, terminal: recompensa y fin de partida tras la jugada de O
+    trans_pair, trans_next, trans_prob, trans_reward: respuestas del oponente
+    (trans_next = -1 si la respuesta termina la partida)
+    """
+
+    def __init__(self, opponent_func=get_opponent_move, first='both'):
+        graph = get_graph()
+        starts = []
+        if first in ('O', 'both'):
+            starts.append((0, 1.0))
+        if first in ('X', 'both'):
+            starts.extend(self._opponent_replies(graph, opponent_func, 0))
+        if not starts:
+            raise ValueError(f"Primer jugador desconocido: {first}")
+
+        # Filas del modelo por id del grafo (el id 0 es el tablero vacío)
+        row_of = {}
+        states = []
+        pairs_state, pairs_action, immediate, terminal = [], [], [], []
+        trans_pair, trans_next, trans_prob, trans_reward = [], [], [], []
+        pending_next = []
+
+        queue = [state_id for state_id, _ in starts]
+        for state_id in queue:
+            if state_id in row_of:
+                continue
+            row_of[state_id] = len(states)
+            states.append(graph.state_index(state_id))
+            for cell in graph.legal_cells(state_id):
+                pair = len(pairs_state)
+                pairs_state.append(row_of[state_id])
+                pairs_action.append(cell)
+                after = graph.successor(state_id, 'O', cell)
+                result = graph.result(after)
+                immediate.append(REWARDS.get(result, 0.0))
+                terminal.append(result is not None)
+                if result is not None:
+                    continue
+                for reply, probability in self._opponent_replies(graph, opponent_func, after):
+                    reply_result = graph.result(reply)
+                    trans_pair.append(pair)
+                    trans_prob.append(probability)
+                    trans_reward.append(REWARDS.get(reply_result, 0.0))
+                    pending_next.append(reply if reply_result is None else -1)
+                    if reply_result is None:
+                        queue.append(reply)
+
+        trans_next = [row_of[state_id] if state_id >= 0 else -1 for state_id in pending_next]
+        self.states = np.array(states, dtype=np.int64)
+        self.pairs_state = np.array(pairs_state, dtype=np.int64)
+        self.pairs_action = np.array(pairs_action, dtype=np.int64)
+        self.immediate = np.array(immediate)
+        self.terminal = np.array(terminal, dtype=bool)
+        self.trans_pair = np.array(trans_pair, dtype=np.int64)
+        self.trans_next = np.array(trans_next, dtype=np.int64)
+        self.trans_prob = np.array(trans_prob)
+        self.trans_reward = np.array(trans_reward)
+
+    @staticmethod
+    def _opponent_replies(graph, opponent_func, state_id):
+        """[(id del estado tras la respuesta de X, probabilidad)]"""
+        distribution = opponent_distribution(opponent_func, graph.state_index(state_id))
+        return [(graph.successor(state_id, 'X', cell), probability)
+                for cell, probability in distribution.items()]
+
+
+def value_iteration(model, gamma=0.9, tol=1e-9, max_iterations=100):
+    """Q(par) del modelo por iteración de valor síncrona"""
+    q = np.zeros(len(model.pairs_state))
+    continues = model.trans_next >= 0
+    next_rows = np.where(continues, model.trans_next, 0)
+    for iteration in range(1, max_iterations + 1):
+        # V(s) = max_a Q(s, a)
+        v = np.full(len(model.states), -np.inf)
+        np.maximum.at(v, model.pairs_state, q)
+        expected = model.trans_prob * (model.trans_reward + gamma * np.where(continues, v[next_rows], 0.0))
+        new_q = np.where(model.terminal, model.immediate,
+                         np.bincount(model.trans_pair, weights=expected,
+                                     minlength=len(q)))
+        delta = np.abs(new_q - q).max() if len(q) else 0.0
+        q = new_q
+        if delta < tol:
+            break
+    return q, iteration
+
+
+def train_value_iteration(opponent_func=get_opponent_move, gamma=0.9, first='both',
+                          save_path='q_table_exacta.pkl', verbose=True):
+    """Tabla Q exacta contra `opponent_func`.
+    first: quién empieza en las partidas a cubrir ('O' como en el
+    entrenamiento, 'X' como en la interfaz, o 'both')
+    """
+    start_time = time.perf_counter()
+    model = TransitionModel(opponent_func, first)
+    q, iterations = value_iteration(model, gamma)
+    elapsed = time.perf_counter() - start_time
+
+    agent = QLearningAgent(gamma=gamma, backend='dense')
+    table = agent.q_table
+    states = model.states[model.pairs_state]
+    table.values[states, model.pairs_action] = q
+    table.known[states, model.pairs_action] = True
+
+    if save_path:
+        agent.save_q_table(save_path)
+
+    if verbose:
+        print(f"Estados: {len(model.states)} | pares (estado, acción): {len(q)} | "
+              f"transiciones: {len(model.trans_pair)}")
+        print(f"Iteraciones: {iterations} | tiempo: {elapsed * 1000:.0f} ms")
+
+    return agent
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else 'q_table_exacta.pkl'
+    train_value_iteration(save_path=output)
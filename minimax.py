@@ -0,0 +1,186 @@
+"""
+Solucionador exacto del tres en raya: negamax con tabla de transposición.
+Calcula una sola vez el valor teórico (+1 gana, 0 empata, -1 pierde, desde el
+punto de vista del jugador que mueve) de cada posición alcanzable, empiece
+quien empiece, y lo guarda en disco.
+Ofrece un oponente perfecto para test_agent_comprehensively y la métrica de
+"acuerdo con la jugada óptima" de cualquier tabla Q.
+Uso: python minimax.py [tabla_q.pkl]
+"""
+
+import os
+import random
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+from tablero_bits import (CELL_BITS, FULL_MASK, NUM_CELLS, NUM_STATES, POW3,
+                          WINNING_MASKS, board_index, key_index)
+
+# Junto al módulo, no en el directorio de trabajo de quien lo importe
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'minimax_solucion.npz')
+
+# Jugador que mueve: índice de columna en los arrays de la solución
+PLAYERS = {'X': 0, 'O': 1}
+UNKNOWN = -2
+
+MOVES = tuple((k // 3, k % 3) for k in range(NUM_CELLS))
+
+
+class MinimaxSolution:
+    """Valores y jugadas óptimas por (estado base 3, jugador que mueve).
+
+    values[estado, jugador]: +1/0/-1, o UNKNOWN si la posición no es alcanzable
+    optimal[estado, jugador]: máscara de 9 bits con las jugadas óptimas
+    """
+
+    def __init__(self, values, optimal):
+        self.values = values
+        self.optimal = optimal
+
+    @classmethod
+    def solve(cls):
+        """Negamax memoizado desde el tablero vacío para ambos jugadores"""
+        values = [UNKNOWN] * (2 * NUM_STATES)
+        optimal = [0] * (2 * NUM_STATES)
+
+        def negamax(x_mask, o_mask, index, player):
+            key = 2 * index + player
+            if values[key] != UNKNOWN:
+                return values[key]
+            occupied = x_mask | o_mask
+            if WINNING_MASKS[x_mask] or WINNING_MASKS[o_mask]:
+                # Ganó quien acaba de mover
+                value = -1
+            elif occupied == FULL_MASK:
+                value = 0
+            else:
+                value = -2
+                best_moves = 0
+                for cell in range(NUM_CELLS):
+                    bit = CELL_BITS[cell]
+                    if occupied & bit:
+                        continue
+                    if player == 0:
+                        child = -negamax(x_mask | bit, o_mask, index + POW3[cell], 1)
+                    else:
+                        child = -negamax(x_mask, o_mask | bit, index + 2 * POW3[cell], 0)
+                    if child > value:
+                        value = child
+                        best_moves = bit
+                    elif child == value:
+                        best_moves |= bit
+                optimal[key] = best_moves
+            values[key] = value
+            return value
+
+        negamax(0, 0, 0, PLAYERS['X'])
+        negamax(0, 0, 0, PLAYERS['O'])
+        return cls(np.array(values, dtype=np.int8).reshape(NUM_STATES, 2),
+                   np.array(optimal, dtype=np.uint16).reshape(NUM_STATES, 2))
+
+    def save(self, filename=DEFAULT_CACHE):
+        np.savez_compressed(filename, values=self.values, optimal=self.optimal)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_CACHE):
+        with np.load(filename) as data:
+            values = data['values']
+            optimal = data['optimal']
+        if values.shape != (NUM_STATES, 2) or optimal.shape != (NUM_STATES, 2):
+            raise ValueError(f"{filename}: solución con forma inesperada")
+        return cls(values, optimal)
+
+    def value(self, board, player):
+        """Valor de la posición para `player` ('X' u 'O') si le toca mover"""
+        value = int(self.values[board_index(board), PLAYERS[player]])
+        return None if value == UNKNOWN else value
+
+    def optimal_moves(self, board, player):
+        """Lista de jugadas (fila, columna) óptimas para `player`"""
+        mask = int(self.optimal[board_index(board), PLAYERS[player]])
+        return [MOVES[k] for k in range(NUM_CELLS) if mask >> k & 1]
+
+
+_solution = None
+
+
+def get_solution(cache_file=DEFAULT_CACHE):
+    """Solución compartida: se carga de la caché en disco o se calcula una vez"""
+    global _solution
+    if _solution is None:
+        try:
+            _solution = MinimaxSolution.load(cache_file)
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            _solution = MinimaxSolution.solve()
+            try:
+                _solution.save(cache_file)
+            except OSError:
+                pass
+    return _solution
+
+
+def perfect_move(board, player='O'):
+    """Jugada perfecta para `player` (aleatoria entre las óptimas)"""
+    moves = get_solution().optimal_moves(board, player)
+    return random.choice(moves) if moves else None
+
+
+def perfect_opponent(board):
+    """Oponente perfecto (juega como 'X')"""
+    return perfect_move(board, 'X')
+
+
+PERFECT_OPPONENT = ("Perfecto", perfect_opponent)
+
+
+def optimal_move_agreement(q_table, player='O'):
+    """Acuerdo de la política greedy de una tabla Q con el juego perfecto.
+
+    Para cada estado de la tabla en el que `player` puede mover se compara la
+    acción de mayor valor Q (la que elegiría get_best_move) con las jugadas
+    óptimas. Devuelve {'states', 'agree', 'rate', 'per_state'}.
+    """
+    solution = get_solution()
+    column = PLAYERS[player]
+    per_state = {}
+    for state, actions in q_table.items():
+        index = key_index(state)
+        optimal = int(solution.optimal[index, column])
+        if solution.values[index, column] == UNKNOWN or not optimal:
+            continue
+        best_cell = None
+        best_value = -float('inf')
+        for action_key, value in actions.items():
+            row, col = map(int, action_key.split(','))
+            if state[3 * row + col] == ' ' and value > best_value:
+                best_value = value
+                best_cell = 3 * row + col
+        if best_cell is not None:
+            per_state[state] = bool(optimal >> best_cell & 1)
+
+    agree = sum(per_state.values())
+    return {
+        'states': len(per_state),
+        'agree': agree,
+        'rate': agree / len(per_state) if per_state else 0.0,
+        'per_state': per_state,
+    }
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    solution = MinimaxSolution.solve()
+    elapsed = time.perf_counter() - start
+    solution.save(DEFAULT_CACHE)
+    reachable = int((solution.values != UNKNOWN).sum())
+    print(f"Posiciones resueltas: {reachable} en {elapsed * 1000:.0f} ms -> {DEFAULT_CACHE}")
+    print(f"Valor del tablero vacío: {int(solution.values[0, 0])}")
+
+    if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+        from tabla_q import load_table
+        agreement = optimal_move_agreement(load_table(sys.argv[1]))
+        print(f"Acuerdo con la jugada óptima ({sys.argv[1]}): "
+              f"{agreement['agree']}/{agreement['states']} ({agreement['rate']*100:.1f}%)")
@@ -0,0 +1,118 @@
+"""
+Instrumentación opcional del bucle de entrenamiento.
+TrainingProfiler acumula temporizadores por fase (selección de acción, paso
+del entorno, actualización Q, movimiento del oponente, repaso de experiencia e
+informe de progreso) y contadores, los agrega por ventanas de episodios y los
+vuelca como serie temporal JSONL y como resumen final.
+Con profiler=None el bucle solo paga una comprobación booleana por fase.
+"""
+
+import json
+import time
+
+PHASES = ('action_selection', 'env_step', 'q_update', 'opponent_move', 'replay', 'progress')
+
+PHASE_NAMES = {
+    'action_selection': "Selección de acción",
+    'env_step': "Paso del entorno",
+    'q_update': "Actualización Q",
+    'opponent_move': "Movimiento oponente",
+    'replay': "Repaso de experiencia",
+    'progress': "Informe de progreso",
+}
+
+
+class TrainingProfiler:
+    """Temporizadores (ns) y contadores por fase, agregados por ventanas"""
+
+    clock = staticmethod(time.perf_counter_ns)
+
+    def __init__(self, window=1000, jsonl_path=None):
+        self.window = window
+        self.jsonl_path = jsonl_path
+        self.totals = dict.fromkeys(PHASES, 0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counters = {}
+        self.series = []
+        self._window_times = dict.fromkeys(PHASES, 0)
+        self._window_counters = {}
+        self._window_start = self.clock()
+        self._start = self._window_start
+        self._end = None
+        self._episodes = 0
+        self._file = open(jsonl_path, 'w', encoding='utf-8') if jsonl_path else None
+
+    def begin(self):
+        """Marca el inicio del entrenamiento (origen del tiempo total)"""
+        self._start = self._window_start = self.clock()
+
+    def add(self, phase, elapsed_ns):
+        """Suma `elapsed_ns` a la fase"""
+        self._window_times[phase] += elapsed_ns
+        self.calls[phase] += 1
+
+    def count(self, name, amount=1):
+        """Incrementa un contador"""
+        self._window_counters[name] = self._window_counters.get(name, 0) + amount
+
+    def end_episode(self, episode):
+        """Cierra el episodio `episode` (base 0) y la ventana si corresponde"""
+        self._episodes += 1
+        if (episode + 1) % self.window == 0:
+            self._flush(episode + 1)
+
+    def _flush(self, episode_end):
+        now = self.clock()
+        record = {
+            'episode_end': episode_end,
+            'episodes': self._episodes,
+            'wall_ns': now - self._window_start,
+            'phases_ns': dict(self._window_times),
+            'counters': dict(self._window_counters),
+        }
+        self.series.append(record)
+        if self._file:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+        for phase, elapsed in self._window_times.items():
+            self.totals[phase] += elapsed
+        for name, amount in self._window_counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+        self._window_times = dict.fromkeys(PHASES, 0)
+        self._window_counters = {}
+        self._window_start = now
+        self._episodes = 0
+
+    def close(self, episode_end=None):
+        """Vuelca la ventana pendiente y cierra el archivo JSONL"""
+        if self._episodes:
+            self._flush(episode_end if episode_end is not None else -1)
+        self._end = self.clock()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def summary(self):
+        """Resumen de tiempos por fase y contadores"""
+        end = self._end if self._end is not None else self.clock()
+        wall = max(end - self._start, 1)
+        episodes = sum(record['episodes'] for record in self.series) or 1
+        lines = [f"{'Fase':24s} {'Total (ms)':>11s} {'%':>6s} {'µs/episodio':>12s} {'ns/llamada':>11s}"]
+        for phase in PHASES:
+            total = self.totals[phase]
+            calls = self.calls[phase] or 1
+            lines.append(f"{PHASE_NAMES[phase]:24s} {total / 1e6:11.1f} {total / wall * 100:5.1f}% "
+                         f"{total / episodes / 1000:12.2f} {total / calls:11.0f}")
+        measured = sum(self.totals.values())
+        lines.append(f"{'Sin medir (bucle)':24s} {(wall - measured) / 1e6:11.1f} "
+                     f"{(wall - measured) / wall * 100:5.1f}%")
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"{name:24s} {amount:11,d}")
+        return "\n".join(lines)
+
+    def print_summary(self):
+        print(f"\n{'='*60}")
+        print("PERFIL DEL ENTRENAMIENTO")
+        print(f"{'='*60}")
+        print(self.summary())
@@ -0,0 +1,101 @@
+"""
+Política compilada: el mejor movimiento de cada estado alcanzable precalculado
+en un array plano de bytes indexado por el estado en base 3.
+Los estados que no están en la tabla Q llevan ya resuelto el movimiento de
+respaldo (get_fallback_move), así que en ejecución un movimiento es una
+única lectura del array.
+Uso: python politica_compilada.py q_table_20000.pkl q_table_20000.pol
+"""
+
+import random
+import struct
+import sys
+
+from tablero_bits import BOARD_VIEWS, NUM_STATES, board_index, index_masks, masks_winner
+
+MAGIC = b'QPOL'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+NO_MOVE = 255
+
+# MOVES[casilla] -> (fila, columna)
+MOVES = tuple((k // 3, k % 3) for k in range(9))
+
+
+def is_playable(index):
+    """Estado alcanzable con movimientos pendientes (empiece quien empiece)"""
+    x_mask, o_mask = index_masks(index)
+    x_count = bin(x_mask).count('1')
+    o_count = bin(o_mask).count('1')
+    return x_count - o_count in (0, 1) and masks_winner(x_mask, o_mask) is None
+
+
+class CompiledPolicy:
+    """Movimiento precalculado por estado: moves[estado] = casilla o NO_MOVE"""
+
+    def __init__(self, moves):
+        if len(moves) != NUM_STATES:
+            raise ValueError(f"La política debe tener {NUM_STATES} entradas")
+        self.moves = bytes(moves)
+
+    @classmethod
+    def compile(cls, agent, seed=0):
+        """Compila la política de `agent.get_best_move` para cada estado.
+        La semilla fija las elecciones aleatorias del respaldo (esquinas).
+        """
+        saved_state = random.getstate()
+        random.seed(seed)
+        moves = bytearray([NO_MOVE]) * NUM_STATES
+        try:
+            for index in range(NUM_STATES):
+                if not is_playable(index):
+                    continue
+                board = [list(row) for row in BOARD_VIEWS[index]]
+                move = agent.get_best_move(board)
+                if move is not None:
+                    moves[index] = 3 * move[0] + move[1]
+        finally:
+            random.setstate(saved_state)
+        return cls(moves)
+
+    def move_index(self, index):
+        """Casilla (0-8) del estado en base 3, o None"""
+        move = self.moves[index]
+        return None if move == NO_MOVE else move
+
+    def best_move(self, board):
+        """(fila, columna) para el tablero, o None si no hay movimiento"""
+        move = self.moves[board_index(board)]
+        return None if move == NO_MOVE else MOVES[move]
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0))
+            f.write(self.moves)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER.size)
+            moves = f.read()
+        if len(header) < HEADER.size:
+            raise ValueError(f"{filename}: archivo demasiado corto")
+        magic, version, _ = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename}: no es una política compilada válida")
+        return cls(moves)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python politica_compilada.py tabla_q.pkl salida.pol")
+        sys.exit(1)
+    from qlearning_agente import QLearningAgent
+    agent = QLearningAgent()
+    if not agent.load_q_table(sys.argv[1]):
+        print(agent.load_error)
+        sys.exit(1)
+    policy = CompiledPolicy.compile(agent)
+    policy.save(sys.argv[2])
+    playable = sum(move != NO_MOVE for move in policy.moves)
+    print(f"Política compilada en {sys.argv[2]} ({playable} estados con movimiento)")
@@ -4,13 +4,54 @@ Contiene:
 - QLearningAgent: Clase que maneja la tabla Q cargada del entrenamiento
 - GameState: Clase que controla el estado del juego durante partidas
 
+Importar el módulo y jugar con una tabla .pkl solo necesita tablero_bits y
+tabla_q: NumPy (consultas por lotes), simetria y politica_compilada se
+importan la primera vez que se usan, para que la interfaz arranque rápido.
 """
 
-import pickle
+import os
 import random
 
+from tabla_q import LOAD_ERRORS, load_table
+from tablero_bits import (CELL_BITS, FREE_MOVES, NUM_CELLS, NUM_STATES, POW3, WINNING_MASKS,
+                          board_index, index_masks, key_index, masks_winner)
+
+# Tablas para get_best_moves (consultas por lotes), creadas en la primera consulta
+_batch_tables = None
+_CORNERS = (0, 2, 6, 8)
+_CENTER = 4
+
+
+def get_batch_tables():
+    """Arrays NumPy de get_best_moves (se importan NumPy y simetria al pedirlos)"""
+    global _batch_tables
+    if _batch_tables is None:
+        import numpy as np
+        from simetria import CANONICAL_INDEX, CANONICAL_TRANSFORM, TRANSFORMS
+        from tabla_q import legal_actions
+        _batch_tables = {
+            'cell_pow3': np.array(POW3, dtype=np.int64),
+            'cell_bits': np.array(CELL_BITS, dtype=np.int64),
+            'wins': np.array(WINNING_MASKS, dtype=bool),
+            'canonical_index': np.array(CANONICAL_INDEX, dtype=np.int64),
+            'canonical_transform': np.array(CANONICAL_TRANSFORM, dtype=np.int64),
+            'from_canonical': np.array(TRANSFORMS, dtype=np.int64),
+            'corners': np.array(_CORNERS),
+            'legal': legal_actions(),
+        }
+    return _batch_tables
+
+
+# Archivos de tabla Q por orden de preferencia: el binario .qtb se mapea en
+# memoria y carga al instante; el pickle es el formato original
+DEFAULT_TABLE_FILES = ('q_table_20000.qtb', 'q_table_20000.pkl')
+
 class QLearningAgent:
-    def __init__(self):
+    def __init__(self, backend=None, symmetric=False, seed=None):
+        # None: backend natural del archivo (dict, dense o mmap)
+        self.backend = backend
+        # True si la tabla se entrenó con estados canónicos (simetrías)
+        self.symmetric = symmetric
         self.q_table = {}
         self.stats = {
             'total_games': 0,
@@ -19,15 +60,55 @@ class QLearningAgent:
             'ties': 0,
             'states_learned': 0
         }
+        self.load_error = None
+        # Política compilada opcional: si existe, get_best_move es una lectura de array
+        self.policy = None
+        # Arrays (valores, conocidas, orden) de la tabla para get_best_moves
+        self._batch_arrays = None
+        # Generador del respaldo de get_best_moves (uno por agente; `seed` lo
+        # hace reproducible), creado en la primera consulta por lotes
+        self.seed = seed
+        self._rng = None
         
-    def load_q_table(self, filename='q_table_20000.pkl'):
-        """Carga la tabla Q entrenada"""
+    def load_q_table(self, filename=None):
+        """Carga la tabla Q entrenada (.pkl, .npz o .qtb)"""
+        if filename is None:
+            existing = [f for f in DEFAULT_TABLE_FILES if os.path.exists(f)]
+            filename = existing[0] if existing else DEFAULT_TABLE_FILES[-1]
         try:
-            with open(filename, 'rb') as f:
-                self.q_table = pickle.load(f)
+            self.q_table = load_table(filename, backend=self.backend)
             self.stats['states_learned'] = len(self.q_table)
+            self.load_error = None
+            self.policy = None
+            self._batch_arrays = None
             return True
-        except:
+        except LOAD_ERRORS as error:
+            self.load_error = f"No se pudo cargar {filename}: {error}"
+            return False
+    
+    @property
+    def rng(self):
+        """numpy.random.Generator del respaldo de get_best_moves"""
+        if self._rng is None:
+            import numpy as np
+            self._rng = np.random.default_rng(self.seed)
+        return self._rng
+    
+    def compile_policy(self, seed=0):
+        """Precalcula el mejor movimiento de cada estado (incluido el respaldo)"""
+        from politica_compilada import CompiledPolicy
+        self.policy = None
+        self.policy = CompiledPolicy.compile(self, seed=seed)
+        return self.policy
+    
+    def load_policy(self, filename):
+        """Carga una política compilada guardada con CompiledPolicy.save"""
+        from politica_compilada import CompiledPolicy
+        try:
+            self.policy = CompiledPolicy.load(filename)
+            return True
+        except (OSError, ValueError) as error:
+            self.load_error = f"No se pudo cargar {filename}: {error}"
             return False
     
     def get_state_key(self, board):
@@ -36,7 +117,16 @@ class QLearningAgent:
     
     def get_best_move(self, board):
         """Obtiene el mejor movimiento según la tabla Q"""
-        state = self.get_state_key(board)
+        if self.policy is not None:
+            return self.policy.best_move(board)
+        
+        transform = None
+        if self.symmetric:
+            from simetria import canonicalize, from_canonical_action
+            canonical_board, transform = canonicalize(board)
+            state = self.get_state_key(canonical_board)
+        else:
+            state = self.get_state_key(board)
         
         if state not in self.q_table or not self.q_table[state]:
             return self.get_fallback_move(board)
@@ -50,6 +140,8 @@ class QLearningAgent:
                 best_value = value
                 try:
                     row, col = map(int, action_key.split(','))
+                    if transform is not None:
+                        row, col = from_canonical_action((row, col), transform)
                     if 0 <= row < 3 and 0 <= col < 3 and board[row][col] == ' ':
                         best_action = (row, col)
                 except:
@@ -60,6 +152,103 @@ class QLearningAgent:
         
         return best_action
     
+    def _table_arrays(self):
+        """Tabla Q como arrays [3**9, 9]: valor, entrada conocida y orden de
+        inserción (get_best_move desempata por el orden del dict)"""
+        if self._batch_arrays is None:
+            import numpy as np
+            values = np.zeros((NUM_STATES, NUM_CELLS))
+            known = np.zeros((NUM_STATES, NUM_CELLS), dtype=bool)
+            order = np.zeros((NUM_STATES, NUM_CELLS), dtype=np.int64)
+            for state, actions in self.q_table.items():
+                index = key_index(state)
+                for position, (action_key, value) in enumerate(actions.items()):
+                    cell = 3 * int(action_key[0]) + int(action_key[2])
+                    values[index, cell] = value
+                    known[index, cell] = True
+                    order[index, cell] = position
+            self._batch_arrays = (values, known, order)
+        return self._batch_arrays
+    
+    def get_best_moves(self, boards, rng=None):
+        """Mejores movimientos de muchos tableros en una pasada vectorizada.
+        boards: array de índices base 3, o lista de tableros 3x3 / claves de
+        9 caracteres.
+        Con un array devuelve un array de casillas (fila*3+col, -1 sin
+        movimiento); con una lista, una lista de (fila, col) o None.
+        Los estados desconocidos usan el respaldo vectorizado (misma regla y
+        distribución que get_fallback_move, con el generador `rng` o, sin él,
+        el del agente).
+        """
+        import numpy as np
+        tables = get_batch_tables()
+        as_array = isinstance(boards, np.ndarray)
+        if as_array:
+            indices = boards.astype(np.int64).reshape(-1)
+        else:
+            indices = np.array([key_index(board) if isinstance(board, str) else board_index(board)
+                                for board in boards], dtype=np.int64)
+        
+        if self.policy is not None:
+            from politica_compilada import NO_MOVE
+            cells = np.frombuffer(self.policy.moves, dtype=np.uint8)[indices].astype(np.int64)
+            cells[cells == NO_MOVE] = -1
+        else:
+            if self.symmetric:
+                states = tables['canonical_index'][indices]
+                transforms = tables['canonical_transform'][indices]
+            else:
+                states = indices
+            values, known, order = self._table_arrays()
+            
+            # Argmax enmascarado: primera acción (orden del dict) con el mayor valor
+            candidates = known[states] & tables['legal'][states]
+            masked = np.where(candidates, values[states], -np.inf)
+            best = masked.max(axis=1)
+            ties = candidates & (masked == best[:, None])
+            cells = np.where(ties, order[states], NUM_CELLS).argmin(axis=1)
+            found = candidates.any(axis=1)
+            if self.symmetric:
+                cells = tables['from_canonical'][transforms, cells]
+            
+            unknown = ~found
+            if unknown.any():
+                cells[unknown] = self._fallback_moves(indices[unknown], rng)
+        
+        if as_array:
+            return cells
+        return [(int(cell) // 3, int(cell) % 3) if cell >= 0 else None for cell in cells]
+    
+    def _fallback_moves(self, indices, rng=None):
+        """get_fallback_move vectorizado: ganar, bloquear, centro, esquina o
+        casilla libre al azar (-1 si el tablero está lleno)"""
+        import numpy as np
+        if rng is None:
+            rng = self.rng
+        tables = get_batch_tables()
+        cell_bits = tables['cell_bits']
+        wins = tables['wins']
+        corner_cells = tables['corners']
+        digits = (indices[:, None] // tables['cell_pow3']) % 3
+        x_masks = ((digits == 1) * cell_bits).sum(axis=1)
+        o_masks = ((digits == 2) * cell_bits).sum(axis=1)
+        free = digits == 0
+        win = free & wins[o_masks[:, None] | cell_bits]
+        block = free & wins[x_masks[:, None] | cell_bits]
+        
+        # Esquina o casilla libre al azar: argmax de ruido sobre las libres
+        noise = rng.random(free.shape)
+        corners = np.where(free[:, corner_cells], noise[:, corner_cells], -1.0)
+        any_free = np.where(free, noise, -1.0)
+        
+        cells = np.where(free.any(axis=1), any_free.argmax(axis=1), -1)
+        has_corner = free[:, corner_cells].any(axis=1)
+        cells = np.where(has_corner, corner_cells[corners.argmax(axis=1)], cells)
+        cells = np.where(free[:, _CENTER], _CENTER, cells)
+        cells = np.where(block.any(axis=1), block.argmax(axis=1), cells)
+        cells = np.where(win.any(axis=1), win.argmax(axis=1), cells)
+        return cells
+    
     def get_fallback_move(self, board):
         """Movimiento de respaldo si no hay datos en Q-table"""
         # Intentar ganar
@@ -94,37 +283,14 @@ class QLearningAgent:
                 return corner
         
         # Cualquier movimiento
-        available = []
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == ' ':
-                    available.append((i, j))
+        x_mask, o_mask = index_masks(board_index(board))
+        available = FREE_MOVES[x_mask | o_mask]
         
         return random.choice(available) if available else None
     
     def check_winner(self, board):
-        """Verifica si hay ganador"""
-        # Filas
-        for i in range(3):
-            if board[i][0] != ' ' and board[i][0] == board[i][1] == board[i][2]:
-                return board[i][0]
-        
-        # Columnas
-        for j in range(3):
-            if board[0][j] != ' ' and board[0][j] == board[1][j] == board[2][j]:
-                return board[0][j]
-        
-        # Diagonales
-        if board[0][0] != ' ' and board[0][0] == board[1][1] == board[2][2]:
-            return board[0][0]
-        if board[0][2] != ' ' and board[0][2] == board[1][1] == board[2][0]:
-            return board[0][2]
-        
-        # Empate
-        if all(board[i][j] != ' ' for i in range(3) for j in range(3)):
-            return 'Tie'
-        
-        return None
+        """Verifica si hay ganador (máscaras de tablero_bits, sin cargar el grafo)"""
+        return masks_winner(*index_masks(board_index(board)))
     
     def update_stats(self, result):
         """Actualiza estadísticas del juego"""
@@ -0,0 +1,229 @@
+"""
+Servidor de movimientos asyncio para el agente entrenado (sin interfaz).
+Protocolo: JSON delimitado por saltos de línea sobre TCP o socket Unix. Cada
+línea es una petición y recibe exactamente una respuesta, en el mismo orden,
+así que un cliente puede encadenar peticiones sin esperar (pipelining).
+
+Peticiones (el campo "id" opcional se devuelve tal cual):
+  {"op": "best_move", "board": "X   O    "}      -> {"move": [fila, col]}
+  {"op": "best_moves", "boards": [...]}          -> {"moves": [[fila, col], ...]}
+  {"op": "stats"}                                -> contadores de latencia
+  {"op": "ping"}                                 -> {"ok": true}
+Un tablero es una clave de 9 caracteres, una lista de 3 filas de texto o una
+lista 3x3. Los errores se responden como {"error": "..."}; una línea de más de
+MAX_LINE_BYTES se descarta con un error sin cerrar la conexión.
+
+Uso: python servidor.py [--host 127.0.0.1 --port 8765 | --unix /tmp/tres.sock]
+                        [--table q_table_20000.pkl] [--compile]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from qlearning_agente import QLearningAgent
+
+SYMBOLS = frozenset('XO ')
+
+# Longitud máxima de una línea de petición (bytes); el límite por defecto de
+# asyncio (64 KiB) se queda corto para lotes best_moves de miles de tableros
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+# Límites de los cubos del histograma de latencia (µs)
+LATENCY_BUCKETS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000)
+
+
+def parse_board(value):
+    """Tablero 3x3 (lista de listas) a partir de cualquiera de los formatos"""
+    if isinstance(value, str):
+        rows = [value[0:3], value[3:6], value[6:9]] if len(value) == 9 else None
+    elif isinstance(value, list) and len(value) == 3:
+        rows = value
+    else:
+        rows = None
+    if rows is None:
+        raise ValueError("el tablero debe tener 9 casillas")
+    board = [list(row) for row in rows]
+    if any(len(row) != 3 or not SYMBOLS.issuperset(row) for row in board):
+        raise ValueError("el tablero debe tener 3 filas de 3 casillas 'X', 'O' o ' '")
+    return board
+
+
+async def discard_line(reader, consumed):
+    """Descarta el resto de una línea que superó el límite del lector"""
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+class LatencyStats:
+    """Contadores de latencia por operación (cuenta, media, máximo, histograma)"""
+
+    def __init__(self):
+        self.ops = {}
+
+    def record(self, op, elapsed_ns):
+        stats = self.ops.get(op)
+        if stats is None:
+            stats = self.ops[op] = {'count': 0, 'total_ns': 0, 'max_ns': 0,
+                                    'buckets': [0] * (len(LATENCY_BUCKETS_US) + 1)}
+        stats['count'] += 1
+        stats['total_ns'] += elapsed_ns
+        stats['max_ns'] = max(stats['max_ns'], elapsed_ns)
+        elapsed_us = elapsed_ns / 1000
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_US) and elapsed_us > LATENCY_BUCKETS_US[bucket]:
+            bucket += 1
+        stats['buckets'][bucket] += 1
+
+    def summary(self):
+        result = {}
+        for op, stats in self.ops.items():
+            result[op] = {
+                'count': stats['count'],
+                'mean_us': stats['total_ns'] / stats['count'] / 1000,
+                'max_us': stats['max_ns'] / 1000,
+                'buckets_us': dict(zip([f"<={limit}" for limit in LATENCY_BUCKETS_US] + ['>'],
+                                       stats['buckets'])),
+            }
+        return result
+
+
+class MoveServer:
+    """Responde peticiones de movimiento con un único agente cargado"""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.latency = LatencyStats()
+        self.connections = 0
+        self.active_connections = 0
+        self.started = time.time()
+
+    def best_moves(self, boards):
+        """Mejores movimientos de varios tableros (una pasada vectorizada)"""
+        return self.agent.get_best_moves(boards)
+
+    def handle(self, request):
+        """Respuesta (dict) a una petición ya decodificada"""
+        op = request.get('op')
+        if op == 'best_move':
+            return {'move': self.agent.get_best_move(parse_board(request.get('board')))}
+        if op == 'best_moves':
+            boards = request.get('boards')
+            if not isinstance(boards, list):
+                raise ValueError("'boards' debe ser una lista")
+            return {'moves': self.best_moves([parse_board(board) for board in boards])}
+        if op == 'stats':
+            return {'latency': self.latency.summary(), 'connections': self.connections,
+                    'active_connections': self.active_connections,
+                    'uptime_s': time.time() - self.started}
+        if op == 'ping':
+            return {'ok': True}
+        raise ValueError(f"operación desconocida: {op}")
+
+    def respond(self, line):
+        """Procesa una línea y devuelve la línea de respuesta (bytes)"""
+        start = time.perf_counter_ns()
+        request_id = None
+        op = 'invalid'
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("la petición debe ser un objeto JSON")
+            request_id = request.get('id')
+            op = str(request.get('op'))
+            response = self.handle(request)
+        except (ValueError, TypeError) as error:
+            response = {'error': str(error)}
+        if request_id is not None:
+            response['id'] = request_id
+        self.latency.record(op, time.perf_counter_ns() - start)
+        return (json.dumps(response) + "\n").encode('utf-8')
+
+    def overrun_response(self):
+        self.latency.record('invalid', 0)
+        error = f"petición demasiado larga (máximo {MAX_LINE_BYTES} bytes por línea)"
+        return (json.dumps({'error': error}) + "\n").encode('utf-8')
+
+    async def serve_client(self, reader, writer):
+        """Atiende una conexión: una respuesta por línea, en orden"""
+        self.connections += 1
+        self.active_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial
+                except asyncio.LimitOverrunError as error:
+                    # Línea más larga que el límite: se descarta entera y se
+                    # responde con un error, sin cerrar la conexión
+                    await discard_line(reader, error.consumed)
+                    writer.write(self.overrun_response())
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(self.respond(line))
+                # Solo se espera al cliente si su buffer de salida se llena
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_connections -= 1
+            writer.close()
+
+
+async def start_server(agent, host='127.0.0.1', port=8765, unix_path=None):
+    """Arranca el servidor y devuelve (MoveServer, asyncio.Server)"""
+    move_server = MoveServer(agent)
+    if unix_path:
+        server = await asyncio.start_unix_server(move_server.serve_client, path=unix_path,
+                                                 limit=MAX_LINE_BYTES)
+    else:
+        server = await asyncio.start_server(move_server.serve_client, host, port,
+                                            limit=MAX_LINE_BYTES)
+    return move_server, server
+
+
+async def main_async(args):
+    agent = QLearningAgent()
+    if not agent.load_q_table(args.table):
+        raise SystemExit(agent.load_error)
+    if args.compile:
+        agent.compile_policy()
+    # Prepara los arrays de la consulta por lotes antes de aceptar clientes
+    agent.get_best_moves([[[' '] * 3 for _ in range(3)]])
+
+    _, server = await start_server(agent, args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Servidor de movimientos en {where} ({len(agent.q_table)} estados)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de movimientos del agente Q-Learning")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="ruta de socket Unix (en lugar de TCP)")
+    parser.add_argument('--table', default=None, help="tabla Q (.pkl, .npz o .qtb)")
+    parser.add_argument('--compile', action='store_true',
+                        help="precalcular la política (un movimiento = una lectura)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
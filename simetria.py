@@ -0,0 +1,80 @@
+"""
+Reducción por simetrías del tablero (grupo diédrico de 8 elementos).
+Cada tablero se asocia a un representante canónico (el de menor índice base 3
+entre sus 8 rotaciones/reflexiones) mediante una tabla precalculada, y las
+acciones se traducen entre el marco original y el canónico.
+"""
+
+import numpy as np
+
+from tablero_bits import (BOARD_VIEWS, NUM_CELLS, NUM_STATES, POW3, board_index,
+                          index_key, key_index)
+
+
+def _source_cells(source):
+    """Permutación de casillas: la casilla k del resultado viene de perm[k]"""
+    perm = []
+    for r in range(3):
+        for c in range(3):
+            sr, sc = source(r, c)
+            perm.append(3 * sr + sc)
+    return tuple(perm)
+
+
+TRANSFORMS = (
+    _source_cells(lambda r, c: (r, c)),          # Identidad
+    _source_cells(lambda r, c: (2 - c, r)),      # Rotación 90°
+    _source_cells(lambda r, c: (2 - r, 2 - c)),  # Rotación 180°
+    _source_cells(lambda r, c: (c, 2 - r)),      # Rotación 270°
+    _source_cells(lambda r, c: (r, 2 - c)),      # Reflejo horizontal
+    _source_cells(lambda r, c: (2 - r, c)),      # Reflejo vertical
+    _source_cells(lambda r, c: (c, r)),          # Diagonal principal
+    _source_cells(lambda r, c: (2 - c, 2 - r)),  # Diagonal secundaria
+)
+
+# INVERSE_TRANSFORMS[t][a]: casilla del marco canónico donde cae la casilla a
+INVERSE_TRANSFORMS = tuple(
+    tuple(perm.index(a) for a in range(NUM_CELLS)) for perm in TRANSFORMS
+)
+
+
+def _build_canonical_tables():
+    """Calcula el índice canónico y la transformación de cada estado"""
+    digits = (np.arange(NUM_STATES)[:, None] // np.array(POW3)) % 3
+    weights = np.array(POW3)
+    images = np.stack([digits[:, perm] @ weights for perm in TRANSFORMS])
+    transforms = images.argmin(axis=0)
+    canonical = images[transforms, np.arange(NUM_STATES)]
+    return canonical.tolist(), transforms.tolist()
+
+
+# CANONICAL_INDEX[i]: índice canónico; CANONICAL_TRANSFORM[i]: transformación usada
+CANONICAL_INDEX, CANONICAL_TRANSFORM = _build_canonical_tables()
+
+
+def canonicalize(board):
+    """Devuelve (vista canónica del tablero, transformación aplicada)"""
+    index = board_index(board)
+    return BOARD_VIEWS[CANONICAL_INDEX[index]], CANONICAL_TRANSFORM[index]
+
+
+def canonical_key(state_key):
+    """Clave de texto canónica de una clave de la tabla Q"""
+    return index_key(CANONICAL_INDEX[key_index(state_key)])
+
+
+def to_canonical_action(action, transform):
+    """Traduce (fila, col) del marco original al canónico"""
+    cell = INVERSE_TRANSFORMS[transform][3 * action[0] + action[1]]
+    return (cell // 3, cell % 3)
+
+
+def from_canonical_action(action, transform):
+    """Traduce (fila, col) del marco canónico al original"""
+    cell = TRANSFORMS[transform][3 * action[0] + action[1]]
+    return (cell // 3, cell % 3)
+
+
+def count_canonical_states(q_table):
+    """Número de clases de simetría distintas entre los estados de la tabla"""
+    return len({canonical_key(state) for state in q_table})
@@ -0,0 +1,140 @@
+"""
+Formato binario versionado para la tabla Q (.qtb) con carga por memmap.
+
+Estructura (little-endian):
+- Cabecera de 32 bytes: magic b'QTBL', versión, tamaño de cabecera, número de
+  estados, acciones por estado, longitud de metadatos y CRC32 del resto
+- Metadatos JSON (rellenados hasta múltiplo de 8 bytes)
+- Índice de estados: int32[n] ordenado (estado en base 3)
+- Valores: float32[n, 9]; NaN marca acciones que no están en la tabla
+
+La carga no deserializa nada: los arrays se mapean con numpy.memmap, así que
+el arranque es inmediato y varios procesos comparten las mismas páginas.
+Uso como conversor: python tabla_binaria.py q_table_20000.pkl q_table_20000.qtb
+"""
+
+import json
+import struct
+import sys
+import zlib
+from collections.abc import Mapping
+
+import numpy as np
+
+from tabla_q import ACTION_INDEX, ACTION_KEYS, load_table
+from tablero_bits import NUM_CELLS, index_key, key_index
+
+MAGIC = b'QTBL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIHHII8x')
+ALIGNMENT = 8
+
+
+class QTableFormatError(ValueError):
+    """El archivo no es una tabla .qtb válida (magic, versión o checksum)"""
+
+
+def _padded(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_binary_table(table, filename, metadata=None):
+    """Escribe una tabla Q ({estado: {"fila,col": valor}}) en formato .qtb"""
+    states = sorted(key_index(state) for state in table)
+    index = np.array(states, dtype='<i4')
+    values = np.full((len(states), NUM_CELLS), np.nan, dtype='<f4')
+    for row, state in enumerate(states):
+        for action_key, value in table[index_key(state)].items():
+            values[row, ACTION_INDEX[action_key]] = value
+
+    meta = json.dumps(metadata or {}, sort_keys=True).encode('utf-8')
+    meta = meta.ljust(_padded(len(meta)), b' ')
+    payload = meta + index.tobytes() + values.tobytes()
+    header = HEADER.pack(MAGIC, VERSION, HEADER.size, len(states), NUM_CELLS, 0,
+                         len(meta), zlib.crc32(payload))
+    with open(filename, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+
+
+class MappedQTable(Mapping):
+    """Tabla Q de solo lectura mapeada en memoria desde un archivo .qtb.
+
+    Se lee como {estado: {"fila,col": valor}}; las búsquedas usan búsqueda
+    binaria sobre el índice ordenado sin construir ningún dict.
+    """
+
+    backend_name = 'mmap'
+
+    def __init__(self, filename, verify=True):
+        with open(filename, 'rb') as f:
+            raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise QTableFormatError(f"{filename}: archivo demasiado corto")
+        (magic, version, header_size, num_states, num_actions, _,
+         meta_size, checksum) = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise QTableFormatError(f"{filename}: no es una tabla .qtb")
+        if version != VERSION:
+            raise QTableFormatError(f"{filename}: versión {version} no soportada")
+        if num_actions != NUM_CELLS:
+            raise QTableFormatError(f"{filename}: {num_actions} acciones por estado")
+
+        self.filename = filename
+        self._data = np.memmap(filename, dtype=np.uint8, mode='r', offset=header_size)
+        expected = meta_size + num_states * 4 + num_states * num_actions * 4
+        if len(self._data) != expected:
+            raise QTableFormatError(f"{filename}: tamaño inesperado")
+        if verify and zlib.crc32(self._data) != checksum:
+            raise QTableFormatError(f"{filename}: checksum incorrecto")
+
+        self.metadata = json.loads(bytes(self._data[:meta_size]).decode('utf-8'))
+        self.states = self._data[meta_size:meta_size + num_states * 4].view('<i4')
+        self.values = self._data[meta_size + num_states * 4:].view('<f4').reshape(
+            num_states, num_actions)
+
+    def find(self, index):
+        """Fila del estado con índice base 3 `index`, o -1 si no está"""
+        row = int(np.searchsorted(self.states, index))
+        if row < len(self.states) and self.states[row] == index:
+            return row
+        return -1
+
+    def __getitem__(self, state):
+        index = key_index(state) if isinstance(state, str) else state
+        row = self.find(index)
+        if row < 0:
+            raise KeyError(state)
+        values = self.values[row]
+        return {ACTION_KEYS[k]: float(values[k])
+                for k in range(NUM_CELLS) if not np.isnan(values[k])}
+
+    def __contains__(self, state):
+        index = key_index(state) if isinstance(state, str) else state
+        return self.find(index) >= 0
+
+    def __iter__(self):
+        for index in self.states:
+            yield index_key(int(index))
+
+    def __len__(self):
+        return len(self.states)
+
+    def to_dict(self):
+        return {state: self[state] for state in self}
+
+
+def convert_to_binary(source='q_table_20000.pkl', target='q_table_20000.qtb'):
+    """Convierte una tabla Q (.pkl o .npz) al formato .qtb y la verifica"""
+    table = load_table(source)
+    write_binary_table(table, target, metadata={'source': source})
+    mapped = MappedQTable(target)
+    print(f"Tabla Q convertida: {source} -> {target} ({len(mapped)} estados)")
+    return mapped
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python tabla_binaria.py entrada.pkl salida.qtb")
+        sys.exit(1)
+    convert_to_binary(sys.argv[1], sys.argv[2])
@@ -0,0 +1,319 @@
+"""
+Backends de almacenamiento para la tabla Q.
+- DictQTable: dict de dicts con claves de texto (backend de referencia)
+- DenseQTable: matriz NumPy float32[3**9, 9] indexada por el estado en base 3
+  (NumPy se importa al crear la primera: cargar un .pkl no lo necesita)
+Ambos se leen como un dict {estado: {"fila,col": valor}}, así que
+qlearning_agente y extract_states siguen funcionando sin cambios.
+El formato binario mapeado en memoria (.qtb) está en tabla_binaria.
+Uso como conversor: python tabla_q.py q_table_20000.pkl q_table_20000.npz
+"""
+
+import numbers
+import os
+import pickle
+import sys
+from collections.abc import Mapping
+
+from tablero_bits import (NUM_CELLS, NUM_STATES, POW3, board_index,
+                          index_key, key_index)
+
+ACTION_KEYS = tuple(f"{k // 3},{k % 3}" for k in range(NUM_CELLS))
+ACTION_INDEX = {key: k for k, key in enumerate(ACTION_KEYS)}
+
+# Errores de load_table con un archivo ilegible, corrupto o ajeno: los fallos de
+# decodificación se convierten en ValueError donde ocurren, así que cualquier
+# otra excepción es un error de programación y se propaga
+LOAD_ERRORS = (OSError, ValueError)
+
+# Lo que puede lanzar pickle.load con un flujo corrupto o con clases de módulos
+# que no existen aquí
+_PICKLE_ERRORS = (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                  IndexError, KeyError, TypeError, ValueError)
+
+_STATE_SYMBOLS = frozenset('XO ')
+
+_legal_actions = None
+
+
+def legal_actions():
+    """Máscara de acciones legales: legal_actions()[estado, casilla] es True si
+    está vacía (array bool[3**9, 9] creado la primera vez que se pide)"""
+    global _legal_actions
+    if _legal_actions is None:
+        import numpy as np
+        digits = (np.arange(NUM_STATES)[:, None] // np.array(POW3)) % 3
+        _legal_actions = digits == 0
+    return _legal_actions
+
+
+class DictQTable(dict):
+    """Tabla Q de referencia: {"XO  ...": {"fila,col": valor}}
+
+    Las lecturas no insertan entradas; solo update crea estados nuevos.
+    """
+
+    backend_name = 'dict'
+
+    # Conjunto de (estado, acción) modificados desde el último checkpoint;
+    # None desactiva el seguimiento (ver checkpoints.TrainingCheckpointer)
+    changed = None
+
+    def state_key(self, board):
+        """Convierte el tablero a una clave de texto"""
+        return ''.join([''.join(row) for row in board])
+
+    def q_value(self, state, action):
+        """Valor Q de (estado, acción); 0 si no existe"""
+        actions = self.get(state)
+        if not actions:
+            return 0
+        return actions.get(f"{action[0]},{action[1]}", 0)
+
+    def set_q_value(self, state, action, value):
+        """Asigna el valor Q de (estado, acción)"""
+        if state not in self:
+            self[state] = {}
+        self[state][f"{action[0]},{action[1]}"] = value
+        if self.changed is not None:
+            self.changed.add((state, action))
+
+    def best_action(self, state, actions):
+        """Acción con mayor valor Q entre las disponibles (0 si no existe)"""
+        values = self.get(state, {})
+        best_action = None
+        best_value = -float('inf')
+        for action in actions:
+            value = values.get(f"{action[0]},{action[1]}", 0)
+            if value > best_value:
+                best_value = value
+                best_action = action
+        return best_action
+
+    def max_q_value(self, state):
+        """Mayor valor Q entre las acciones legales del estado (0 si no hay)"""
+        values = self.get(state)
+        if not values:
+            return 0
+        return max((values.get(ACTION_KEYS[k], 0)
+                    for k in range(NUM_CELLS) if state[k] == ' '), default=0)
+
+    def to_dict(self):
+        """Dict de dicts plano (formato de q_table_20000.pkl)"""
+        return dict(self)
+
+    @classmethod
+    def from_dict(cls, table):
+        return cls(table)
+
+
+class DenseQTable(Mapping):
+    """Tabla Q densa: float32[3**9, 9] indexada por estado en base 3 y casilla.
+
+    La memoria es fija (unos 0.9 MB). `known` marca las entradas (estado,
+    acción) escritas alguna vez para poder reproducir el dict original.
+    """
+
+    backend_name = 'dense'
+    changed = None
+
+    def __init__(self):
+        import numpy as np
+        self.values = np.zeros((NUM_STATES, NUM_CELLS), dtype=np.float32)
+        self.known = np.zeros((NUM_STATES, NUM_CELLS), dtype=bool)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.known.nbytes
+
+    def state_key(self, board):
+        """Índice base 3 del tablero"""
+        return board_index(board)
+
+    def q_value(self, state, action):
+        return float(self.values[state, 3 * action[0] + action[1]])
+
+    def set_q_value(self, state, action, value):
+        cell = 3 * action[0] + action[1]
+        self.values[state, cell] = value
+        self.known[state, cell] = True
+        if self.changed is not None:
+            self.changed.add((state, action))
+
+    def best_action(self, state, actions):
+        """Acción con mayor valor Q entre `actions` (empates: la primera de
+        `actions`, como DictQTable; con simetrías el orden no es el de casillas)"""
+        if not actions:
+            return None
+        cells = [3 * row + col for row, col in actions]
+        return actions[int(self.values[state, cells].argmax())]
+
+    def max_q_value(self, state):
+        legal = legal_actions()[state]
+        if not legal.any():
+            return 0
+        return float(self.values[state][legal].max())
+
+    # --- Interfaz de lectura tipo dict: {"XO  ...": {"fila,col": valor}} ---
+
+    def _known_states(self):
+        return self.known.any(axis=1).nonzero()[0]
+
+    def __getitem__(self, state):
+        index = key_index(state) if isinstance(state, str) else state
+        cells = self.known[index].nonzero()[0]
+        if not len(cells):
+            raise KeyError(state)
+        row = self.values[index]
+        return {ACTION_KEYS[k]: float(row[k]) for k in cells}
+
+    def __contains__(self, state):
+        index = key_index(state) if isinstance(state, str) else state
+        return bool(self.known[index].any())
+
+    def __iter__(self):
+        for index in self._known_states():
+            yield index_key(int(index))
+
+    def __len__(self):
+        return int(self.known.any(axis=1).sum())
+
+    def to_dict(self):
+        """Convierte a dict de dicts (formato de q_table_20000.pkl)"""
+        return {state: self[state] for state in self}
+
+    @classmethod
+    def from_dict(cls, table):
+        dense = cls()
+        for state, actions in table.items():
+            index = key_index(state)
+            for action_key, value in actions.items():
+                cell = ACTION_INDEX[action_key]
+                dense.values[index, cell] = value
+                dense.known[index, cell] = True
+        return dense
+
+    def save(self, filename):
+        """Guarda la tabla en formato .npz"""
+        import numpy as np
+        np.savez_compressed(filename, values=self.values, known=self.known)
+
+    @classmethod
+    def load(cls, filename):
+        import zipfile
+        import numpy as np
+        dense = cls()
+        try:
+            with np.load(filename) as data:
+                dense.values[:] = data['values']
+                dense.known[:] = data['known']
+        except (KeyError, zipfile.BadZipFile) as error:
+            raise ValueError(f"{filename} no es una tabla Q densa: {error}") from error
+        return dense
+
+
+BACKENDS = {
+    'dict': DictQTable,
+    'dense': DenseQTable,
+}
+
+
+def make_q_table(backend='dict'):
+    """Crea una tabla Q vacía del backend indicado ('dict' o 'dense')"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend}")
+    return BACKENDS[backend]()
+
+
+def load_table(filename, backend=None):
+    """Carga una tabla Q (.pkl, .npz o .qtb) en el backend indicado.
+    Con backend=None se usa el natural del archivo: dict para .pkl, dense para
+    .npz y la tabla mapeada en memoria (solo lectura) para .qtb.
+    """
+    if filename.endswith('.qtb'):
+        from tabla_binaria import MappedQTable
+        table = MappedQTable(filename)
+        if backend in (None, 'mmap'):
+            return table
+        return BACKENDS[backend].from_dict(table.to_dict())
+    if filename.endswith('.npz'):
+        table = DenseQTable.load(filename)
+        if backend in (None, 'dense'):
+            return table
+        return BACKENDS[backend].from_dict(table.to_dict())
+    with open(filename, 'rb') as f:
+        try:
+            table = pickle.load(f)
+        except _PICKLE_ERRORS as error:
+            raise ValueError(f"{filename} está corrupto: {error!r}") from error
+    _check_table(table, filename)
+    return BACKENDS[backend or 'dict'].from_dict(table)
+
+
+def _check_table(table, filename):
+    """Comprueba que un pickle tiene la forma {estado: {"fila,col": valor}}"""
+    if not isinstance(table, dict):
+        raise ValueError(f"{filename} no contiene una tabla Q")
+    for state, actions in table.items():
+        if (not isinstance(state, str) or len(state) != NUM_CELLS
+                or not _STATE_SYMBOLS.issuperset(state) or not isinstance(actions, dict)
+                or not ACTION_INDEX.keys() >= actions.keys()
+                or not all(isinstance(value, numbers.Real) for value in actions.values())):
+            raise ValueError(f"{filename} no contiene una tabla Q (entrada {state!r})")
+
+
+def metadata_path(filename):
+    """Archivo de metadatos junto a una tabla .pkl o .npz"""
+    return filename + '.meta.json'
+
+
+def save_table(table, filename, metadata=None):
+    """Guarda una tabla Q según la extensión: .qtb (binario), .npz o pickle.
+    Los metadatos van dentro del .qtb; para .pkl y .npz, que siguen siendo la
+    tabla tal cual, se escriben en `metadata_path(filename)` (y sin metadatos
+    se borra el de un guardado anterior, que ya no correspondería a la tabla).
+    """
+    if filename.endswith('.qtb'):
+        from tabla_binaria import write_binary_table
+        write_binary_table(table, filename, metadata)
+        return
+    if filename.endswith('.npz'):
+        if not isinstance(table, DenseQTable):
+            table = DenseQTable.from_dict(table)
+        table.save(filename)
+    else:
+        with open(filename, 'wb') as f:
+            pickle.dump(table.to_dict(), f)
+    if metadata is not None:
+        import json
+        with open(metadata_path(filename), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, sort_keys=True)
+    elif os.path.exists(metadata_path(filename)):
+        os.remove(metadata_path(filename))
+
+
+def load_metadata(filename):
+    """Metadatos guardados con una tabla Q ({} si no tiene)"""
+    if filename.endswith('.qtb'):
+        from tabla_binaria import MappedQTable
+        return MappedQTable(filename).metadata
+    if not os.path.exists(metadata_path(filename)):
+        return {}
+    import json
+    with open(metadata_path(filename), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def convert_pickle(pkl_file='q_table_20000.pkl', npz_file='q_table_20000.npz'):
+    """Convierte una tabla Q en pickle al formato denso .npz"""
+    table = load_table(pkl_file, backend='dense')
+    table.save(npz_file)
+    print(f"Tabla Q convertida: {pkl_file} -> {npz_file} ({len(table)} estados)")
+    return table
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python tabla_q.py entrada.pkl salida.npz")
+        sys.exit(1)
+    convert_pickle(sys.argv[1], sys.argv[2])
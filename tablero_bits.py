@@ -0,0 +1,167 @@
+"""
+Motor de tres en raya basado en tableros de bits.
+La posición se guarda como dos máscaras de 9 bits (X y O) y las victorias se
+comprueban contra máscaras de línea precalculadas.
+Mantiene el contrato reset/step/check_winner de entrenamiento.TicTacToeGame.
+"""
+
+NUM_CELLS = 9
+NUM_STATES = 3 ** NUM_CELLS
+FULL_MASK = (1 << NUM_CELLS) - 1
+
+# Casilla k = 3 * fila + columna
+CELL_BITS = tuple(1 << k for k in range(NUM_CELLS))
+POW3 = tuple(3 ** k for k in range(NUM_CELLS))
+SYMBOLS = (' ', 'X', 'O')
+SYMBOL_CODES = {' ': 0, 'X': 1, 'O': 2}
+
+LINE_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Filas
+    0b001001001, 0b010010010, 0b100100100,  # Columnas
+    0b100010001, 0b001010100,               # Diagonales
+)
+
+# Para cada máscara de 9 bits: ¿contiene alguna línea completa?
+WINNING_MASKS = tuple(
+    any(mask & line == line for line in LINE_MASKS)
+    for mask in range(FULL_MASK + 1)
+)
+
+# Para cada máscara de casillas ocupadas: movimientos libres (fila, columna)
+FREE_MOVES = tuple(
+    tuple((k // 3, k % 3) for k in range(NUM_CELLS) if not occupied & CELL_BITS[k])
+    for occupied in range(FULL_MASK + 1)
+)
+
+
+def _build_board_views():
+    """Precalcula una vista inmutable (tupla de 3 filas) por cada estado base 3.
+    El índice es fila0 + 27 * fila1 + 729 * fila2, así que las vistas son el
+    producto de las 27 filas posibles (cada fila es una única cadena compartida)."""
+    rows = tuple(''.join(SYMBOLS[value // POW3[col] % 3] for col in range(3))
+                 for value in range(27))
+    return tuple((row0, row1, row2) for row2 in rows for row1 in rows for row0 in rows)
+
+
+# BOARD_VIEWS[i][fila][columna] -> ' ', 'X' u 'O'
+BOARD_VIEWS = _build_board_views()
+
+
+def board_index(board):
+    """Índice base 3 de un tablero 3x3 (lista de listas o vista)"""
+    index = 0
+    for i in range(3):
+        row = board[i]
+        for j in range(3):
+            index += SYMBOL_CODES[row[j]] * POW3[3 * i + j]
+    return index
+
+
+def key_index(state_key):
+    """Índice base 3 de una clave de 9 caracteres de la tabla Q"""
+    index = 0
+    for k, symbol in enumerate(state_key):
+        index += SYMBOL_CODES[symbol] * POW3[k]
+    return index
+
+
+def index_key(index):
+    """Clave de 9 caracteres (formato de la tabla Q) de un índice base 3"""
+    return ''.join(BOARD_VIEWS[index])
+
+
+def index_masks(index):
+    """Máscaras (X, O) de un índice base 3"""
+    x_mask = 0
+    o_mask = 0
+    for k in range(NUM_CELLS):
+        code = index % 3
+        if code == 1:
+            x_mask |= CELL_BITS[k]
+        elif code == 2:
+            o_mask |= CELL_BITS[k]
+        index //= 3
+    return x_mask, o_mask
+
+
+def masks_winner(x_mask, o_mask):
+    """Ganador a partir de las máscaras: 'X', 'O', 'Tie' o None"""
+    if WINNING_MASKS[x_mask]:
+        return 'X'
+    if WINNING_MASKS[o_mask]:
+        return 'O'
+    if x_mask | o_mask == FULL_MASK:
+        return 'Tie'
+    return None
+
+
+class BitboardTicTacToeGame:
+    """Juego con el mismo contrato que TicTacToeGame sobre máscaras de bits.
+
+    reset() y step() devuelven una vista precalculada e inmutable del tablero
+    (tupla de tres cadenas), de modo que board[fila][columna] sigue
+    funcionando sin crear listas en cada paso.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Reinicia el juego"""
+        self.x_mask = 0
+        self.o_mask = 0
+        self.index = 0
+        self.current_player = 'X'
+        self.done = False
+        self.winner = None
+        return BOARD_VIEWS[0]
+
+    @property
+    def board(self):
+        """Vista del tablero actual"""
+        return BOARD_VIEWS[self.index]
+
+    def make_move(self, row, col, player):
+        """Realiza un movimiento"""
+        cell = 3 * row + col
+        bit = CELL_BITS[cell]
+        if (self.x_mask | self.o_mask) & bit or self.done:
+            return False
+        if player == 'X':
+            self.x_mask |= bit
+            self.index += POW3[cell]
+        else:
+            self.o_mask |= bit
+            self.index += 2 * POW3[cell]
+        return True
+
+    def check_winner(self):
+        """Verifica si hay ganador"""
+        return masks_winner(self.x_mask, self.o_mask)
+
+    def get_available_moves(self):
+        """Obtiene movimientos disponibles (tupla precalculada)"""
+        return FREE_MOVES[self.x_mask | self.o_mask]
+
+    def step(self, row, col, player):
+        """Ejecuta un paso del juego"""
+        if not self.make_move(row, col, player):
+            return BOARD_VIEWS[self.index], -10, True
+
+        winner = masks_winner(self.x_mask, self.o_mask)
+        reward = 0
+        done = False
+
+        if winner is not None:
+            done = True
+            if winner == 'O':  # Agente gana
+                reward = 1
+            elif winner == 'X':  # Agente pierde
+                reward = -1
+            else:  # Empate
+                reward = 0.5
+
+        # Cambiar jugador
+        self.current_player = 'O' if player == 'X' else 'X'
+
+        return BOARD_VIEWS[self.index], reward, done
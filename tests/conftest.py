@@ -0,0 +1,16 @@
+"""Los módulos del juego están en la raíz del repositorio (sin paquete)"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def q_table_file():
+    """Tabla Q entrenada incluida en el repositorio"""
+    return os.path.join(ROOT, 'q_table_20000.pkl')
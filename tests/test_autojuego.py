@@ -0,0 +1,57 @@
+"""Autojuego con una tabla compartida para X y O"""
+
+import numpy as np
+import pytest
+
+from autojuego import (PLAYABLE, SWAP_INDEX, merge_updates, self_play_games, state_coverage,
+                       train_self_play)
+from tabla_q import DenseQTable
+from tablero_bits import NUM_STATES, index_key, key_index
+
+
+def test_swap_exchanges_players():
+    assert (SWAP_INDEX[SWAP_INDEX] == np.arange(NUM_STATES)).all()
+    index = key_index('XO X  O  ')
+    assert index_key(int(SWAP_INDEX[index])) == 'OX O  X  '
+
+
+def test_games_counts_and_playable_states():
+    table = DenseQTable()
+    counts = self_play_games(table, 500, 0, 500, epsilon=1.0, rng=np.random.default_rng(0))
+    assert counts.sum() == 500
+    known = table.known.any(axis=1)
+    # Todo lo aprendido está en la perspectiva de quien mueve (coloca 'O')
+    assert known.any() and not (known & ~PLAYABLE).any()
+
+
+def test_merge_averages_per_entry():
+    table = DenseQTable()
+    updates = [(np.array([3, 10]), np.array([0.2, 0.4]), None),
+               (np.array([10]), np.array([0.8]), None)]
+    merge_updates(table, updates)
+    flat = table.values.reshape(-1)
+    assert flat[3] == pytest.approx(0.2) and flat[10] == pytest.approx(0.6)
+    assert table.known.reshape(-1)[[3, 10]].all() and table.known.sum() == 2
+
+
+def test_training_learns_both_sides():
+    agent = train_self_play(games=20000, workers=0, seed=0, save_path=None, verbose=False)
+    table = agent.q_table
+    assert agent.training_stats['o_wins'] + agent.training_stats['x_wins'] + \
+        agent.training_stats['ties'] == 20000
+    covered, playable = state_coverage(table)
+    assert covered > 0.9 * playable
+    # Quien mueve (siempre 'O' en la tabla) gana completando la fila de arriba
+    assert table.best_action(key_index('OO XX    '), [(0, 2), (1, 2), (2, 0)]) == (0, 2)
+    # ...y bloquea si no puede ganar
+    assert table.best_action(key_index('O  XX    '), [(1, 2), (2, 0), (2, 2)]) == (1, 2)
+
+    again = train_self_play(games=20000, workers=0, seed=0, save_path=None, verbose=False)
+    assert (again.q_table.values == table.values).all()
+
+
+def test_parallel_rounds():
+    agent = train_self_play(games=4000, workers=2, games_per_round=1000, seed=0,
+                            save_path=None, verbose=False)
+    assert sum(agent.training_stats[k] for k in ('o_wins', 'x_wins', 'ties')) == 4000
+    assert not (agent.q_table.known.any(axis=1) & ~PLAYABLE).any()
@@ -0,0 +1,48 @@
+"""Barrido de hiperparámetros: espacio de puntos, caché reanudable y tabla CSV"""
+
+import csv
+
+from barrido import grid_space, load_cache, point_key, random_space, run_point, run_sweep
+
+TINY = {'episodes': [40], 'eval_games': [10]}
+
+
+def test_grid_and_random_space():
+    points = grid_space(alpha=[0.1, 0.2], gamma=[0.8, 0.9, 0.99])
+    assert len(points) == 6
+    assert {(p['alpha'], p['gamma']) for p in points} == {
+        (a, g) for a in (0.1, 0.2) for g in (0.8, 0.9, 0.99)}
+    assert all(p['episodes'] == 20000 for p in points)
+
+    sample = random_space(5, sample_seed=3, gamma=[0.9])
+    assert sample == random_space(5, sample_seed=3, gamma=[0.9])
+    assert all(p['gamma'] == 0.9 and 0.01 <= p['alpha'] <= 0.5 for p in sample)
+    assert len({point_key(p) for p in sample}) == 5
+
+
+def test_run_point_is_reproducible():
+    point = grid_space(**TINY)[0]
+    first, second = run_point(point), run_point(point)
+    for row in (first, second):
+        del row['wall_time'], row['episodes_per_sec']
+    assert first == second
+    assert first['key'] == point_key(point)
+
+
+def test_sweep_resumes_from_cache(tmp_path):
+    cache_file = str(tmp_path / 'cache.jsonl')
+    output_file = str(tmp_path / 'resultados.csv')
+    points = grid_space(alpha=[0.1, 0.3], **TINY)
+
+    # Un punto ya calculado en un barrido anterior no se repite
+    run_sweep(points[:1], workers=1, cache_file=cache_file, output_file=output_file)
+    cached = load_cache(cache_file)
+    rows = run_sweep(points, workers=2, cache_file=cache_file, output_file=output_file)
+    with open(cache_file, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+    assert rows[0] == cached[point_key(points[0])]
+
+    with open(output_file, newline='', encoding='utf-8') as f:
+        table = list(csv.DictReader(f))
+    assert [row['key'] for row in table] == [point_key(p) for p in points]
+    assert run_sweep(points, workers=2, cache_file=cache_file, output_file=output_file) == rows
@@ -0,0 +1,25 @@
+"""Comparación con una ejecución de referencia (puerta de regresiones)"""
+
+from benchmarks import compare
+
+
+def report(**results):
+    return {'results': results}
+
+
+def test_relative_regressions():
+    baseline = report(**{'training.episodes_per_sec': 1000.0, 'best_move.p50_us': 10.0})
+    ok = report(**{'training.episodes_per_sec': 950.0, 'best_move.p50_us': 10.5})
+    assert compare(ok, baseline, 0.10) == []
+    slow = report(**{'training.episodes_per_sec': 800.0, 'best_move.p50_us': 12.0})
+    assert [metric for metric, *_ in compare(slow, baseline, 0.10)] == [
+        'training.episodes_per_sec', 'best_move.p50_us']
+
+
+def test_metric_that_stops_being_reached_is_a_regression():
+    baseline = report(**{'convergence.qlambda.episodes': 2})
+    current = report(**{'convergence.qlambda.episodes': None})
+    assert compare(current, baseline, 0.10) == [('convergence.qlambda.episodes', 2, None, None)]
+    # Sin valor en la referencia no hay con qué comparar
+    assert compare(baseline, current, 0.10) == []
+    assert compare(report(), report(), 0.10) == []
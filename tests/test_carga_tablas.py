@@ -0,0 +1,50 @@
+"""Tablas corruptas o ajenas: load_error sin ocultar errores de programación"""
+
+import pickle
+
+import pytest
+
+import qlearning_agente
+from entrenamiento import QLearningAgent as TrainingAgent
+from qlearning_agente import QLearningAgent as GameAgent
+
+
+def write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    return str(path)
+
+
+BAD_FILES = {
+    'vacio.pkl': b'',
+    'basura.pkl': b'basura',
+    'cortado.pkl': pickle.dumps({'X        ': {'1,1': 0.5}})[:-3],
+    'lista.pkl': pickle.dumps([1, 2, 3]),
+    'claves.pkl': pickle.dumps({'XX': {'1,1': 0.5}}),
+    'acciones.pkl': pickle.dumps({'X        ': {'9,9': 0.5}}),
+    # Referencia a una clase de un módulo que no existe
+    'ajeno.pkl': b'cmodulo_inexistente\nTabla\n.',
+    'basura.npz': b'PK\x03\x04 no es un zip',
+    'basura.qtb': b'QTBL' + b'\x00' * 40,
+    'inexistente.pkl': None,
+}
+
+
+@pytest.mark.parametrize('name', sorted(BAD_FILES))
+@pytest.mark.parametrize('backend', [None, 'dense'])
+def test_bad_tables_set_load_error(tmp_path, name, backend):
+    content = BAD_FILES[name]
+    filename = write(tmp_path / name, content) if content is not None else str(tmp_path / name)
+    agent = GameAgent(backend=backend)
+    assert not agent.load_q_table(filename)
+    assert name in agent.load_error
+    assert not TrainingAgent(backend=backend or 'dict').load_q_table(filename)
+
+
+def test_programming_errors_propagate(monkeypatch, q_table_file):
+    def broken_load_table(filename, backend=None):
+        raise TypeError("error de programación")
+
+    monkeypatch.setattr(qlearning_agente, 'load_table', broken_load_table)
+    with pytest.raises(TypeError):
+        GameAgent().load_q_table(q_table_file)
@@ -0,0 +1,141 @@
+"""Checkpoints: instantánea + deltas, reanudación exacta y memoria de experiencia"""
+
+import os
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from checkpoints import TrainingCheckpointer
+from entrenamiento import QLearningAgent, train_agent_with_progress
+from experiencia import ReplayBuffer
+from tablero_bits import BitboardTicTacToeGame
+
+EPISODES = 60
+
+
+def train(directory, backend, resume=False, episodes=EPISODES, seed=0, symmetric=False):
+    random.seed(seed)
+    checkpointer = TrainingCheckpointer(str(directory), every=10, full_every=4)
+    return train_agent_with_progress(episodes, game=BitboardTicTacToeGame(), backend=backend,
+                                     symmetric=symmetric, save_path=None, verbose=False,
+                                     checkpointer=checkpointer, resume=resume,
+                                     replay=ReplayBuffer(500, seed=seed), replay_batch=16)
+
+
+def restored(directory, backend, episodes=EPISODES, symmetric=False):
+    agent = QLearningAgent(backend=backend, symmetric=symmetric)
+    agent.replay = ReplayBuffer(500)
+    state = TrainingCheckpointer(str(directory), every=10, full_every=4).restore(agent, episodes)
+    return agent, state
+
+
+@pytest.mark.parametrize('backend', ['dict', 'dense'])
+def test_snapshot_plus_deltas_restore_final_table(tmp_path, backend):
+    trained = train(tmp_path, backend)
+    # 6 guardados: instantáneas en el 1.º y el 4.º, deltas en el 5.º y el 6.º
+    with open(os.path.join(tmp_path, 'snapshot.pkl'), 'rb') as f:
+        assert pickle.load(f)['episode'] == 40
+    agent, state = restored(tmp_path, backend)
+    assert state['episode'] == EPISODES
+    assert state['counts'] == (trained.training_stats['wins'], trained.training_stats['losses'],
+                               trained.training_stats['ties'])
+    assert agent.q_table.to_dict() == trained.q_table.to_dict()
+    for ours, theirs in zip(agent.replay.sample(64), trained.replay.sample(64)):
+        np.testing.assert_array_equal(ours, theirs)
+
+
+def test_deltas_hold_only_new_entries(tmp_path):
+    trained = train(tmp_path, 'dict', symmetric=True)
+    checkpointer = TrainingCheckpointer(str(tmp_path))
+    with open(checkpointer.snapshot_file, 'rb') as f:
+        snapshot = pickle.load(f)
+    seen_states = set(snapshot['raw_states'])
+    transitions = snapshot['replay']['added']
+    for delta in checkpointer._read_deltas():
+        # Solo estados y transiciones nuevos desde el checkpoint anterior
+        assert seen_states.isdisjoint(delta['raw_states'])
+        assert delta['replay']['start'] == transitions
+        assert len(delta['replay']['states']) == delta['replay']['added'] - transitions
+        seen_states.update(delta['raw_states'])
+        transitions = delta['replay']['added']
+    assert seen_states == trained.raw_states
+
+    agent, _ = restored(tmp_path, 'dict', symmetric=True)
+    assert agent.raw_states == trained.raw_states
+
+
+@pytest.mark.parametrize('backend', ['dict', 'dense'])
+def test_resume_after_interruption_is_exact(tmp_path, backend):
+    expected = train(tmp_path / 'completo', backend).q_table.to_dict()
+
+    directory = tmp_path / 'cortado'
+    train(directory, backend)
+    # Simula una parada tras el episodio 50: se conserva solo el primer delta
+    checkpointer = TrainingCheckpointer(str(directory))
+    first_delta = checkpointer._read_deltas()[0]
+    assert first_delta['episode'] == 50
+    with open(checkpointer.delta_file, 'wb') as f:
+        pickle.dump(first_delta, f)
+
+    # Otra semilla: el estado aleatorio debe venir del checkpoint
+    resumed = train(directory, backend, resume=True, seed=123)
+    assert resumed.q_table.to_dict() == expected
+
+
+def test_fresh_run_discards_previous_checkpoints(tmp_path):
+    train(tmp_path, 'dict')
+    fresh = train(tmp_path, 'dict', episodes=20, seed=5)
+    with open(os.path.join(tmp_path, 'snapshot.pkl'), 'rb') as f:
+        snapshot = pickle.load(f)
+    assert (snapshot['episode'], snapshot['episodes']) == (10, 20)
+    deltas = TrainingCheckpointer(str(tmp_path))._read_deltas()
+    assert [delta['episode'] for delta in deltas] == [20]
+    agent, _ = restored(tmp_path, 'dict', episodes=20)
+    assert agent.q_table.to_dict() == fresh.q_table.to_dict()
+
+
+def fill(buffer, start, count):
+    for i in range(start, start + count):
+        buffer.add(i, i % 9, 0.5 * i, i + 1, i % 4 == 0)
+
+
+def assert_same_buffer(buffer, copy):
+    assert (copy.position, len(copy), copy.added) == (buffer.position, len(buffer), buffer.added)
+    for ours, theirs in zip(buffer.sample(32), copy.sample(32)):
+        np.testing.assert_array_equal(ours, theirs)
+
+
+def test_replay_buffer_state_round_trip():
+    buffer = ReplayBuffer(capacity=8, seed=3)
+    fill(buffer, 0, 11)
+    state = pickle.loads(pickle.dumps(buffer.get_state()))
+    assert len(state['states']) == 8
+
+    copy = ReplayBuffer(capacity=8, seed=99)
+    copy.set_state(state)
+    assert_same_buffer(buffer, copy)
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(capacity=16).set_state(state)
+
+
+def test_replay_buffer_incremental_states():
+    buffer = ReplayBuffer(capacity=8, seed=3)
+    fill(buffer, 0, 5)
+    records = [buffer.get_state()]
+    fill(buffer, 5, 7)  # Da la vuelta al buffer circular
+    records.append(buffer.get_state(since=5))
+    fill(buffer, 12, 20)  # Más que la capacidad: solo viajan las 8 últimas
+    records.append(buffer.get_state(since=12))
+    assert [len(record['states']) for record in records] == [5, 7, 8]
+
+    copy = ReplayBuffer(capacity=8, seed=99)
+    for record in records:
+        copy.set_state(record)
+    assert_same_buffer(buffer, copy)
+
+    # Un delta no se puede aplicar sin los anteriores
+    with pytest.raises(ValueError):
+        ReplayBuffer(capacity=8).set_state(records[1])
@@ -0,0 +1,117 @@
+"""Parada temprana por convergencia, metadatos y reanudación desde checkpoints"""
+
+import os
+import pickle
+import random
+
+import pytest
+
+from checkpoints import TrainingCheckpointer
+from convergencia import ConvergenceMonitor
+from entrenamiento import QLearningAgent, train_agent_with_progress
+from tabla_q import DictQTable, load_metadata, metadata_path, save_table
+from tablero_bits import BitboardTicTacToeGame
+
+EPISODES = 200
+
+
+def monitor(window=10):
+    # Solo la tasa de estados nuevos decide: con la semilla 0 se cumple en las
+    # ventanas que acaban en 40, 50 y 60 (de 10) o en 90, 105 y 120 (de 15)
+    return ConvergenceMonitor(window=window, max_delta=1.0, mean_delta=1.0, policy_change=1.0,
+                              new_states=0.3, patience=3)
+
+
+def train(convergence, directory=None, resume=False, seed=0, save_path=None):
+    random.seed(seed)
+    checkpointer = None
+    if directory is not None:
+        # Una instantánea al principio y después solo deltas
+        checkpointer = TrainingCheckpointer(str(directory), every=10, full_every=100)
+    return train_agent_with_progress(EPISODES, game=BitboardTicTacToeGame(), save_path=save_path,
+                                     verbose=False, checkpointer=checkpointer, resume=resume,
+                                     convergence=convergence)
+
+
+def test_stops_after_patience_stable_windows():
+    convergence = monitor()
+    agent = train(convergence)
+    assert convergence.stop_episode == 60
+    assert agent.training_stats['episodes'] == 60
+    assert [record['episode_end'] for record in convergence.history] == [10, 20, 30, 40, 50, 60]
+    assert convergence.stable_windows == 3
+    assert convergence.stop_reason.startswith("convergencia:")
+
+
+def test_without_convergence_runs_all_episodes():
+    convergence = ConvergenceMonitor(window=10, max_delta=0.0, mean_delta=0.0, patience=3)
+    agent = train(convergence)
+    assert convergence.stop_reason is None
+    assert agent.training_stats['episodes'] == EPISODES
+    assert convergence.metadata()['stop_reason'] == "episodios completados"
+
+
+def test_stop_reason_saved_in_metadata(tmp_path):
+    filename = str(tmp_path / 'tabla.pkl')
+    train(monitor(), save_path=filename)
+    metadata = load_metadata(filename)
+    assert metadata['episodes'] == 60
+    assert metadata['stop_episode'] == 60
+    assert metadata['convergence_window'] == 10
+    assert metadata['convergence_last']['episode_end'] == 60
+
+
+def test_save_without_metadata_drops_stale_sidecar(tmp_path):
+    filename = str(tmp_path / 'tabla.pkl')
+    save_table(DictQTable(), filename, {'episodes': 10})
+    assert os.path.exists(metadata_path(filename))
+    save_table(DictQTable(), filename)
+    assert not os.path.exists(metadata_path(filename))
+    assert load_metadata(filename) == {}
+
+
+def interrupt_after(directory, episode):
+    """Simula una parada tras el checkpoint de `episode`: se descartan los deltas posteriores"""
+    checkpointer = TrainingCheckpointer(str(directory))
+    deltas = [delta for delta in checkpointer._read_deltas() if delta['episode'] <= episode]
+    assert deltas[-1]['episode'] == episode
+    with open(checkpointer.delta_file, 'wb') as f:
+        for delta in deltas:
+            pickle.dump(delta, f)
+
+
+@pytest.mark.parametrize('window', [10, 15])
+def test_resume_stops_at_same_episode(tmp_path, window):
+    expected_monitor = monitor(window)
+    expected = train(expected_monitor)
+
+    directory = tmp_path / 'cortado'
+    train(monitor(window), directory)
+    # Con ventanas de 10 hay dos ventanas estables en el episodio 50; con las de 15
+    # la tabla de referencia (episodio 45) no es la del checkpoint y se guarda aparte
+    interrupt_after(directory, 50)
+
+    resumed_monitor = monitor(window)
+    resumed = train(resumed_monitor, directory, resume=True, seed=123)
+    assert resumed_monitor.stop_episode == expected_monitor.stop_episode
+    assert resumed_monitor.history == expected_monitor.history
+    assert resumed.training_stats == expected.training_stats
+    assert resumed.q_table.to_dict() == expected.q_table.to_dict()
+
+
+def test_resume_from_stop_checkpoint_does_not_train(tmp_path):
+    expected = train(monitor(), tmp_path)
+    convergence = monitor()
+    resumed = train(convergence, tmp_path, resume=True, seed=123)
+    assert convergence.stop_episode == 60
+    assert resumed.training_stats == expected.training_stats
+    assert resumed.q_table.to_dict() == expected.q_table.to_dict()
+
+
+def test_restore_checks_monitor_configuration(tmp_path):
+    train(monitor(), tmp_path)
+    checkpointer = TrainingCheckpointer(str(tmp_path))
+    with pytest.raises(ValueError):
+        checkpointer.restore(QLearningAgent(), EPISODES)
+    with pytest.raises(ValueError):
+        checkpointer.restore(QLearningAgent(), EPISODES, monitor(window=20))
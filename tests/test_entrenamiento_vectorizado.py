@@ -0,0 +1,45 @@
+"""Actualización de Bellman por lotes"""
+
+import numpy as np
+import pytest
+
+from entrenamiento_vectorizado import WINNER_CODES, batch_q_update
+from grafo_estados import get_graph
+from tabla_q import DenseQTable
+from tablero_bits import index_masks, masks_winner
+
+CODES = {None: 0, 'X': 1, 'O': 2, 'Tie': 3}
+
+
+def test_repeated_pair_matches_sequential_updates():
+    alpha = 0.1
+    table = DenseQTable()
+    table.values[5, 3] = 0.4
+    batch_q_update(table, np.array([5] * 7), np.array([3] * 7), np.full(7, -0.5), alpha)
+
+    expected = 0.4
+    for _ in range(7):
+        expected += alpha * (-0.5 - expected)
+    assert table.values[5, 3] == pytest.approx(expected, abs=1e-6)
+    assert table.known[5, 3]
+
+
+def test_closed_form_with_mixed_targets():
+    alpha = 0.25
+    table = DenseQTable()
+    states = np.array([10, 10, 10, 20, 30])
+    actions = np.array([1, 1, 1, 4, 8])
+    targets = np.array([1.0, 0.0, 0.5, 0.7, -1.0])
+    batch_q_update(table, states, actions, targets, alpha)
+
+    # n apariciones hacia el objetivo medio: (1 - (1 - alpha)**n) * media
+    assert table.values[10, 1] == pytest.approx((1 - (1 - alpha) ** 3) * 0.5, abs=1e-6)
+    assert table.values[20, 4] == pytest.approx(alpha * 0.7, abs=1e-6)
+    assert table.values[30, 8] == pytest.approx(alpha * -1.0, abs=1e-6)
+    assert table.known.sum() == 3
+
+
+def test_winner_codes_match_masks():
+    # Solo estados alcanzables (en los imposibles ambos pueden tener línea)
+    for index in get_graph().index.tolist():
+        assert WINNER_CODES[index] == CODES[masks_winner(*index_masks(index))]
@@ -0,0 +1,37 @@
+"""Evaluación exacta frente a iteración de valor y a partidas simuladas"""
+
+import random
+
+import pytest
+
+from entrenamiento import QLearningAgent, get_opponent_move, play_test_game, random_opponent
+from evaluacion_exacta import evaluate_exact
+from iteracion_valor import train_value_iteration
+from tablero_bits import BitboardTicTacToeGame
+
+OPPONENTS = [("Aleatorio", random_opponent), ("Inteligente", get_opponent_move)]
+
+
+@pytest.mark.parametrize('name, opponent_func', OPPONENTS)
+def test_greedy_value_matches_exact_outcome(name, opponent_func):
+    # Sin descuento el valor del tablero vacío es victorias + 0.5 * empates -
+    # derrotas de la política greedy, que evaluate_exact calcula recorriendo el juego
+    agent = train_value_iteration(opponent_func, gamma=1.0, first='O', save_path=None,
+                                  verbose=False)
+    expected = agent.q_table.max_q_value(0)
+    results = evaluate_exact(agent, [(name, opponent_func)])[name]
+    assert results['wins'] + results['losses'] + results['ties'] == pytest.approx(1.0)
+    assert results['wins'] + 0.5 * results['ties'] - results['losses'] == pytest.approx(expected)
+
+
+def test_exact_agrees_with_simulation(q_table_file):
+    agent = QLearningAgent()
+    assert agent.load_q_table(q_table_file)
+    exact = evaluate_exact(agent, [OPPONENTS[0]])["Aleatorio"]
+
+    random.seed(0)
+    game = BitboardTicTacToeGame()
+    games = 4000
+    wins = sum(play_test_game(agent, game, random_opponent) == 'O' for _ in range(games))
+    # Margen de unas 4 desviaciones típicas
+    assert abs(wins / games - exact['wins']) < 4 * (0.25 / games) ** 0.5
@@ -0,0 +1,64 @@
+"""Evaluación reproducible por semilla, en serie y con procesos"""
+
+import random
+
+import pytest
+
+import entrenamiento
+from entrenamiento import QLearningAgent, random_opponent
+from evaluacion_paralela import evaluate_parallel, make_shards
+from tablero_bits import BitboardTicTacToeGame
+
+OPPONENTS = [("Aleatorio", random_opponent)]
+
+
+@pytest.fixture(scope='module')
+def agent(q_table_file):
+    agent = QLearningAgent()
+    assert agent.load_q_table(q_table_file)
+    return agent
+
+
+def evaluate(agent, **options):
+    return entrenamiento.test_agent_comprehensively(
+        agent, num_games=300, game=BitboardTicTacToeGame(), verbose=False,
+        opponents=OPPONENTS, **options)
+
+
+def test_serial_depends_only_on_seed(agent):
+    random.seed(1)
+    first = evaluate(agent, seed=7)
+    caller_state = random.getstate()
+    random.seed(2)
+    assert evaluate(agent, seed=7) == first
+    assert evaluate(agent, seed=8) != first
+
+    # El estado del llamador no cambia, tampoco si la evaluación falla
+    random.setstate(caller_state)
+    evaluate(agent, seed=7)
+    assert random.getstate() == caller_state
+
+    def failing_opponent(board):
+        raise RuntimeError("oponente roto")
+
+    with pytest.raises(RuntimeError):
+        entrenamiento.test_agent_comprehensively(
+            agent, num_games=5, game=BitboardTicTacToeGame(), verbose=False,
+            opponents=[("Roto", failing_opponent)])
+    assert random.getstate() == caller_state
+
+
+def test_parallel_independent_of_workers(agent):
+    one = evaluate_parallel(agent, num_games=300, workers=1, seed=3, shard_size=50,
+                            opponents=OPPONENTS)
+    two = evaluate_parallel(agent, num_games=300, workers=2, seed=3, shard_size=50,
+                            opponents=OPPONENTS)
+    assert one == two
+    assert sum(one["Aleatorio"].values()) == 300
+
+
+def test_shards_cover_all_games():
+    shards = make_shards(25, seed=0, shard_size=10, num_opponents=2)
+    assert [(opponent, games) for opponent, games, _ in shards] == \
+        [(0, 10), (0, 10), (0, 5), (1, 10), (1, 10), (1, 5)]
+    assert shards == make_shards(25, seed=0, shard_size=10, num_opponents=2)
@@ -0,0 +1,46 @@
+"""Grafo de estados: sucesores, jugadas legales y caché"""
+
+from grafo_estados import StateGraph, available_moves, board_winner, get_graph
+from tablero_bits import BOARD_VIEWS, POW3, index_key, index_masks, masks_winner
+
+
+def test_successors_match_index_arithmetic():
+    graph = get_graph()
+    assert graph.state_index(0) == 0
+    for state_id in range(len(graph)):
+        index = graph.state_index(state_id)
+        result = masks_winner(*index_masks(index))
+        assert graph.result(state_id) == result
+        cells = graph.legal_cells(state_id)
+        if result is not None:
+            assert cells == []
+            continue
+        assert cells == [k for k in range(9) if index_key(index)[k] == ' ']
+        x_count, o_count = index_key(index).count('X'), index_key(index).count('O')
+        # Mueve X si no lleva ventaja, O igual (con el mismo número, cualquiera)
+        movers = [('X', 1)] * (x_count <= o_count) + [('O', 2)] * (o_count <= x_count)
+        for cell in range(9):
+            for player, code in (('X', 1), ('O', 2)):
+                successor = graph.successor(state_id, player, cell)
+                if cell in cells and (player, code) in movers:
+                    assert graph.state_index(successor) == index + code * POW3[cell]
+                else:
+                    assert successor == -1
+
+
+def test_board_queries():
+    board = [list(row) for row in BOARD_VIEWS[0]]
+    assert len(available_moves(board)) == 9
+    board[0] = ['X', 'X', 'X']
+    board[1] = ['O', 'O', ' ']
+    assert board_winner(board) == 'X'
+    assert available_moves('XO       ') == [(r, c) for r in range(3) for c in range(3)][2:]
+
+
+def test_cache_round_trip(tmp_path):
+    graph = get_graph()
+    filename = str(tmp_path / 'grafo.npz')
+    graph.save(filename)
+    loaded = StateGraph.load(filename)
+    assert len(loaded) == len(graph)
+    assert (loaded.succ_x == graph.succ_x).all() and (loaded.succ_o == graph.succ_o).all()
@@ -0,0 +1,157 @@
+"""Interfaz sin pantalla (driver 'dummy' de SDL): repintado por rectángulos y
+turno de la IA por eventos, arranque con carga en segundo plano"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import interfaz
+from interfaz import AI_DELAY_EVENT, AI_MOVE_EVENT, STATS_RECT, GameGUI
+from interfaz_sin_pantalla import cell_position, click, wait_ready
+
+
+@pytest.fixture
+def gui(q_table_file):
+    gui = GameGUI(q_table_file)
+    gui.ai_delay_ms = 0
+    wait_ready(gui)
+    gui.render()
+    yield gui
+    pygame.quit()
+
+
+def test_idle_frame_updates_nothing(gui):
+    assert gui.render() == []
+    # Con la ventana de nuevo visible se repinta todo
+    gui.handle_event(pygame.event.Event(pygame.WINDOWEXPOSED))
+    assert gui.render() == [gui.screen.get_rect()]
+    assert gui.render() == []
+
+
+def test_move_repaints_only_changed_cells(gui):
+    pos = cell_position(0, 0)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    gui.handle_event(pygame.event.get(pygame.MOUSEBUTTONDOWN)[0])
+    dirty = gui.render()
+    # La celda del humano y el texto de estado; nada del panel de estadísticas
+    assert gui._cell_rect(0, 0) in dirty
+    assert not any(rect.colliderect(STATS_RECT) for rect in dirty)
+    assert sum(rect.collidepoint(pos) for rect in dirty) == 1
+    assert gui.render() == []
+
+
+def test_screen_matches_full_redraw(gui):
+    for row, col in ((0, 0), (2, 2), (0, 2)):
+        if gui.state.game_over:
+            break
+        if gui.state.board[row][col] == ' ':
+            click(gui, cell_position(row, col))
+    incremental = pygame.image.tostring(gui.screen, 'RGB')
+    gui._full_redraw = True
+    gui.render()
+    assert pygame.image.tostring(gui.screen, 'RGB') == incremental
+
+
+def next_event(event_type, timeout_ms=5000):
+    """Espera el siguiente evento de `event_type` (los demás se descartan)"""
+    waited = 0
+    while waited < timeout_ms:
+        event = pygame.event.wait(100)
+        if event.type == event_type:
+            return event
+        waited += 100
+    raise AssertionError(f"No llegó el evento {pygame.event.event_name(event_type)}")
+
+
+def press(gui, pos):
+    gui.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def marks(gui):
+    return sum(cell != ' ' for row in gui.state.board for cell in row)
+
+
+def test_ai_move_waits_for_delay_and_worker(gui):
+    gui.ai_delay_ms = 60_000
+    press(gui, cell_position(0, 0))
+    assert gui.state.ia_thinking
+    # El movimiento ya calculado no se aplica hasta que termina la pausa
+    gui.handle_event(next_event(AI_MOVE_EVENT))
+    assert marks(gui) == 1 and gui.state.ia_thinking
+    gui.handle_event(pygame.event.Event(AI_DELAY_EVENT, turn=gui._ai_turn))
+    assert marks(gui) == 2
+    assert not gui.state.ia_thinking and gui.state.current_player == 'X'
+
+
+def test_stale_ai_move_is_discarded(gui):
+    gui.ai_delay_ms = 60_000
+    press(gui, cell_position(0, 0))
+    late_move = next_event(AI_MOVE_EVENT)
+    # Nuevo juego mientras piensa la IA: su respuesta ya no vale
+    press(gui, gui.new_game_button.center)
+    gui.handle_event(late_move)
+    gui.handle_event(pygame.event.Event(AI_DELAY_EVENT, turn=late_move.turn))
+    assert marks(gui) == 0
+    assert gui.state.current_player == 'X' and not gui.state.ia_thinking
+
+
+def test_failing_agent_falls_back(gui, monkeypatch, capsys):
+    def broken(board):
+        raise RuntimeError("fallo")
+
+    monkeypatch.setattr(gui.state.agent, 'get_best_move', broken)
+    press(gui, cell_position(0, 0))
+    event = next_event(AI_MOVE_EVENT)
+    assert event.move is None and 'fallo' in event.error
+    gui.handle_event(event)
+    # El respaldo juega el centro y el turno vuelve al humano
+    assert gui.state.board[1][1] == 'O'
+    assert not gui.state.ia_thinking and gui.state.current_player == 'X'
+    assert 'fallo' in capsys.readouterr().out
+
+
+def test_clicks_ignored_until_agent_ready(q_table_file):
+    gui = GameGUI(q_table_file)
+    try:
+        # Sin procesar AGENT_READY_EVENT el agente sigue sin instalar
+        assert gui.state is None
+        press(gui, cell_position(1, 1))
+        assert gui.render() == [gui.screen.get_rect()]
+        wait_ready(gui)
+        assert all(cell == ' ' for row in gui.state.board for cell in row)
+    finally:
+        pygame.quit()
+
+
+def test_load_error_is_shown_and_closes(tmp_path, monkeypatch):
+    monkeypatch.setattr(interfaz, 'LOAD_ERROR_MS', 50)
+    gui = GameGUI(str(tmp_path / 'no_existe.pkl'))
+    try:
+        while gui.load_error is None:
+            gui.step([pygame.event.wait(100)] + pygame.event.get())
+        assert gui.state is None
+        assert gui._status()[0] == "ERROR al cargar la IA"
+        # Tras LOAD_ERROR_MS llega QUIT y el bucle termina
+        assert next_event(pygame.QUIT)
+    finally:
+        pygame.quit()
+
+
+def test_startup_report_includes_import(gui):
+    times = gui.startup_times
+    assert {'import', 'init', 'fonts', 'surfaces', 'agent_import', 'table_load'} <= times.keys()
+    assert times['ready'] >= times['import'] + times['init']
+    assert "(import incluido)" in gui.startup_report()
+
+
+def test_second_gui_after_quit(q_table_file):
+    # Las fuentes en caché se recrean tras pygame.quit
+    for _ in range(2):
+        gui = GameGUI(q_table_file)
+        gui.render()
+        pygame.quit()
@@ -0,0 +1,57 @@
+"""Benchmark sin pantalla: partidas guionizadas y reproducción de clics grabados"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from interfaz import GameGUI
+from interfaz_sin_pantalla import DRAW_METHODS, FrameTimer, replay, run_headless
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_scripted_games_report(q_table_file):
+    report = run_headless(q_table_file, num_games=5, seed=0)
+    assert report['games'] == 5
+    assert report['frames'] >= 5 * report['frames_per_game'] - 1e-9
+    for name in DRAW_METHODS + ('frame',):
+        stats = report['draw'][name]
+        assert stats['calls'] > 0
+        assert stats['p50_us'] <= stats['p99_us'] <= stats['max_us']
+    assert {'import', 'init', 'fonts', 'surfaces', 'ready'} <= report['startup_ms'].keys()
+
+
+def test_scripted_games_are_reproducible(q_table_file):
+    first = run_headless(q_table_file, num_games=3, seed=4)
+    second = run_headless(q_table_file, num_games=3, seed=4)
+    assert first['frames'] == second['frames']
+    assert first['games'] == second['games'] == 3
+
+
+def test_recorded_session_replays_same_games(tmp_path, q_table_file):
+    record_file = str(tmp_path / 'clics.json')
+    gui = GameGUI(q_table_file, record_file)
+    timer = FrameTimer(gui)
+    random.seed(0)
+    recorded = replay(gui, timer, num_games=3, seed=0)
+    clicks = list(gui.recorded_clicks)
+    pygame.quit()
+
+    report = run_headless(q_table_file, clicks=clicks)
+    # Mismos clics y mismas respuestas de la IA: terminan las mismas partidas
+    assert report['games'] == len(recorded) == 3
+
+
+def test_command_line_writes_report(tmp_path, q_table_file):
+    output = tmp_path / 'gui.json'
+    subprocess.run([sys.executable, os.path.join(ROOT, 'interfaz_sin_pantalla.py'),
+                    '--tabla', q_table_file, '--partidas', '2', '--output', str(output)],
+                   check=True, capture_output=True)
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['games'] == 2
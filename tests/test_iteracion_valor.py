@@ -0,0 +1,81 @@
+"""Iteración de valor: distribuciones de los oponentes y modelo de transiciones"""
+
+import random
+
+import numpy as np
+import pytest
+
+from entrenamiento import center_first_opponent, get_opponent_move, random_opponent
+from grafo_estados import get_graph
+from iteracion_valor import (EXACT_DISTRIBUTIONS, TransitionModel, opponent_distribution,
+                             train_value_iteration)
+from minimax import perfect_opponent
+from tablero_bits import BOARD_VIEWS, index_key
+
+
+def x_to_move_states(count=200):
+    """Índices de estados no terminales en los que mueve X"""
+    graph = get_graph()
+    states = []
+    for state_id in range(len(graph)):
+        index = graph.state_index(state_id)
+        key = index_key(index)
+        if graph.result(state_id) is None and key.count('X') == key.count('O'):
+            states.append(index)
+    return states[:count]
+
+
+@pytest.mark.parametrize('opponent_func', list(EXACT_DISTRIBUTIONS))
+def test_exact_distributions_are_legal(opponent_func):
+    for index in x_to_move_states():
+        key = index_key(index)
+        distribution = opponent_distribution(opponent_func, index)
+        assert sum(distribution.values()) == pytest.approx(1.0)
+        assert all(key[cell] == ' ' for cell in distribution)
+
+
+@pytest.mark.parametrize('opponent_func', [get_opponent_move, random_opponent,
+                                           center_first_opponent])
+def test_exact_distributions_cover_sampled_moves(opponent_func):
+    random.seed(0)
+    for index in x_to_move_states(50):
+        distribution = EXACT_DISTRIBUTIONS[opponent_func](index)
+        for _ in range(20):
+            row, col = opponent_func([list(row) for row in BOARD_VIEWS[index]])
+            assert distribution.get(3 * row + col, 0) > 0
+
+
+def test_sampled_distribution_restores_rng():
+    def corner_opponent(board):
+        free = [(r, c) for r in (0, 2) for c in (0, 2) if board[r][c] == ' ']
+        return random.choice(free or [(r, c) for r in range(3) for c in range(3)
+                                      if board[r][c] == ' '])
+
+    random.seed(7)
+    expected = random.random()
+    random.seed(7)
+    distribution = opponent_distribution(corner_opponent, 0)
+    assert random.random() == expected
+    assert set(distribution) == {0, 2, 6, 8}
+    assert sum(distribution.values()) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('first', ['O', 'X', 'both'])
+def test_transition_probabilities_sum_to_one(first):
+    model = TransitionModel(random_opponent, first)
+    totals = np.bincount(model.trans_pair, weights=model.trans_prob,
+                         minlength=len(model.pairs_state))
+    assert np.allclose(totals[~model.terminal], 1.0)
+    assert np.all(totals[model.terminal] == 0)
+
+
+def test_unknown_first_player():
+    with pytest.raises(ValueError):
+        TransitionModel(random_opponent, first='Z')
+
+
+def test_perfect_opponent_forces_tie():
+    # Sin descuento, el valor del tablero vacío contra el jugador perfecto es el de un empate
+    agent = train_value_iteration(perfect_opponent, gamma=1.0, first='O', save_path=None,
+                                  verbose=False)
+    assert agent.q_table.max_q_value(0) == pytest.approx(0.5)
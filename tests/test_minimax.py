@@ -0,0 +1,40 @@
+"""Solución minimax y oponente perfecto"""
+
+from evaluacion_exacta import evaluate_exact
+from minimax import PERFECT_OPPONENT, get_solution, optimal_move_agreement, perfect_move
+
+EMPTY = [[' '] * 3 for _ in range(3)]
+
+
+class PerfectAgent:
+    """Agente 'O' que juega siempre una jugada óptima"""
+
+    def choose_action(self, board, training=False):
+        return perfect_move(board, 'O')
+
+
+def test_known_values():
+    solution = get_solution()
+    assert solution.value(EMPTY, 'X') == 0
+    assert solution.value(EMPTY, 'O') == 0
+    # X amenaza dos líneas a la vez y O solo puede tapar una
+    fork = [['X', ' ', ' '], [' ', 'X', 'O'], [' ', ' ', 'O']]
+    assert solution.value(fork, 'X') == 1
+    # O gana ya en (0, 2)
+    win = [['X', 'X', ' '], [' ', 'X', ' '], ['O', 'O', ' ']]
+    assert solution.value(win, 'O') == 1
+    assert solution.optimal_moves(win, 'O') == [(2, 2)]
+
+
+def test_perfect_play_never_loses():
+    results = evaluate_exact(PerfectAgent(), [PERFECT_OPPONENT])['Perfecto']
+    assert results['losses'] == 0
+    assert results['ties'] == 1.0
+
+
+def test_optimal_agreement():
+    # (1, 1) es óptima en el tablero vacío; (0, 1) no (O no asegura el empate)
+    table = {' ' * 9: {'1,1': 1.0, '0,1': 0.0}, 'X        ': {'0,1': 1.0, '1,1': 0.0}}
+    report = optimal_move_agreement(table)
+    assert report['states'] == 2
+    assert report['agree'] == 1
@@ -0,0 +1,46 @@
+"""Perfilado del bucle de entrenamiento"""
+
+import json
+import random
+
+from entrenamiento import train_agent_with_progress
+from perfilado import PHASE_NAMES, PHASES, TrainingProfiler
+from tablero_bits import BitboardTicTacToeGame
+
+
+def train(episodes, profiler=None):
+    random.seed(0)
+    return train_agent_with_progress(episodes, game=BitboardTicTacToeGame(), save_path=None,
+                                     verbose=False, profiler=profiler)
+
+
+def test_windows_counters_and_jsonl(tmp_path):
+    jsonl = tmp_path / 'perfil.jsonl'
+    profiler = TrainingProfiler(window=100, jsonl_path=str(jsonl))
+    agent = train(250, profiler)
+
+    # Dos ventanas completas y la parcial que vuelca close()
+    assert [r['episode_end'] for r in profiler.series] == [100, 200, 250]
+    assert [r['episodes'] for r in profiler.series] == [100, 100, 50]
+    with open(jsonl, encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == profiler.series
+
+    stats = agent.training_stats
+    moves = profiler.counters['agent_moves']
+    assert moves == sum(r['counters']['agent_moves'] for r in profiler.series)
+    assert moves >= 250 and profiler.calls['q_update'] == moves
+    assert profiler.calls['action_selection'] >= moves
+    assert stats['wins'] + stats['losses'] + stats['ties'] == 250
+    for phase in PHASES:
+        assert profiler.totals[phase] == sum(r['phases_ns'][phase] for r in profiler.series)
+
+    summary = profiler.summary()
+    assert all(PHASE_NAMES[phase] in summary for phase in PHASES)
+    assert 'agent_moves' in summary
+
+
+def test_profiler_does_not_change_training():
+    plain = train(300)
+    profiled = train(300, TrainingProfiler(window=50))
+    assert plain.q_table.to_dict() == profiled.q_table.to_dict()
+    assert plain.training_stats == profiled.training_stats
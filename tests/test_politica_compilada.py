@@ -0,0 +1,55 @@
+"""Política compilada: mismo movimiento que la tabla y formato en disco"""
+
+import pytest
+
+from politica_compilada import NO_MOVE, CompiledPolicy, is_playable
+from qlearning_agente import QLearningAgent
+from tablero_bits import BOARD_VIEWS, NUM_STATES, key_index
+
+
+@pytest.fixture(scope='module')
+def agent(q_table_file):
+    agent = QLearningAgent()
+    assert agent.load_q_table(q_table_file), agent.load_error
+    return agent
+
+
+def board_of(index):
+    return [list(row) for row in BOARD_VIEWS[index]]
+
+
+def test_compiled_policy_matches_table(agent):
+    policy = CompiledPolicy.compile(agent)
+    for state in agent.q_table:
+        index = key_index(state)
+        if is_playable(index):
+            assert policy.best_move(board_of(index)) == agent.get_best_move(board_of(index))
+    # Sin movimiento en estados terminales o imposibles
+    assert all(policy.moves[index] == NO_MOVE
+               for index in range(0, NUM_STATES, 11) if not is_playable(index))
+    # Las elecciones aleatorias del respaldo dependen solo de la semilla
+    assert CompiledPolicy.compile(agent, seed=0).moves == policy.moves
+
+
+def test_agent_uses_compiled_policy(agent):
+    agent.compile_policy()
+    try:
+        board = board_of(key_index('X        '))
+        assert agent.get_best_move(board) == agent.policy.best_move(board)
+    finally:
+        agent.policy = None
+
+
+def test_save_and_load(agent, tmp_path):
+    policy = CompiledPolicy.compile(agent)
+    filename = str(tmp_path / 'politica.pol')
+    policy.save(filename)
+    assert CompiledPolicy.load(filename).moves == policy.moves
+    with open(filename, 'r+b') as f:
+        f.write(b'XXXX')
+    with pytest.raises(ValueError):
+        CompiledPolicy.load(filename)
+    with open(filename, 'wb') as f:
+        f.write(b'QP')
+    with pytest.raises(ValueError):
+        CompiledPolicy.load(filename)
@@ -0,0 +1,80 @@
+"""Q(λ) de Watkins: crédito de las partidas que termina el oponente"""
+
+import random
+
+import pytest
+
+from entrenamiento import (QLambdaAgent, QLearningAgent, get_opponent_move,
+                           train_agent_with_progress)
+from evaluacion_exacta import evaluate_exact
+from experiencia import ReplayBuffer
+from tablero_bits import BitboardTicTacToeGame, index_key
+
+ALPHA, GAMMA, LAM = 0.5, 0.9, 0.8
+
+
+def board(key):
+    return [list(key[0:3]), list(key[3:6]), list(key[6:9])]
+
+
+def test_opponent_win_reaches_last_move():
+    # O juega (2, 2) y X completa la primera fila
+    before, after, final = 'XX OO    ', 'XX OO   O', 'XXXOO   O'
+    for agent_class, expected in ((QLearningAgent, 0.0), (QLambdaAgent, -ALPHA)):
+        agent = agent_class(alpha=ALPHA, gamma=GAMMA)
+        agent.start_episode()
+        agent.update_q_value(board(before), (2, 2), 0, board(after), False)
+        agent.opponent_moved(board(final), -1, True)
+        assert agent.q_table.q_value(before, (2, 2)) == pytest.approx(expected)
+
+
+def test_traces_decay_and_are_cut_by_exploration():
+    first, second = '         ', 'O   X    '
+    agent = QLambdaAgent(alpha=ALPHA, gamma=GAMMA, lam=LAM)
+    agent.start_episode()
+    agent.update_q_value(board(first), (0, 0), 0, board('O        '), False)
+    agent.opponent_moved(board(second), 0, False)
+    agent.update_q_value(board(second), (0, 1), 0, board('OO  X    '), False)
+    agent.opponent_moved(board('OOX X    '), -1, True)
+    # El error TD de la segunda jugada llega a la primera con traza γλ
+    assert agent.q_table.q_value(second, (0, 1)) == pytest.approx(-ALPHA)
+    assert agent.q_table.q_value(first, (0, 0)) == pytest.approx(-ALPHA * GAMMA * LAM)
+
+    # Tras una acción no greedy la traza de las anteriores se corta
+    agent.start_episode()
+    agent.update_q_value(board(first), (0, 0), 0, board('O        '), False)
+    agent.opponent_moved(board(second), 0, False)
+    agent.q_table.set_q_value(second, (2, 2), 1.0)
+    agent.update_q_value(board(second), (0, 1), 0, board('OO  X    '), False)
+    assert list(agent.traces) == [(second, (0, 1))]
+
+
+def test_transitions_reach_replay():
+    random.seed(0)
+    replay = ReplayBuffer(1000, seed=0)
+    agent = train_agent_with_progress(50, game=BitboardTicTacToeGame(), learner='qlambda',
+                                      save_path=None, verbose=False, replay=replay)
+    assert len(replay) > 50
+    # Cada transición va del turno del agente a su siguiente turno o al final
+    for i in range(len(replay)):
+        state, next_state = index_key(int(replay.states[i])), index_key(int(replay.next_states[i]))
+        assert state.count('O') == state.count('X')
+        if not replay.done[i]:
+            assert next_state.count('O') == state.count('O') + 1
+            assert next_state.count('X') == state.count('X') + 1
+    assert set(agent.q_table) <= {index_key(int(s)) for s in replay.states[:len(replay)]}
+
+
+def non_loss_rate(agent):
+    results = evaluate_exact(agent, [("Inteligente", get_opponent_move)])
+    return results["Inteligente"]['wins'] + results["Inteligente"]['ties']
+
+
+def test_qlambda_beats_one_step_with_few_episodes():
+    rates = {}
+    for learner in ('qlearning', 'qlambda'):
+        random.seed(0)
+        agent = train_agent_with_progress(128, game=BitboardTicTacToeGame(), learner=learner,
+                                          save_path=None, verbose=False)
+        rates[learner] = non_loss_rate(agent)
+    assert rates['qlambda'] > rates['qlearning']
@@ -0,0 +1,96 @@
+"""Consultas por lotes (get_best_moves) frente a get_best_move e imports diferidos"""
+
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from politica_compilada import is_playable
+from qlearning_agente import QLearningAgent
+from tablero_bits import BOARD_VIEWS, NUM_STATES, index_key, index_masks, key_index, masks_winner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def agent(q_table_file):
+    agent = QLearningAgent()
+    assert agent.load_q_table(q_table_file), agent.load_error
+    return agent
+
+
+def board_of(index):
+    return [list(row) for row in BOARD_VIEWS[index]]
+
+
+def forced_move(index):
+    """¿Tiene el respaldo una jugada determinista (ganar, bloquear o centro)?"""
+    key = index_key(index)
+    if key[4] == ' ':
+        return True
+    for player in 'OX':
+        for cell in range(9):
+            if key[cell] == ' ':
+                trial = key[:cell] + player + key[cell + 1:]
+                if masks_winner(*index_masks(key_index(trial))) == player:
+                    return True
+    return False
+
+
+def test_batch_moves_match_single_moves(agent):
+    indices = [key_index(state) for state in agent.q_table]
+    batch = agent.get_best_moves(np.array(indices))
+    for index, cell in zip(indices, batch.tolist()):
+        move = agent.get_best_move(board_of(index))
+        assert cell == (-1 if move is None else 3 * move[0] + move[1])
+    # Las listas de tableros o claves dan lo mismo que el array
+    keys = [index_key(index) for index in indices[:200]]
+    assert agent.get_best_moves(keys) == agent.get_best_moves([board_of(i) for i in indices[:200]])
+
+
+def test_batch_fallback_is_legal(agent):
+    rng = random.Random(0)
+    unknown = [index for index in rng.sample(range(NUM_STATES), 3000)
+               if is_playable(index) and not agent.q_table.get(index_key(index))]
+    moves = agent.get_best_moves([board_of(index) for index in unknown],
+                                 rng=np.random.default_rng(0))
+    for index, move in zip(unknown, moves):
+        assert board_of(index)[move[0]][move[1]] == ' '
+        # Ganar, bloquear o centro no dependen del azar: mismo movimiento que get_fallback_move
+        if forced_move(index):
+            assert move == agent.get_fallback_move(board_of(index))
+
+
+def test_fallback_generator_is_seeded_and_reused():
+    # Sin tabla todo es respaldo; con el centro ocupado la esquina se elige al azar
+    boards = ['    X    ', 'X   O    ', ' X  O    '] * 20
+    first, second = QLearningAgent(seed=5), QLearningAgent(seed=5)
+    assert first.get_best_moves(boards) == second.get_best_moves(boards)
+
+    # Llamadas sucesivas continúan la misma secuencia, no la reinician
+    rng = np.random.default_rng(5)
+    expected = [QLearningAgent().get_best_moves(boards, rng=rng) for _ in range(2)]
+    agent = QLearningAgent(seed=5)
+    assert [agent.get_best_moves(boards) for _ in range(2)] == expected
+    assert expected[0] != expected[1]
+
+
+def test_single_moves_do_not_import_batch_dependencies(q_table_file):
+    # Lo que usa la interfaz: importar, cargar un .pkl, mover y comprobar el ganador
+    script = (
+        "import sys\n"
+        "from qlearning_agente import GameState\n"
+        "state = GameState()\n"
+        f"assert state.agent.load_q_table({q_table_file!r})\n"
+        "state.make_move(*state.agent.get_best_move(state.board), 'O')\n"
+        "state.check_winner()\n"
+        "state.agent.get_fallback_move([['X', 'X', ' '], [' ', 'O', ' '], [' ', ' ', ' ']])\n"
+        "print(sorted({'numpy', 'simetria', 'politica_compilada', 'grafo_estados'}"
+        " & sys.modules.keys()))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,75 @@
+"""Protocolo del servidor de movimientos"""
+
+import asyncio
+import json
+
+import pytest
+
+from qlearning_agente import QLearningAgent
+from servidor import MoveServer, parse_board
+
+
+@pytest.fixture(scope='module')
+def server(q_table_file):
+    agent = QLearningAgent()
+    assert agent.load_q_table(q_table_file), agent.load_error
+    return MoveServer(agent)
+
+
+def ask(server, request):
+    line = request if isinstance(request, bytes) else json.dumps(request).encode('utf-8')
+    return json.loads(server.respond(line))
+
+
+def test_parse_board_formats():
+    expected = [['X', ' ', ' '], [' ', 'O', ' '], [' ', ' ', ' ']]
+    assert parse_board('X   O    ') == expected
+    assert parse_board(['X  ', ' O ', '   ']) == expected
+    assert parse_board(expected) == expected
+    for bad in ('X', 'XXXXXXXXA', [['X', ' '], [' '] * 3, [' '] * 3], 9):
+        with pytest.raises(ValueError):
+            parse_board(bad)
+
+
+def test_requests(server):
+    move = ask(server, {'op': 'best_move', 'board': 'X        ', 'id': 7})
+    assert move['id'] == 7
+    assert move['move'] == list(server.agent.get_best_move(parse_board('X        ')))
+    moves = ask(server, {'op': 'best_moves', 'boards': ['X        ', 'XO X     ']})['moves']
+    assert len(moves) == 2
+    assert ask(server, {'op': 'ping'}) == {'ok': True}
+    assert 'error' in ask(server, {'op': 'nada'})
+    assert 'error' in ask(server, b'{no es json')
+    assert 'error' in ask(server, {'op': 'best_moves', 'boards': 'X'})
+    assert ask(server, {'op': 'stats'})['latency']['best_move']['count'] >= 1
+
+
+def test_single_move_skips_batch_path(server, monkeypatch):
+    def batch(boards):
+        raise AssertionError("best_move no debe pasar por get_best_moves")
+
+    monkeypatch.setattr(server.agent, 'get_best_moves', batch)
+    board = parse_board('XO X     ')
+    assert ask(server, {'op': 'best_move', 'board': 'XO X     '})['move'] == \
+        list(server.agent.get_best_move(board))
+    assert ask(server, {'op': 'best_move', 'board': 'XOXXOOOXX'})['move'] is None
+
+
+def test_overlong_line_keeps_connection(server):
+    async def session():
+        tcp = await asyncio.start_server(server.serve_client, '127.0.0.1', 0, limit=1024)
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        boards = ['X        '] * 500
+        writer.write(json.dumps({'op': 'best_moves', 'boards': boards}).encode() + b'\n')
+        writer.write(b'{"op": "ping"}\n')
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        tcp.close()
+        await tcp.wait_closed()
+        return replies
+
+    overrun, ping = asyncio.run(session())
+    assert 'error' in overrun
+    assert ping == {'ok': True}
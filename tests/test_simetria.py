@@ -0,0 +1,48 @@
+"""Representantes canónicos y traducción de acciones entre marcos"""
+
+import random
+
+from simetria import (CANONICAL_INDEX, TRANSFORMS, canonical_key, canonicalize,
+                      count_canonical_states, from_canonical_action, to_canonical_action)
+from tablero_bits import BOARD_VIEWS, NUM_STATES, board_index, index_key
+
+MOVES = [(r, c) for r in range(3) for c in range(3)]
+
+
+def transformed(index, perm):
+    """Tablero cuya casilla k viene de la casilla perm[k] de `index`"""
+    key = index_key(index)
+    return ''.join(key[perm[k]] for k in range(9))
+
+
+def test_canonical_is_minimum_over_symmetries():
+    rng = random.Random(0)
+    for index in rng.sample(range(NUM_STATES), 2000):
+        images = [transformed(index, perm) for perm in TRANSFORMS]
+        canonical = index_key(CANONICAL_INDEX[index])
+        assert canonical in images
+        assert all(canonical_key(image) == canonical for image in images)
+
+
+def test_action_round_trip():
+    for transform in range(len(TRANSFORMS)):
+        for action in MOVES:
+            assert from_canonical_action(to_canonical_action(action, transform), transform) == action
+            assert to_canonical_action(from_canonical_action(action, transform), transform) == action
+
+
+def test_canonical_action_lands_on_same_symbol():
+    rng = random.Random(1)
+    for index in rng.sample(range(NUM_STATES), 500):
+        board = [list(row) for row in BOARD_VIEWS[index]]
+        canonical_board, transform = canonicalize(board)
+        assert board_index(canonical_board) == CANONICAL_INDEX[index]
+        for row, col in MOVES:
+            c_row, c_col = to_canonical_action((row, col), transform)
+            assert canonical_board[c_row][c_col] == board[row][col]
+
+
+def test_count_canonical_states():
+    # Las 9 aperturas de X se reducen a centro, esquina y lado
+    openings = {index_key(3 ** k): {} for k in range(9)}
+    assert count_canonical_states(openings) == 3
@@ -0,0 +1,74 @@
+"""Formato .qtb: ida y vuelta por memmap y detección de corrupción"""
+
+import os
+
+import numpy as np
+import pytest
+
+from tabla_binaria import HEADER, MappedQTable, QTableFormatError, write_binary_table
+
+TABLE = {
+    '         ': {'1,1': 0.5, '0,0': -0.25},
+    'X   O    ': {'2,2': 0.125},
+    'XO XO    ': {'0,2': 1.0, '2,0': 0.0, '2,2': -1.0},
+}
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / 'tabla.qtb')
+    write_binary_table(TABLE, filename, metadata={'source': 'test'})
+    table = MappedQTable(filename)
+    assert isinstance(table.values, np.memmap) or isinstance(table.values.base, np.memmap)
+    assert len(table) == len(TABLE)
+    assert table.to_dict() == TABLE
+    assert table.metadata == {'source': 'test'}
+    assert 'X   O    ' in table and 'O        ' not in table
+    with pytest.raises(KeyError):
+        table['O        ']
+
+
+def test_corruption_is_detected(tmp_path):
+    filename = str(tmp_path / 'tabla.qtb')
+    write_binary_table(TABLE, filename)
+    with open(filename, 'r+b') as f:
+        f.seek(os.path.getsize(filename) - 1)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(QTableFormatError, match='checksum'):
+        MappedQTable(filename)
+    # Sin verificar se carga (la comprobación es opcional)
+    assert len(MappedQTable(filename, verify=False)) == len(TABLE)
+
+
+def test_bad_header_and_truncation(tmp_path):
+    filename = str(tmp_path / 'tabla.qtb')
+    write_binary_table(TABLE, filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    with open(filename, 'wb') as f:
+        f.write(b'NOPE' + data[4:])
+    with pytest.raises(QTableFormatError):
+        MappedQTable(filename)
+
+    with open(filename, 'wb') as f:
+        f.write(data[:-4])
+    with pytest.raises(QTableFormatError):
+        MappedQTable(filename)
+
+    with open(filename, 'wb') as f:
+        f.write(data[:HEADER.size - 1])
+    with pytest.raises(QTableFormatError):
+        MappedQTable(filename)
+
+
+def test_save_and_load_table_through_qtb(tmp_path):
+    from tabla_q import DictQTable, load_metadata, load_table, save_table
+
+    filename = str(tmp_path / 'tabla.qtb')
+    save_table(DictQTable(TABLE), filename, {'episodes': 3})
+    assert isinstance(load_table(filename), MappedQTable)
+    assert load_table(filename, backend='dict') == TABLE
+    assert load_table(filename, backend='dense').to_dict() == TABLE
+    assert load_metadata(filename) == {'episodes': 3}
@@ -0,0 +1,86 @@
+"""Backends de la tabla Q (dict y densa) y guardado/carga"""
+
+import random
+
+import pytest
+
+from entrenamiento import train_agent_with_progress
+from tabla_q import DenseQTable, DictQTable, load_table, save_table
+from tablero_bits import BOARD_VIEWS, FREE_MOVES, BitboardTicTacToeGame, index_masks
+
+
+def random_updates(seed=0, count=2000):
+    rng = random.Random(seed)
+    updates = []
+    for _ in range(count):
+        index = rng.randrange(len(BOARD_VIEWS))
+        x_mask, o_mask = index_masks(index)
+        moves = FREE_MOVES[x_mask | o_mask]
+        if moves:
+            updates.append((index, rng.choice(moves), rng.uniform(-1, 1)))
+    return updates
+
+
+def filled_table(count=500):
+    table = DictQTable()
+    for index, action, value in random_updates(count=count):
+        table.set_q_value(table.state_key(BOARD_VIEWS[index]), action, value)
+    return table
+
+
+def test_dense_matches_dict():
+    dict_table, dense_table = DictQTable(), DenseQTable()
+    for index, action, value in random_updates():
+        for table in (dict_table, dense_table):
+            table.set_q_value(table.state_key(BOARD_VIEWS[index]), action, value)
+    assert dense_table.to_dict().keys() == dict_table.to_dict().keys()
+    for state, actions in dict_table.items():
+        assert dense_table[state] == pytest.approx(actions, abs=1e-6)
+    for index, _, _ in random_updates(seed=1, count=300):
+        board = BOARD_VIEWS[index]
+        moves = FREE_MOVES[sum(index_masks(index))]
+        assert dense_table.max_q_value(dense_table.state_key(board)) == pytest.approx(
+            dict_table.max_q_value(dict_table.state_key(board)), abs=1e-6)
+        assert dense_table.best_action(dense_table.state_key(board), moves) == \
+            dict_table.best_action(dict_table.state_key(board), moves)
+
+
+
+def test_ties_follow_action_order():
+    # Con simetrías las acciones llegan en el orden de la transformación, no de casillas
+    actions = [(2, 2), (0, 0), (1, 1)]
+    for table in (DictQTable(), DenseQTable()):
+        state = table.state_key(BOARD_VIEWS[0])
+        assert table.best_action(state, actions) == (2, 2)
+        table.set_q_value(state, (0, 0), 0.5)
+        table.set_q_value(state, (1, 1), 0.5)
+        assert table.best_action(state, actions) == (0, 0)
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_training_matches_across_backends(symmetric):
+    agents = []
+    for backend in ('dict', 'dense'):
+        random.seed(0)
+        agents.append(train_agent_with_progress(1000, game=BitboardTicTacToeGame(), backend=backend,
+                                                symmetric=symmetric, save_path=None,
+                                                verbose=False))
+    dict_agent, dense_agent = agents
+    assert dense_agent.training_stats == dict_agent.training_stats
+    expected = dict_agent.q_table.to_dict()
+    trained = dense_agent.q_table.to_dict()
+    assert trained.keys() == expected.keys()
+    for state, actions in expected.items():
+        assert trained[state] == pytest.approx(actions, abs=1e-5)
+
+
+@pytest.mark.parametrize('extension', ['.pkl', '.npz'])
+def test_save_load_round_trip(tmp_path, extension):
+    table = filled_table()
+    filename = str(tmp_path / f"tabla{extension}")
+    save_table(table, filename)
+    for backend in ('dict', 'dense'):
+        loaded = load_table(filename, backend=backend)
+        assert loaded.keys() == table.keys()
+        for state, actions in table.items():
+            assert loaded[state] == pytest.approx(actions, abs=1e-6)
@@ -0,0 +1,57 @@
+"""Paridad del motor de bits con el motor de listas (entrenamiento.TicTacToeGame)"""
+
+import random
+
+from entrenamiento import TicTacToeGame
+from tablero_bits import (BOARD_VIEWS, NUM_STATES, BitboardTicTacToeGame, board_index,
+                          index_key, key_index)
+
+LINES = [[(r, 0), (r, 1), (r, 2)] for r in range(3)] + \
+        [[(0, c), (1, c), (2, c)] for c in range(3)] + \
+        [[(0, 0), (1, 1), (2, 2)], [(0, 2), (1, 1), (2, 0)]]
+
+
+def reference_winner(board):
+    """Ganador recorriendo las 8 líneas sobre el tablero de listas"""
+    for line in LINES:
+        symbols = {board[r][c] for r, c in line}
+        if len(symbols) == 1 and ' ' not in symbols:
+            return symbols.pop()
+    if all(cell != ' ' for row in board for cell in row):
+        return 'Tie'
+    return None
+
+
+def test_index_round_trip():
+    rng = random.Random(0)
+    for index in rng.sample(range(NUM_STATES), 2000):
+        view = BOARD_VIEWS[index]
+        assert board_index(view) == index
+        assert board_index([list(row) for row in view]) == index
+        assert key_index(index_key(index)) == index
+
+
+def test_random_games_match_list_engine():
+    rng = random.Random(1)
+    for _ in range(500):
+        lists, bits = TicTacToeGame(), BitboardTicTacToeGame()
+        lists.reset()
+        bits.reset()
+        player = rng.choice('XO')
+        done = False
+        while not done:
+            moves = list(lists.get_available_moves())
+            assert sorted(bits.get_available_moves()) == sorted(moves)
+            # De vez en cuando una jugada ilegal (casilla ocupada)
+            occupied = [(r, c) for r in range(3) for c in range(3) if lists.board[r][c] != ' ']
+            if occupied and rng.random() < 0.05:
+                row, col = rng.choice(occupied)
+            else:
+                row, col = rng.choice(moves)
+            board_l, reward_l, done_l = lists.step(row, col, player)
+            board_b, reward_b, done_b = bits.step(row, col, player)
+            assert [''.join(row) for row in board_l] == list(board_b)
+            assert (reward_l, done_l) == (reward_b, done_b)
+            assert lists.check_winner() == bits.check_winner() == reference_winner(board_l)
+            done = done_l
+            player = 'O' if player == 'X' else 'X'